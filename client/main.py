@@ -1,13 +1,19 @@
 """
 클라이언트 메인 파일
 """
+from utils import metrics
 from utils.communication import init_communication
+from utils.edge import EDGE_ENABLED, EdgePersonDetector, OccupancyFilter
 from utils.hardware import PiHardware
 from utils.thread import ImageSendThread, MessageReceiveThread
 
 
 main_running = True
 
+# 서버가 요청할 수 있는 촬영/전송 FPS (서버 config.ini의 load_shedding.reduced_fps, duty_cycle.*_fps는 이 중 하나여야 함,
+# 0: 제한 없음)
+FPS_STEPS = (0, 1, 2, 5, 10, 15, 20, 30)
+
 
 # 통신 종료 함수
 def stop_communication(image_sender: ImageSendThread, 
@@ -42,6 +48,19 @@ if __name__ == "__main__":
     message_receiver.add_callback('exit', lambda: stop_communication(image_sender, message_receiver))
     message_receiver.add_callback('buzzer on', lambda: hardware.buzzer_on(1))
     message_receiver.add_callback('buzzer off', lambda: hardware.buzzer_off())
+    message_receiver.add_callback('ping', lambda: message_receiver.send('pong'))
+    for fps in FPS_STEPS:
+        message_receiver.add_callback(f'fps {fps}', lambda fps=fps: image_sender.set_fps(fps))
+
+    # 사람이 있을 때만 이미지 전송 (사람이 없으면 'occupancy 0'만 전송)
+    if EDGE_ENABLED:
+        image_sender.on_occupancy = lambda occupied: message_receiver.send(f'occupancy {int(occupied)}')
+        image_sender.occupancy = OccupancyFilter(EdgePersonDetector())
+
+    # 지표 제공 (촬영/인코딩 FPS, CPU 온도)
+    if metrics.METRICS_ENABLED:
+        metrics_server = metrics.MetricsServer(metrics.registry)
+        metrics_server.start()
 
     try:
         while main_running:
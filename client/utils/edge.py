@@ -0,0 +1,92 @@
+"""
+엣지 사람 검출 모듈
+
+라즈베리 파이에서 낮은 주기로 사람을 검출하여 벤치에 사람이 있을 때만 서버로 이미지를 전송합니다.
+사람이 없을 때는 이미지 대신 사람 없음 상태만 메시지로 보내므로 네트워크와 서버 부하가 거의 없어집니다.
+"""
+import configparser
+
+import cv2
+import numpy as np
+
+
+# 설정 가져오기
+__config = configparser.ConfigParser()
+__config.read('config.ini')
+
+EDGE_ENABLED = __config['edge'].getboolean('enabled')
+EDGE_MODEL_PATH = __config['edge']['model']
+EDGE_THRESHOLD = float(__config['edge']['threshold'])
+EDGE_INTERVAL = float(__config['edge']['interval'])
+EDGE_HOLD_SECONDS = float(__config['edge']['hold_seconds'])
+EDGE_HEARTBEAT_INTERVAL = float(__config['edge']['heartbeat_interval'])
+
+
+class EdgePersonDetector:
+    """
+    OpenVINO 사람 검출 모델 (서버의 PersonDetector와 같은 전처리, 사람 유무만 판단)
+
+    Args:
+        model_path (str): 모델 경로
+        threshold (float): 검출 신뢰도 임계값
+    """
+    def __init__(self, model_path: str = EDGE_MODEL_PATH, threshold: float = EDGE_THRESHOLD):
+        import openvino as ov   # 엣지 모드에서만 필요
+
+        core = ov.Core()
+        self._compiled_model = core.compile_model(core.read_model(model_path), 'CPU',
+                                                  {'PERFORMANCE_HINT': 'LATENCY'})
+        self._request = self._compiled_model.create_infer_request()
+        self.height, self.width = self._compiled_model.input(0).shape[2:4]
+        self.threshold = threshold
+
+    def detect(self, frame: np.ndarray) -> bool:
+        """
+        프레임에 사람이 있는지 여부
+
+        Args:
+            frame (np.ndarray): 카메라 이미지 (BGR)
+
+        Returns:
+            bool: 신뢰도가 임계값을 넘는 사람이 있으면 True
+        """
+        image = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), (self.width, self.height))
+        self._request.infer({0: np.expand_dims(image.transpose(2, 0, 1), 0)})
+        # [1, 1, N, 7] - (image_id, label, score, xmin, ymin, xmax, ymax)
+        detections = self._request.get_output_tensor(0).data.reshape(-1, 7)
+        return bool((detections[:, 2] > self.threshold).any())
+
+
+class OccupancyFilter:
+    """
+    일정 간격으로만 사람을 검출하고, 마지막 검출 후 hold_seconds 동안은 사람이 있는 것으로 판단
+
+    Args:
+        detector (EdgePersonDetector): 사람 검출 모델
+        interval (float): 검출 간격(초)
+        hold_seconds (float): 마지막 검출 후 사람이 있는 것으로 유지하는 시간(초)
+    """
+    def __init__(self, detector: EdgePersonDetector, interval: float = EDGE_INTERVAL,
+                 hold_seconds: float = EDGE_HOLD_SECONDS):
+        self.detector = detector
+        self.interval = interval
+        self.hold_seconds = hold_seconds
+        self.next_detection_time = 0.0  # 다음 검출 시간 (time.monotonic)
+        self._last_seen = None          # 마지막으로 사람이 검출된 시간
+
+    def update(self, frame: np.ndarray, now: float) -> bool:
+        """
+        프레임으로 사람 유무 갱신 (검출 간격이 지나지 않았으면 검출하지 않음)
+
+        Args:
+            frame (np.ndarray): 카메라 이미지
+            now (float): 현재 시간 (time.monotonic)
+
+        Returns:
+            bool: 사람이 있으면 True
+        """
+        if now >= self.next_detection_time:
+            self.next_detection_time = now + self.interval
+            if self.detector.detect(frame):
+                self._last_seen = now
+        return self._last_seen is not None and now - self._last_seen <= self.hold_seconds
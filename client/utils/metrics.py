@@ -0,0 +1,349 @@
+"""
+지표 수집 모듈
+
+촬영/인코딩 FPS, 인코딩 시간, CPU 온도를
+로컬 HTTP 엔드포인트에서 Prometheus 텍스트 형식으로 제공합니다.
+(서버의 utils/metrics.py와 같은 구조)
+
+값 갱신은 잠금 없이 수행합니다. 시계열 하나를 갱신하는 쓰레드는 보통 하나뿐이고,
+GIL 아래에서 조회 시점에 값이 한 프레임 정도 어긋나는 것은 지표 용도로 문제가 되지 않습니다.
+"""
+import bisect
+import configparser
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# 설정 가져오기
+__config = configparser.ConfigParser()
+__config.read('config.ini')
+
+METRICS_ENABLED = __config['metrics'].getboolean('enabled')
+METRICS_HOST = __config['metrics']['host']
+METRICS_PORT = int(__config['metrics']['port'])
+
+CPU_TEMPERATURE_PATH = '/sys/class/thermal/thermal_zone0/temp'
+
+
+def _latency_buckets(lowest: float = 50e-6, highest: float = 60.0, sub_buckets: int = 4) -> list[float]:
+    """
+    HDR 히스토그램 방식의 로그-선형 버킷 경계
+    2배 구간마다 sub_buckets개의 같은 간격 버킷을 두어 모든 범위에서 상대 오차가 비슷합니다.
+    """
+    bounds = []
+    base = lowest
+    while base < highest:
+        step = base / sub_buckets
+        for i in range(1, sub_buckets + 1):
+            bounds.append(round(base + step * i, 9))
+        base *= 2
+    return bounds
+
+
+LATENCY_BUCKETS = _latency_buckets()
+
+
+def _format_labels(labelnames: tuple, values: tuple, extra: str = '') -> str:
+    parts = [f'{name}="{value}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+class _Metric:
+    """
+    레이블별 시계열을 가지는 지표의 기본 클래스
+    """
+    type_name = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values, **kwargs):
+        """
+        레이블 값에 해당하는 시계열 반환 (처음 호출 시 생성)
+        """
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self, key: tuple, child) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.documentation}',
+                 f'# TYPE {self.name} {self.type_name}']
+        for key, child in list(self._children.items()):
+            lines.extend(self._samples(key, child))
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+
+class Counter(_Metric):
+    """
+    증가만 하는 카운터
+    """
+    type_name = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def _samples(self, key, child):
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}']
+
+
+class _GaugeChild:
+    __slots__ = ('value', 'function')
+
+    def __init__(self):
+        self.value = 0.0
+        self.function = None
+
+    def set(self, value: float):
+        self.value = value
+
+    def set_function(self, function: callable):
+        """
+        조회 시점에 값을 계산할 함수 설정 (예: 큐 길이)
+        """
+        self.function = function
+
+    def get(self) -> float:
+        return self.function() if self.function is not None else self.value
+
+
+class Gauge(_Metric):
+    """
+    임의의 값을 가지는 게이지
+    """
+    type_name = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def _samples(self, key, child):
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.get())}']
+
+
+class _HistogramChild:
+    __slots__ = ('bounds', 'counts', 'sum')
+
+    def __init__(self, bounds: list[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def time(self):
+        """
+        with 문 안의 실행 시간을 기록
+        """
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ('_child', '_start')
+
+    def __init__(self, child: _HistogramChild):
+        self._child = child
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._child.observe(time.perf_counter() - self._start)
+        return False
+
+
+class Histogram(_Metric):
+    """
+    로그-선형 버킷 히스토그램 (기본 버킷: 50us ~ 60s)
+    """
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (),
+                 buckets: list[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = list(buckets)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def _samples(self, key, child):
+        counts = list(child.counts)
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + [math.inf], counts):
+            cumulative += count
+            # 비어있는 중간 버킷은 생략하여 출력 크기를 줄임 (누적 값이므로 정보 손실 없음)
+            if count == 0 and not math.isinf(bound):
+                continue
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f'{self.name}_sum{labels} {_format_value(child.sum)}')
+        lines.append(f'{self.name}_count{labels} {sum(counts)}')
+        return lines
+
+
+class Registry:
+    """
+    지표 모음
+    """
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple = (),
+                  buckets: list[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        Prometheus 텍스트 형식 출력
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsServer(threading.Thread):
+    """
+    /metrics 경로로 지표를 제공하는 HTTP 서버 쓰레드
+
+    Args:
+        registry (Registry): 지표 모음
+        port (int): 포트 번호
+        host (str): 바인드 주소 (기본값: config.ini [metrics] host)
+    """
+    def __init__(self, registry: 'Registry', port: int = METRICS_PORT, host: str = METRICS_HOST):
+        super().__init__()
+        self.daemon = True
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+
+    def run(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+
+
+class RateMeter:
+    """
+    초당 횟수(FPS)를 계산하는 클래스
+    window초마다 그동안의 횟수로 게이지 값을 갱신합니다.
+
+    Args:
+        gauge (_GaugeChild): 값을 기록할 게이지
+        window (float): 계산 구간(초)
+    """
+    def __init__(self, gauge, window: float = 1.0):
+        self._gauge = gauge
+        self._window = window
+        self._count = 0
+        self._start = time.perf_counter()
+
+    def tick(self):
+        self._count += 1
+        elapsed = time.perf_counter() - self._start
+        if elapsed >= self._window:
+            self._gauge.set(self._count / elapsed)
+            self._count = 0
+            self._start += elapsed
+
+
+def cpu_temperature() -> float:
+    """
+    CPU 온도(섭씨) (읽을 수 없으면 NaN)
+    """
+    try:
+        with open(CPU_TEMPERATURE_PATH) as f:
+            return int(f.read().strip()) / 1000
+    except (OSError, ValueError):
+        return math.nan
+
+
+# 클라이언트 지표
+registry = Registry()
+frames_captured = registry.counter(
+    'bsp_client_frames_captured_total', 'Frames read from the camera')
+frames_encoded = registry.counter(
+    'bsp_client_frames_encoded_total', 'Frames encoded to JPEG and sent')
+frames_filtered = registry.counter(
+    'bsp_client_frames_filtered_total', 'Frames not sent because the edge detector found nobody')
+occupied = registry.gauge(
+    'bsp_client_occupied', 'Whether the edge detector found a person (1) or not (0)')
+capture_fps = registry.gauge(
+    'bsp_client_capture_fps', 'Camera capture rate over the last second')
+encode_fps = registry.gauge(
+    'bsp_client_encode_fps', 'JPEG encode rate over the last second')
+encode_latency = registry.histogram(
+    'bsp_client_encode_latency_seconds', 'Latency of JPEG encoding')
+send_latency = registry.histogram(
+    'bsp_client_send_latency_seconds', 'Time spent sending a frame to the server')
+cpu_temperature_celsius = registry.gauge(
+    'bsp_client_cpu_temperature_celsius', 'CPU temperature')
+cpu_temperature_celsius.labels().set_function(cpu_temperature)
@@ -1,10 +1,17 @@
 import socket
 import struct
 import threading
+import time
 import traceback
 
 import cv2
 
+from utils import metrics
+from utils.edge import EDGE_HEARTBEAT_INTERVAL
+
+
+MESSAGE_DELIMITER = b'\n'  # 메시지 구분자 (메시지마다 끝에 붙여서 전송)
+
 
 class ImageSendThread(threading.Thread):
     """
@@ -18,6 +25,27 @@ class ImageSendThread(threading.Thread):
         self._socket = image_socket             # 이미지 송신용 소켓
         self._camera = cv2.VideoCapture(0)      # 웹캠
         self._running = True                    # 쓰레드 실행 여부
+        self._frame_interval = 0.0              # 프레임 전송 간격(초), 0이면 카메라 속도대로 전송
+        self._fps_changed = threading.Event()   # 전송 FPS 변경 시 대기 중단
+        self._camera_fps = None                 # 다음 촬영 전에 카메라에 적용할 FPS (0: 카메라 기본값)
+        self.occupancy = None                   # 사람이 있을 때만 전송하는 엣지 필터 (OccupancyFilter)
+        self.on_occupancy = None                # 사람 유무가 바뀌거나 사람이 없는 동안 주기적으로 호출 (bool 인자)
+        self._occupied = None                   # 마지막으로 알린 사람 유무
+        self._last_heartbeat = 0.0              # 마지막으로 사람 없음을 알린 시간
+
+        # 전송 FPS를 낮췄을 때 오래된 프레임 대신 최신 프레임을 읽도록 카메라 버퍼 최소화
+        self._camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self._default_camera_fps = self._camera.get(cv2.CAP_PROP_FPS)
+
+        # 지표
+        self._frames_captured = metrics.frames_captured.labels()
+        self._frames_encoded = metrics.frames_encoded.labels()
+        self._capture_rate = metrics.RateMeter(metrics.capture_fps.labels())
+        self._encode_rate = metrics.RateMeter(metrics.encode_fps.labels())
+        self._encode_latency = metrics.encode_latency.labels()
+        self._send_latency = metrics.send_latency.labels()
+        self._frames_filtered = metrics.frames_filtered.labels()
+        self._occupied_gauge = metrics.occupied.labels()
 
         if not self._camera.isOpened():
             print('Error: Could not open webcam.')
@@ -32,21 +60,84 @@ class ImageSendThread(threading.Thread):
         if self._camera is not None:
             self._camera.release()
 
+    def set_fps(self, fps: float):
+        """
+        촬영/전송 FPS 변경 (서버의 부하 조절, 촬영 FPS 조절 요청)
+        전송 대기 중이면 바로 깨어나서 새 간격으로 전송하고, 카메라 FPS는 다음 촬영 전에 이 쓰레드에서 변경합니다.
+
+        Args:
+            fps (float): 초당 전송 프레임 수, 0이면 제한 없음
+        """
+        self._frame_interval = 1 / fps if fps > 0 else 0.0
+        self._camera_fps = fps
+        self._fps_changed.set()
+        print(f'Frame rate limit: {fps if fps > 0 else "none"}')
+
+    def _check_occupancy(self, frame) -> bool:
+        """
+        엣지 필터로 사람 유무 확인 후 서버에 알림 (사람 유무가 바뀌었거나 사람이 없는 동안 heartbeat_interval마다)
+        사람이 없으면 다음 검출 시간까지 기다림
+
+        Returns:
+            bool: 이미지를 전송해야 하면 True
+        """
+        now = time.monotonic()
+        occupied = self.occupancy.update(frame, now)
+        if occupied != self._occupied or (not occupied and now - self._last_heartbeat >= EDGE_HEARTBEAT_INTERVAL):
+            if self.on_occupancy is not None:
+                self.on_occupancy(occupied)
+            self._occupied = occupied
+            self._last_heartbeat = now
+            self._occupied_gauge.set(int(occupied))
+        if not occupied:
+            self._frames_filtered.inc()
+            delay = min(self.occupancy.next_detection_time, self._last_heartbeat + EDGE_HEARTBEAT_INTERVAL) - now
+            if delay > 0:
+                time.sleep(delay)
+        return occupied
+
     def run(self):
+        next_frame_time = time.monotonic()
         try:
             while self._running:
+                # 전송 FPS 제한 시 다음 전송 시간까지 대기 (FPS가 바뀌면 바로 다시 계산)
+                if self._frame_interval > 0:
+                    delay = next_frame_time - time.monotonic()
+                    if delay > 0 and self._fps_changed.wait(delay):
+                        self._fps_changed.clear()
+                        next_frame_time = time.monotonic()
+                        continue
+                    next_frame_time = max(next_frame_time, time.monotonic() - self._frame_interval) + self._frame_interval
+                self._fps_changed.clear()
+
+                # 카메라 FPS 변경 (VideoCapture는 이 쓰레드에서만 사용)
+                camera_fps = self._camera_fps
+                if camera_fps is not None:
+                    self._camera_fps = None
+                    self._camera.set(cv2.CAP_PROP_FPS, camera_fps if camera_fps > 0 else self._default_camera_fps)
+
                 # 웹캠에서 이미지를 읽어옴
                 ret, frame = self._camera.read()
                 if not ret:
                     break
+                self._frames_captured.inc()
+                self._capture_rate.tick()
+
+                # 엣지 모드에서는 사람이 있을 때만 전송
+                if self.occupancy is not None and not self._check_occupancy(frame):
+                    continue
 
                 # 이미지를 JPEG 포맷으로 인코딩 후 바이트로 변환
-                _, img_encoded = cv2.imencode('.jpg', frame)
-                img_bytes = img_encoded.tobytes()
+                with self._encode_latency.time():
+                    _, img_encoded = cv2.imencode('.jpg', frame)
+                    img_bytes = img_encoded.tobytes()
                 img_size = len(img_bytes)
 
                 # 이미지 크기를 네트워크 바이트 오더로 변환하여 전송
-                self._socket.sendall(struct.pack(">L", img_size) + img_bytes)
+                with self._send_latency.time():
+                    self._socket.sendall(struct.pack(">L", img_size) + img_bytes)
+                self._frames_encoded.inc()
+                self._encode_rate.tick()
         except Exception as e:
             traceback.print_exc()
             self._running = False
@@ -67,6 +158,8 @@ class MessageReceiveThread(threading.Thread):
         self._socket = message_socket           # 메시지 수신용 소켓
         self._running = True                    # 쓰레드 실행 여부
         self._callbacks = {}                    # 메시지에 따른 콜백 함수  
+        self._buffer = b''                      # 구분자를 아직 받지 못한 메시지 조각
+        self._send_lock = threading.Lock()      # 여러 쓰레드의 전송이 섞이지 않도록 보호 ('pong', 'occupancy N')
     
     def __del__(self):
         self._socket.close()
@@ -90,19 +183,44 @@ class MessageReceiveThread(threading.Thread):
         """
         self._callbacks[message] = callback
 
+    def send(self, message: str):
+        """
+        서버로 메시지 전송 (예: 'ping'에 대한 'pong' 응답)
+        메시지 수신 쓰레드와 이미지 전송 쓰레드에서 호출하므로 잠금으로 보호합니다.
+
+        Args:
+            message (str): 전송할 메시지 (구분자는 붙여서 전송)
+        """
+        data = message.encode('utf-8') + MESSAGE_DELIMITER
+        with self._send_lock:
+            self._socket.sendall(data)
+
+    def _dispatch(self, message: str):
+        """
+        수신한 메시지를 콜백 함수에 전달
+
+        Args:
+            message (str): 수신한 메시지 (구분자 제외)
+        """
+        callback = self._callbacks.get(message)
+        if callback is None:
+            self._default_callback(message)
+        else:
+            callback()
+
     def run(self):
         try:
             while self._running:
                 # 메시지 수신
-                message = self._socket.recv(1024).decode('utf-8')
-                if not message:
+                data = self._socket.recv(1024)
+                if not data:
                     break
 
-                # 수신한 메시지를 콜백 함수에 전달
-                if message in self._callbacks:
-                    self._callbacks[message]()
-                else:
-                    self._default_callback(message)  
+                # 구분자로 메시지를 나누고, 마지막 조각은 다음 수신 데이터와 합침
+                *messages, self._buffer = (self._buffer + data).split(MESSAGE_DELIMITER)
+                for message in messages:
+                    # 수신한 메시지를 콜백 함수에 전달
+                    self._dispatch(message.decode('utf-8'))
         except Exception as e:
             traceback.print_exc()
             self._running = False
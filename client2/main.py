@@ -1,11 +1,12 @@
 # object detection 실행 및 서버 통신
+# mode가 stream이면 바벨 검출은 서버에서 하고, 여기서는 프레임 전송과 부저만 담당
 import configparser
 import socket
+import struct
 import threading
 import time
 
 import cv2
-import torch
 import RPi.GPIO as GPIO  # Import Raspberry Pi GPIO library
 
 
@@ -15,12 +16,23 @@ config.read('config.ini')
 
 SERVER_IP = config['server']['ip']
 SERVER_PORT = int(config['server']['msg_port'])
+IMAGE_PORT = int(config['server']['img_port'])
+MODE = config['detection']['mode']
+
+if MODE not in ('local', 'stream'):
+    raise ValueError(f'Unknown detection mode: {MODE}')
 
 
 # 클라이언트 소켓 생성
 client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 client_socket.connect((SERVER_IP, SERVER_PORT))
 
+# stream 모드에서는 client1과 같은 방식(크기 4바이트 + JPEG)으로 프레임 전송
+image_socket = None
+if MODE == 'stream':
+    image_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    image_socket.connect((SERVER_IP, IMAGE_PORT))
+
 # GPIO 설정
 BUZZER_PIN = 12
 GPIO.setmode(GPIO.BCM)
@@ -28,13 +40,17 @@ GPIO.setup(BUZZER_PIN, GPIO.OUT)
 # Create PWM object with frequency 500Hz
 buzzer_pwm = GPIO.PWM(BUZZER_PIN, 500)
 
-# Load YOLOv5 model
-model = torch.hub.load('ultralytics/yolov5', 'custom', 
-                       path='models/barbell_tracking.pt', force_reload=True)
-model.eval()
+# Load YOLOv5 model (stream 모드에서는 서버가 검출하므로 불러오지 않음)
+model = None
+if MODE == 'local':
+    import torch
+
+    model = torch.hub.load('ultralytics/yolov5', 'custom', 
+                           path='models/barbell_tracking.pt', force_reload=True)
+    model.eval()
 
-# Set device to CPU
-device = torch.device('cpu')
+    # Set device to CPU
+    device = torch.device('cpu')
 
 print("<Safety System Online>")
 # Initialize webcam
@@ -53,13 +69,15 @@ roi_x2, roi_y2 = 640, 360  # Bottom-right corner of ROI
 # Global variable to store the latest frame
 latest_frame = None
 lock = threading.Lock()
+frame_ready = threading.Event()  # 새 프레임을 촬영하면 설정 (stream 모드)
+buzzer_lock = threading.Lock()   # 부저가 울리는 동안 다시 울리지 않음 (stream 모드)
 
 # Flag to control threads
 running = True
 
 
 def send_warning_to_server():
-    warning_message = "Warning on Bench Press Zone!"
+    warning_message = "Warning on Bench Press Zone!\n"  # 메시지는 줄바꿈으로 구분
     client_socket.sendall(warning_message.encode('utf-8'))
     
     
@@ -80,6 +98,75 @@ def capture_frames():
             break
         with lock:
             latest_frame = frame.copy()
+        frame_ready.set()
+
+    # 전송 쓰레드가 기다리지 않도록 종료
+    running = False
+    frame_ready.set()
+
+
+def stream_frames():
+    """
+    가장 최근 프레임을 JPEG으로 인코딩하여 서버로 전송 (stream 모드)
+    """
+    global running
+    try:
+        while running:
+            frame_ready.wait()
+            frame_ready.clear()
+            with lock:
+                if latest_frame is None:
+                    continue
+                frame = latest_frame
+
+            _, img_encoded = cv2.imencode('.jpg', frame)
+            img_bytes = img_encoded.tobytes()
+            image_socket.sendall(struct.pack(">L", len(img_bytes)) + img_bytes)
+    except OSError as e:
+        print(f'Stopped streaming: {e}')
+    finally:
+        running = False
+
+
+def buzz_once(duration):
+    if not buzzer_lock.acquire(blocking=False):
+        return
+    try:
+        buzz(duration)
+    finally:
+        buzzer_lock.release()
+
+
+def receive_messages():
+    """
+    서버의 명령 수신 (stream 모드)
+        buzzer on: 위험 구역에서 바벨이 검출되어 1초간 부저 작동
+        buzzer off: 부저 정지
+        exit: 프로그램 종료
+    """
+    global running
+    buffer = b''
+    while running:
+        data = client_socket.recv(1024)
+        if not data:
+            break
+
+        # 메시지는 줄바꿈으로 구분 (마지막 조각은 다음 수신 데이터와 합침)
+        *messages, buffer = (buffer + data).split(b'\n')
+        for command in messages:
+            command = command.decode('utf-8')
+            if command == 'buzzer on':
+                print("<Warning!>")
+                threading.Thread(target=buzz_once, args=(1,), daemon=True).start()
+            elif command == 'buzzer off':
+                buzzer_pwm.stop()
+                GPIO.output(BUZZER_PIN, GPIO.LOW)
+            elif command == 'exit':
+                running = False
+            else:
+                print(f'Message from the server: {command}')
+    running = False
+    frame_ready.set()
 
 
 def process_frames():
@@ -146,7 +233,12 @@ def process_frames():
 
 # Create threads for capturing and processing frames
 capture_thread = threading.Thread(target=capture_frames)
-process_thread = threading.Thread(target=process_frames)
+if MODE == 'stream':
+    process_thread = threading.Thread(target=stream_frames)
+    message_thread = threading.Thread(target=receive_messages, daemon=True)
+    message_thread.start()
+else:
+    process_thread = threading.Thread(target=process_frames)
 
 # Start the threads
 capture_thread.start()
@@ -156,10 +248,21 @@ process_thread.start()
 capture_thread.join()
 process_thread.join()
 
+# Release the webcam (local 모드는 process_frames에서 해제)
+if MODE == 'stream':
+    cap.release()
+
 # Cleanup GPIO
 GPIO.cleanup()
 
 # Close the socket
+if image_socket is not None:
+    # 크기 0을 전송하여 이미지 전송을 종료
+    try:
+        image_socket.sendall(struct.pack(">L", 0))
+    except OSError:
+        pass
+    image_socket.close()
 client_socket.close()
 
 print("<Program ended>")
\ No newline at end of file
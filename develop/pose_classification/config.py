@@ -17,6 +17,9 @@ DETECTION_FRAME_THRESHOLD = 60  # 포즈 측정을 활성화하기 위해 필요
 # 버퍼 크기 설정
 HISTORY_LENGTH = 10  # 결과 히스토리 및 신뢰도 히스토리의 버퍼 크기
 
+# 캐시 설정
+CACHE_DIR = '.cache'  # 모델 추론 결과 캐시 디렉토리
+
 # 디버깅 설정
 BBOX_COLOR = (0, 255, 0)  # 경계 상자 색상 (BGR)
 NORMAL_COLOR = (0, 255, 0) # 일반 상황 텍스트
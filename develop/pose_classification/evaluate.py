@@ -0,0 +1,253 @@
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+
+import config
+from processor import ProcessState, PoseProcessor
+from utils.batch import list_videos, worker_properties
+from utils.cache import ResultCache
+
+
+# 워커 프로세스마다 하나씩 사용하는 포즈 처리기 (모델은 처음 필요할 때 한 번만 컴파일)
+_worker = {}
+
+
+def _init_worker(properties, cache_dir):
+    """
+    워커 프로세스 초기화 함수
+
+    Args:
+        properties (dict): compile_model 설정
+        cache_dir (str | None): 모델 추론 결과 캐시 디렉토리
+    """
+    _worker['video_time'] = 0.0
+    _worker['cache_dir'] = cache_dir
+    # 실제 시간 대신 영상 시간으로 'pull' 상태 유지 시간을 판단
+    _worker['processor'] = PoseProcessor(clock=lambda: _worker['video_time'], properties=properties)
+
+
+def load_labels(label_path):
+    """
+    사고 구간 라벨 파일을 읽는 함수
+    각 행은 'start,end' 형식이며 영상 시작 기준 초 단위입니다.
+
+    Args:
+        label_path (str): 라벨 CSV 파일 경로
+
+    Returns:
+        list[tuple[float, float]]: 사고 구간 목록
+    """
+    intervals = []
+    with open(label_path, newline='') as f:
+        for row in csv.reader(f):
+            if not row or row[0].strip().startswith('#') or row[0].strip() == 'start':
+                continue
+            intervals.append((float(row[0]), float(row[1])))
+    return intervals
+
+
+def score_events(warnings, incidents, tolerance):
+    """
+    경고 발생 시간을 사고 구간과 비교하는 함수
+
+    Args:
+        warnings (list[float]): 경고 발생 시간(초)
+        incidents (list[tuple[float, float]]): 사고 구간
+        tolerance (float): 사고 구간 종료 후에도 정상 경보로 인정하는 시간(초)
+
+    Returns:
+        dict: detected, missed, false_alarms, time_to_alarm
+    """
+    time_to_alarm = []
+    for start, end in incidents:
+        hits = [t for t in warnings if start <= t <= end + tolerance]
+        if hits:
+            time_to_alarm.append(min(hits) - start)
+    false_alarms = [t for t in warnings
+                    if not any(start <= t <= end + tolerance for start, end in incidents)]
+    return {
+        'detected': len(time_to_alarm),
+        'missed': len(incidents) - len(time_to_alarm),
+        'false_alarms': len(false_alarms),
+        'time_to_alarm': time_to_alarm,
+    }
+
+
+def evaluate_video(video_path, label_path, tolerance):
+    """
+    영상 하나를 화면 출력 없이 처리하는 함수 (워커 프로세스에서 실행)
+
+    Returns:
+        dict: 영상별 평가 결과
+    """
+    processor = _worker['processor']
+    processor.stage_times.clear()
+    processor.stage_counts.clear()
+    processor.cache = None
+    if _worker['cache_dir'] is not None:
+        processor.cache = ResultCache(_worker['cache_dir'], video_path,
+                                      config.PERSON_DETECTION_MODEL_PATH,
+                                      config.POSE_ESTIMATION_MODEL_PATH,
+                                      config.POSE_CLASSIFICATION_MODEL_PATH)
+    state = ProcessState()
+
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    warnings = []
+    frame_index = 0
+    start_time = time.perf_counter()
+    try:
+        while True:
+            decode_start = time.perf_counter()
+            ret, frame = cap.read()
+            if not ret:
+                break
+            processor.stage_times['decode'] += time.perf_counter() - decode_start
+            processor.stage_counts['decode'] += 1
+
+            _worker['video_time'] = frame_index / fps
+            was_warning = state.warning_active
+            processor.process_frame(frame, state, frame_index)
+            # 경고가 새로 발생한 시점 기록
+            if state.warning_active and not was_warning:
+                warnings.append(frame_index / fps)
+            frame_index += 1
+    finally:
+        cap.release()
+        if processor.cache is not None:
+            processor.cache.save()
+    elapsed_time = time.perf_counter() - start_time
+
+    result = {
+        'video': video_path,
+        'label': label_path,
+        'frames': frame_index,
+        'duration': frame_index / fps,
+        'processing_time': elapsed_time,
+        'processing_fps': frame_index / elapsed_time if elapsed_time > 0 else 0.0,
+        'warnings': warnings,
+        'stages': {stage: {'calls': processor.stage_counts[stage],
+                           'total': total,
+                           'mean_ms': 1000 * total / max(processor.stage_counts[stage], 1)}
+                   for stage, total in processor.stage_times.items()},
+    }
+    if label_path is not None:
+        incidents = load_labels(label_path)
+        result['incidents'] = len(incidents)
+        result.update(score_events(warnings, incidents, tolerance))
+    return result
+
+
+def summarize(results):
+    """
+    영상별 결과를 하나의 보고서로 합치는 함수
+    """
+    labeled = [result for result in results if 'incidents' in result]
+    duration = sum(result['duration'] for result in results)
+    incidents = sum(result['incidents'] for result in labeled)
+    detected = sum(result['detected'] for result in labeled)
+    false_alarms = sum(result['false_alarms'] for result in labeled)
+    time_to_alarm = [t for result in labeled for t in result['time_to_alarm']]
+
+    stages = {}
+    for result in results:
+        for stage, timing in result['stages'].items():
+            total = stages.setdefault(stage, {'calls': 0, 'total': 0.0})
+            total['calls'] += timing['calls']
+            total['total'] += timing['total']
+    for timing in stages.values():
+        timing['mean_ms'] = 1000 * timing['total'] / max(timing['calls'], 1)
+
+    return {
+        'videos': len(results),
+        'labeled_videos': len(labeled),
+        'frames': sum(result['frames'] for result in results),
+        'video_hours': duration / 3600,
+        'warnings': sum(len(result['warnings']) for result in results),
+        'incidents': incidents,
+        'detected': detected,
+        'recall': detected / incidents if incidents else None,
+        'false_alarms': false_alarms,
+        'false_alarms_per_hour': false_alarms / (duration / 3600) if duration > 0 else None,
+        'mean_time_to_alarm': sum(time_to_alarm) / len(time_to_alarm) if time_to_alarm else None,
+        'max_time_to_alarm': max(time_to_alarm) if time_to_alarm else None,
+        'stages': stages,
+    }
+
+
+def main(source, output, workers, tolerance, cache_dir):
+    """
+    영상 모음 일괄 평가 메인 함수
+
+    Args:
+        source (str): 영상 디렉토리 또는 매니페스트 파일
+        output (str): 보고서(JSON) 저장 경로
+        workers (int): 워커 프로세스 수
+        tolerance (float): 사고 구간 종료 후에도 정상 경보로 인정하는 시간(초)
+        cache_dir (str | None): 모델 추론 결과 캐시 디렉토리
+    """
+    videos = list_videos(source)
+    if not videos:
+        logging.error(f'No videos found: {source}')
+        sys.exit(1)
+
+    # 라벨 파일을 지정하지 않은 영상은 같은 이름의 .csv 파일 사용
+    sessions = []
+    for video_path, label_path in videos:
+        if label_path is None:
+            candidate = os.path.splitext(video_path)[0] + '.csv'
+            label_path = candidate if os.path.exists(candidate) else None
+        sessions.append((video_path, label_path))
+
+    start_time = time.time()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(worker_properties(workers), cache_dir)) as executor:
+        futures = {executor.submit(evaluate_video, video_path, label_path, tolerance): video_path
+                   for video_path, label_path in sessions}
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                result = future.result()
+            except Exception as e:
+                logging.error(f'Error during processing {futures[future]}: {e}')
+                continue
+            results.append(result)
+            logging.info(f'[{done}/{len(sessions)}] {result["video"]}: '
+                         f'{len(result["warnings"])} warnings, {result["processing_fps"]:.1f} fps')
+
+    results.sort(key=lambda result: result['video'])
+    report = {'summary': summarize(results), 'videos': results,
+              'elapsed_time': time.time() - start_time}
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    summary = report['summary']
+    logging.info(f'{summary["videos"]} videos ({summary["video_hours"]:.2f} h) in {report["elapsed_time"]:.1f}s')
+    logging.info(f'incidents: {summary["detected"]}/{summary["incidents"]} detected, '
+                 f'false alarms: {summary["false_alarms"]} ({summary["false_alarms_per_hour"]} /h), '
+                 f'mean time to alarm: {summary["mean_time_to_alarm"]}')
+    for stage, timing in summary['stages'].items():
+        logging.info(f'{stage}: {timing["mean_ms"]:.2f} ms x {timing["calls"]}')
+    logging.info(f'Report: {output}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Evaluate recorded sessions headlessly in parallel')
+    parser.add_argument('--source', '-s', type=str, required=True, help='Video directory or manifest file')
+    parser.add_argument('--output', '-o', type=str, default='evaluation.json', help='Report path')
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count(), help='Number of worker processes')
+    parser.add_argument('--tolerance', type=float, default=5.0,
+                        help='Seconds after an incident in which a warning still counts as correct')
+    parser.add_argument('--cache-dir', type=str, default=config.CACHE_DIR, help='Model result cache directory')
+    parser.add_argument('--no-cache', action='store_true', help='Run every model without the result cache')
+    args = parser.parse_args()
+    logging.basicConfig(level=getattr(logging, 'INFO'))
+    main(args.source, args.output, args.workers, args.tolerance,
+         None if args.no_cache else args.cache_dir)
@@ -0,0 +1,225 @@
+import argparse
+import glob
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+import numpy as np
+
+import config
+from utils.batch import frame_count, list_videos, video_id, worker_properties
+from utils.model import PersonDetector, PoseEstimator
+from utils.utils import crop_roi
+
+
+# 워커 프로세스마다 한 번만 컴파일한 모델
+_worker_models = {}
+
+
+def _init_worker(properties):
+    """
+    워커 프로세스 초기화 함수 (모델 컴파일)
+
+    Args:
+        properties (dict): compile_model 설정
+    """
+    _worker_models['person_detector'] = PersonDetector(
+        model_path=config.PERSON_DETECTION_MODEL_PATH, device=config.DEVICE, properties=properties)
+    _worker_models['pose_estimator'] = PoseEstimator(
+        model_path=config.POSE_ESTIMATION_MODEL_PATH, device=config.DEVICE, properties=properties)
+
+
+def extract_shard(task):
+    """
+    영상의 프레임 구간 하나에서 학습 데이터를 추출하는 함수 (워커 프로세스에서 실행)
+
+    Args:
+        task (dict): 작업 정보
+            video_path, label, start, end, stride, shard_path, save_images
+
+    Returns:
+        tuple[str, int]: (샤드 파일 경로, 추출한 샘플 수)
+    """
+    person_detector = _worker_models['person_detector']
+    pose_estimator = _worker_models['pose_estimator']
+
+    cap = cv2.VideoCapture(task['video_path'])
+    cap.set(cv2.CAP_PROP_POS_FRAMES, task['start'])
+
+    frame_indexes = []
+    keypoints_list = []
+    boxes_list = []
+    images = []
+    for index in range(task['start'], task['end']):
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if (index - task['start']) % task['stride']:
+            continue
+
+        # 사람이 감지된 프레임만 사용
+        boxes, scores, labels = person_detector.predict(frame)
+        if len(boxes) == 0:
+            continue
+        roi = crop_roi(frame, boxes, 10)
+        if roi.size == 0:
+            continue
+
+        keypoints = pose_estimator.estimate(roi)
+        frame_indexes.append(index)
+        keypoints_list.append(keypoints)
+        boxes_list.append(boxes[0])
+
+        # 분류 모델 학습용 skeleton 이미지 (PNG로 인코딩하여 샤드에 함께 저장)
+        if task['save_images']:
+            skeleton_image = pose_estimator.visualize(roi, keypoints)
+            images.append(cv2.imencode('.png', skeleton_image)[1].ravel())
+    cap.release()
+
+    arrays = {}
+    if task['save_images']:
+        # 이미지 크기가 서로 다르므로 인코딩한 바이트를 이어 붙이고 이미지별 시작 위치를 함께 저장
+        arrays['images'] = np.concatenate(images) if images else np.zeros(0, dtype=np.uint8)
+        arrays['image_offsets'] = np.cumsum([0] + [len(image) for image in images], dtype=np.int64)
+
+    # 샤드 파일이 완성된 경우에만 존재하도록 임시 파일에 쓴 후 이름 변경 (재시작 시 완료 여부로 사용)
+    temp_path = task['shard_path'] + '.tmp.npz'
+    np.savez(temp_path,
+             frame_index=np.array(frame_indexes, dtype=np.int64),
+             keypoints=np.array(keypoints_list, dtype=np.float32).reshape(-1, 17, 3),
+             boxes=np.array(boxes_list, dtype=np.float32).reshape(-1, 4),
+             label=task['label'],
+             video=task['video_path'],
+             **arrays)
+    os.replace(temp_path, task['shard_path'])
+
+    return task['shard_path'], len(frame_indexes)
+
+
+def make_tasks(videos, output_dir, label, shard_size, stride, save_images):
+    """
+    영상 목록을 프레임 구간 작업으로 나누는 함수 (이미 완료된 샤드는 제외)
+
+    Returns:
+        tuple[list[dict], int]: (남은 작업 목록, 완료된 샤드 수)
+    """
+    tasks = []
+    completed = 0
+    for video_path, _ in videos:
+        # 라벨을 지정하지 않으면 영상이 있는 디렉토리 이름을 라벨로 사용
+        video_label = label or os.path.basename(os.path.dirname(os.path.abspath(video_path)))
+        shard_dir = os.path.join(output_dir, 'keypoints', video_label, video_id(video_path))
+        os.makedirs(shard_dir, exist_ok=True)
+
+        total = frame_count(video_path)
+        for start in range(0, total, shard_size):
+            shard_path = os.path.join(shard_dir, f'{start:08d}.npz')
+            if os.path.exists(shard_path):
+                completed += 1
+                continue
+            tasks.append({
+                'video_path': video_path,
+                'label': video_label,
+                'start': start,
+                'end': min(start + shard_size, total),
+                'stride': stride,
+                'shard_path': shard_path,
+                'save_images': save_images,
+            })
+    return tasks, completed
+
+
+def shard_images(shard):
+    """
+    샤드에 저장된 skeleton 이미지를 디코딩하는 함수 (--images로 추출한 샤드)
+
+    Args:
+        shard (NpzFile): np.load로 연 샤드 파일
+
+    Returns:
+        list[np.ndarray]: 샘플(frame_index) 순서의 skeleton 이미지
+    """
+    images = shard['images']
+    offsets = shard['image_offsets']
+    return [cv2.imdecode(images[start:end], cv2.IMREAD_COLOR) for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def merge_shards(output_dir):
+    """
+    모든 샤드를 하나의 키 포인트 데이터셋 파일로 합치는 함수
+
+    Returns:
+        str: 데이터셋 파일 경로
+    """
+    keypoints, labels, videos, frame_indexes = [], [], [], []
+    for shard_path in sorted(glob.glob(os.path.join(output_dir, 'keypoints', '*', '*', '*.npz'))):
+        with np.load(shard_path) as shard:
+            count = len(shard['frame_index'])
+            keypoints.append(shard['keypoints'])
+            frame_indexes.append(shard['frame_index'])
+            labels.extend([str(shard['label'])] * count)
+            videos.extend([str(shard['video'])] * count)
+
+    dataset_path = os.path.join(output_dir, 'keypoints.npz')
+    np.savez(dataset_path,
+             keypoints=np.concatenate(keypoints) if keypoints else np.zeros((0, 17, 3), dtype=np.float32),
+             frame_index=np.concatenate(frame_indexes) if frame_indexes else np.zeros(0, dtype=np.int64),
+             label=np.array(labels),
+             video=np.array(videos))
+    return dataset_path
+
+
+def main(source, output_dir, label, workers, shard_size, stride, save_images):
+    """
+    학습 데이터 추출 메인 함수
+
+    Args:
+        source (str): 영상 디렉토리 또는 매니페스트 파일
+        output_dir (str): 출력 디렉토리
+        label (str | None): 모든 영상에 사용할 라벨 (None이면 디렉토리 이름)
+        workers (int): 워커 프로세스 수
+        shard_size (int): 작업 하나가 처리할 프레임 수
+        stride (int): 프레임 추출 간격
+        save_images (bool): skeleton 이미지 저장 여부 (샤드 파일에 PNG로 함께 저장, shard_images로 읽음)
+    """
+    videos = list_videos(source)
+    if not videos:
+        logging.error(f'No videos found: {source}')
+        sys.exit(1)
+
+    tasks, completed = make_tasks(videos, output_dir, label, shard_size, stride, save_images)
+    logging.info(f'{len(videos)} videos, {len(tasks)} shards to extract ({completed} already done)')
+
+    start_time = time.time()
+    samples = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(worker_properties(workers),)) as executor:
+        futures = [executor.submit(extract_shard, task) for task in tasks]
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                shard_path, count = future.result()
+            except Exception as e:
+                logging.error(f'Error during extraction: {e}')
+                continue
+            samples += count
+            logging.info(f'[{done}/{len(tasks)}] {shard_path}: {count} samples')
+
+    logging.info(f'Extracted {samples} samples in {time.time() - start_time:.1f}s')
+    logging.info(f'Dataset: {merge_shards(output_dir)}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Extract pose training data from videos in parallel')
+    parser.add_argument('--source', '-s', type=str, required=True, help='Video directory or manifest file')
+    parser.add_argument('--output', '-o', type=str, required=True, help='Output directory')
+    parser.add_argument('--label', type=str, default=None, help='Label for all videos (default: parent directory name)')
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count(), help='Number of worker processes')
+    parser.add_argument('--shard-size', type=int, default=900, help='Frames per shard')
+    parser.add_argument('--stride', type=int, default=1, help='Use every N-th frame')
+    parser.add_argument('--images', action='store_true', help='Also store skeleton images in each shard for classifier training')
+    args = parser.parse_args()
+    logging.basicConfig(level=getattr(logging, 'INFO'))
+    main(args.source, args.output, args.label, args.workers, args.shard_size, args.stride, args.images)
@@ -3,24 +3,35 @@ import argparse
 import os
 import cv2
 import logging
+import config
 from processor import ProcessState, PoseProcessor
+from utils.cache import ResultCache
 from utils.utils import display_frame_info
 
 
-def main(source):
+def main(source, cache_dir=None):
     """
     메인 함수
 
     Args:
         source (str): 비디오 소스 경로
+        cache_dir (str, optional): 모델 추론 결과 캐시 디렉토리 (None이면 캐시 사용 안 함)
     """
     class_name = ['pull', 'push', 'unknown']    # 분류명
-    pose_processor = PoseProcessor()    # 포즈 처리 클래스
     state = ProcessState()  # 프로세스 상태 초기화 
 
     if not os.path.exists(source):
         logging.error(f'File not found: {source}')
         sys.exit(1)
+
+    # 영상과 모델이 바뀌지 않았다면 이전 추론 결과를 재사용
+    cache = None
+    if cache_dir is not None:
+        cache = ResultCache(cache_dir, source,
+                            config.PERSON_DETECTION_MODEL_PATH,
+                            config.POSE_ESTIMATION_MODEL_PATH,
+                            config.POSE_CLASSIFICATION_MODEL_PATH)
+    pose_processor = PoseProcessor(cache)    # 포즈 처리 클래스
     
     # cv2 영상 이미지 캡처
     cap = cv2.VideoCapture(source)
@@ -37,7 +48,7 @@ def main(source):
                 break
 
             # 프레임 처리
-            pose_processor.process_frame(frame, state)
+            pose_processor.process_frame(frame, state, current_frame_count)
             current_frame_count += 1  # 현재 프레임 수 증가
 
             display_frame_info(frame, state, current_frame_count, class_name)
@@ -50,6 +61,8 @@ def main(source):
         logging.error(f'Error during processing: {e}')
     finally:
         #client_socket.close()
+        if cache is not None:
+            cache.save()
         cap.release()
         cv2.destroyAllWindows()
 
@@ -57,6 +70,8 @@ def main(source):
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('--source', '-s', type=str, help='Input source', required=True)
+    parser.add_argument('--cache-dir', type=str, default=config.CACHE_DIR, help='Model result cache directory')
+    parser.add_argument('--no-cache', action='store_true', help='Run every model without the result cache')
     args = parser.parse_args()
     logging.basicConfig(level=getattr(logging, 'INFO'))
-    main(args.source)
+    main(args.source, None if args.no_cache else args.cache_dir)
@@ -1,6 +1,6 @@
 import time
 import numpy as np
-from collections import deque
+from collections import defaultdict, deque
 from utils.model import PersonDetector, PoseEstimator, PoseClassifier
 from utils.utils import crop_roi
 import config
@@ -31,24 +31,54 @@ class PoseProcessor:
     """
     포즈 처리기 클래스
     """
-    def __init__(self):
+    def __init__(self, cache=None, clock=time.time, properties=None):
         """
         포즈 처리기 초기화 함수
+        모델은 캐시에 결과가 없어 처음 필요할 때 불러옵니다.
+
+        Args:
+            cache (ResultCache, optional): 모델 추론 결과 캐시
+            clock (callable, optional): 현재 시간을 반환하는 함수 (오프라인 평가 시 영상 시간 사용)
+            properties (dict, optional): compile_model에 전달할 OpenVINO 설정
         """
-        self.person_detector = PersonDetector(model_path=config.PERSON_DETECTION_MODEL_PATH, device=config.DEVICE)
-        self.pose_estimator = PoseEstimator(model_path=config.POSE_ESTIMATION_MODEL_PATH, device=config.DEVICE)
-        self.pose_classifier = PoseClassifier(model_path=config.POSE_CLASSIFICATION_MODEL_PATH, device=config.DEVICE)
+        self.cache = cache
+        self.clock = clock
+        self.properties = properties
+        self.stage_times = defaultdict(float)  # 단계별 누적 처리 시간(초)
+        self.stage_counts = defaultdict(int)  # 단계별 처리 횟수
+        self._person_detector = None
+        self._pose_estimator = None
+        self._pose_classifier = None
+
+    @property
+    def person_detector(self):
+        if self._person_detector is None:
+            self._person_detector = PersonDetector(model_path=config.PERSON_DETECTION_MODEL_PATH, device=config.DEVICE, properties=self.properties)
+        return self._person_detector
 
-    def process_frame(self, frame, state):
+    @property
+    def pose_estimator(self):
+        if self._pose_estimator is None:
+            self._pose_estimator = PoseEstimator(model_path=config.POSE_ESTIMATION_MODEL_PATH, device=config.DEVICE, properties=self.properties)
+        return self._pose_estimator
+
+    @property
+    def pose_classifier(self):
+        if self._pose_classifier is None:
+            self._pose_classifier = PoseClassifier(model_path=config.POSE_CLASSIFICATION_MODEL_PATH, device=config.DEVICE, properties=self.properties)
+        return self._pose_classifier
+
+    def process_frame(self, frame, state, frame_index=None):
         """
         비디오 프레임을 처리하는 함수
 
         Args:
             frame (numpy.ndarray): 비디오 프레임
             state (ProcessState): 상태를 관리하는 객체
+            frame_index (int, optional): 프레임 번호 (캐시 사용 시 필요)
         """
         # 사람 감지
-        boxes, scores, labels = self.person_detector.predict(frame)
+        boxes = self._detect(frame, frame_index)
         state.person_detected = len(boxes) > 0
 
         # 사람이 감지되면
@@ -56,12 +86,72 @@ class PoseProcessor:
             state.person_detected_frame_count += 1
             # detection_frame_threshold만큼 프레임 소모 후 포즈 측정 활성화
             if state.person_detected_frame_count > state.detection_frame_threshold:
-                self._process_pose(frame, boxes, state)
+                self._process_pose(frame, boxes, state, frame_index)
         # 사람이 감지되지 않으면 변수 초기화
         else:
             self._reset_state(state)
-    
-    def _process_pose(self, frame, boxes, state):
+
+    def _add_stage_time(self, stage, start_time):
+        self.stage_times[stage] += time.perf_counter() - start_time
+        self.stage_counts[stage] += 1
+
+    def _use_cache(self, frame_index):
+        return self.cache is not None and frame_index is not None
+
+    def _detect(self, frame, frame_index):
+        """
+        사람 감지 (캐시에 결과가 있으면 캐시 사용)
+        """
+        if self._use_cache(frame_index):
+            cached = self.cache.get_detection(frame_index)
+            if cached is not None:
+                return cached[0]
+
+        start_time = time.perf_counter()
+        boxes, scores, labels = self.person_detector.predict(frame)
+        self._add_stage_time('detection', start_time)
+        if self._use_cache(frame_index):
+            self.cache.put_detection(frame_index, boxes, scores)
+        return boxes
+
+    def _classify(self, frame, boxes, frame_index):
+        """
+        포즈 추정 및 분류 (캐시에 결과가 있으면 캐시 사용)
+
+        Returns:
+            numpy.ndarray: 클래스별 점수
+        """
+        if self._use_cache(frame_index):
+            class_scores = self.cache.get_class_scores(frame_index)
+            if class_scores is not None:
+                return class_scores
+            keypoints = self.cache.get_keypoints(frame_index)
+        else:
+            keypoints = None
+
+        # 관심 영역(ROI) 크롭
+        roi = crop_roi(frame, boxes, 10)
+
+        # ROI내에서 키 포인트 추정
+        if keypoints is None:
+            start_time = time.perf_counter()
+            keypoints = self.pose_estimator.estimate(roi)
+            self._add_stage_time('pose', start_time)
+            if self._use_cache(frame_index):
+                self.cache.put_keypoints(frame_index, keypoints)
+
+        # 포즈 추정 이미지로 포즈 분류
+        start_time = time.perf_counter()
+        skeleton_image = self.pose_estimator.visualize(roi, keypoints)
+        self._add_stage_time('skeleton', start_time)
+        start_time = time.perf_counter()
+        class_scores = self.pose_classifier.classify(skeleton_image)
+        self._add_stage_time('classification', start_time)
+        if self._use_cache(frame_index):
+            self.cache.put_class_scores(frame_index, class_scores)
+        return class_scores
+
+    def _process_pose(self, frame, boxes, state, frame_index=None):
         """
         포즈를 처리하는 내부 함수
 
@@ -69,15 +159,11 @@ class PoseProcessor:
             frame (numpy.ndarray): 비디오 프레임
             boxes (list): 감지된 객체의 경계 상자 리스트
             state (ProcessState): 상태를 관리하는 객체
+            frame_index (int, optional): 프레임 번호
         """
-        # 관심 영역(ROI) 크롭
-        roi = crop_roi(frame, boxes, 10)
-
-        # ROI내에서 포즈 추정 이미지 추출
-        skeleton_image = self.pose_estimator.predict(roi)
-
-        # 추출한 포즈 추정 이미지로 포즈 분류
-        predicted_index, confidence = self.pose_classifier.predict(skeleton_image)
+        class_scores = self._classify(frame, boxes, frame_index)
+        predicted_index = np.argmax(class_scores)
+        confidence = np.max(class_scores)
 
         # 결과의 신뢰도가 pose_threshold를 넘은 경우
         if confidence > state.pose_threshold:
@@ -111,9 +197,10 @@ class PoseProcessor:
             frame (numpy.ndarray): 비디오 프레임
             state (ProcessState): 상태를 관리하는 객체
         """
+        now = self.clock()
         if state.pull_start_time is None:
-            state.pull_start_time = time.time()
-        elapsed_time = time.time() - state.pull_start_time
+            state.pull_start_time = now
+        elapsed_time = now - state.pull_start_time
         # pull_state_duration만큼의 시간동안 pull상태가 지속되는 경우
         if elapsed_time > state.pull_state_duration:
             state.warning_active = True # warning 활성화
@@ -0,0 +1,75 @@
+import csv
+import hashlib
+import os
+
+import cv2
+
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv')
+
+
+def list_videos(path):
+    """
+    영상 목록을 만드는 함수
+
+    Args:
+        path (str): 영상 디렉토리(하위 디렉토리 포함) 또는 매니페스트 파일 경로
+            매니페스트는 한 줄에 하나의 영상 경로를 적은 텍스트/CSV 파일이며,
+            CSV인 경우 첫 번째 열을 영상 경로, 두 번째 열(선택)을 라벨 파일 경로로 사용합니다.
+
+    Returns:
+        list[tuple[str, str | None]]: (영상 경로, 라벨 파일 경로) 목록
+    """
+    if os.path.isdir(path):
+        videos = []
+        for root, _, files in os.walk(path):
+            for name in sorted(files):
+                if name.lower().endswith(VIDEO_EXTENSIONS):
+                    videos.append((os.path.join(root, name), None))
+        return sorted(videos)
+
+    # 매니페스트의 상대 경로는 매니페스트 위치 기준
+    base_dir = os.path.dirname(os.path.abspath(path))
+    videos = []
+    with open(path, newline='') as f:
+        for row in csv.reader(f):
+            if not row or not row[0].strip() or row[0].strip().startswith('#'):
+                continue
+            video_path = os.path.join(base_dir, row[0].strip())
+            label_path = os.path.join(base_dir, row[1].strip()) if len(row) > 1 and row[1].strip() else None
+            videos.append((video_path, label_path))
+    return videos
+
+
+def video_id(video_path):
+    """
+    출력 파일 이름에 사용할 영상 식별자 (파일 이름 + 경로 해시)
+    """
+    stem = os.path.splitext(os.path.basename(video_path))[0]
+    digest = hashlib.sha1(os.path.abspath(video_path).encode()).hexdigest()[:8]
+    return f'{stem}-{digest}'
+
+
+def frame_count(video_path):
+    """
+    영상의 프레임 수
+    """
+    cap = cv2.VideoCapture(video_path)
+    count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    return count
+
+
+def worker_properties(workers):
+    """
+    워커 프로세스 하나가 사용할 OpenVINO 설정
+    모든 워커가 전체 코어를 쓰려고 경쟁하지 않도록 코어를 나눠 줍니다.
+
+    Args:
+        workers (int): 워커 프로세스 수
+
+    Returns:
+        dict: compile_model 설정
+    """
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    return {'INFERENCE_NUM_THREADS': threads, 'PERFORMANCE_HINT': 'LATENCY'}
@@ -0,0 +1,176 @@
+import hashlib
+import os
+
+import numpy as np
+
+
+MAX_BOXES = 8  # 프레임마다 저장할 최대 경계 상자 수
+NUM_KEYPOINTS = 17
+
+
+def file_hash(path):
+    """
+    파일 내용의 SHA-256 해시를 계산하는 함수
+    OpenVINO IR(.xml)인 경우 같은 이름의 가중치 파일(.bin)도 함께 해시합니다.
+
+    Args:
+        path (str): 파일 경로
+
+    Returns:
+        str: 16진수 해시 문자열
+    """
+    digest = hashlib.sha256()
+    paths = [path]
+    weights_path = os.path.splitext(path)[0] + '.bin'
+    if path.endswith('.xml') and os.path.exists(weights_path):
+        paths.append(weights_path)
+
+    for file_path in paths:
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def _combine(*hashes):
+    return hashlib.sha256('/'.join(hashes).encode()).hexdigest()[:32]
+
+
+class _ArrayStore:
+    """
+    프레임 번호로 접근하는 배열 묶음을 하나의 .npz 파일로 저장하는 클래스
+
+    Args:
+        path (str): .npz 파일 경로
+        fields (dict): 필드 이름별 (프레임 당 shape, dtype)
+    """
+    def __init__(self, path, fields):
+        self.path = path
+        self._dirty = False
+        self.arrays = {'valid': np.zeros(0, dtype=bool)}
+        for name, (shape, dtype) in fields.items():
+            self.arrays[name] = np.zeros((0,) + shape, dtype=dtype)
+
+        if os.path.exists(path):
+            with np.load(path) as data:
+                self.arrays = {name: data[name] for name in self.arrays}
+
+    def __len__(self):
+        return len(self.arrays['valid'])
+
+    def get(self, index):
+        """
+        프레임 결과 반환 (저장되지 않은 경우 None)
+        """
+        if index >= len(self) or not self.arrays['valid'][index]:
+            return None
+        return {name: array[index] for name, array in self.arrays.items() if name != 'valid'}
+
+    def put(self, index, **values):
+        """
+        프레임 결과 저장
+        """
+        if index >= len(self):
+            # 필요한 만큼 두 배씩 늘림
+            size = max(index + 1, 2 * len(self), 256)
+            for name, array in self.arrays.items():
+                grown = np.zeros((size,) + array.shape[1:], dtype=array.dtype)
+                grown[:len(array)] = array
+                self.arrays[name] = grown
+        for name, value in values.items():
+            self.arrays[name][index] = value
+        self.arrays['valid'][index] = True
+        self._dirty = True
+
+    def save(self):
+        """
+        변경된 내용을 파일로 저장 (임시 파일에 쓴 후 이름 변경)
+        """
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + '.tmp.npz'
+        np.savez_compressed(temp_path, **self.arrays)
+        os.replace(temp_path, self.path)
+        self._dirty = False
+
+
+class ResultCache:
+    """
+    영상 프레임별 모델 추론 결과 캐시
+    영상 파일 해시와 모델 파일 해시로 만든 키마다 결과를 저장하므로,
+    모델이나 영상이 바뀌지 않았다면 후처리를 수정해도 추론을 다시 하지 않습니다.
+
+    단계별로 키를 나눠, 분류 모델만 바뀐 경우에는 사람 감지/포즈 추정 결과를 재사용합니다.
+    - 사람 감지: 영상 + 사람 감지 모델
+    - 포즈 추정: 영상 + 사람 감지 모델 + 포즈 추정 모델
+    - 포즈 분류: 영상 + 세 모델 모두
+
+    Args:
+        cache_dir (str): 캐시 디렉토리
+        video_path (str): 영상 파일 경로
+        detection_model_path (str): 사람 감지 모델 경로
+        pose_model_path (str): 포즈 추정 모델 경로
+        classification_model_path (str): 포즈 분류 모델 경로
+    """
+    def __init__(self, cache_dir, video_path, detection_model_path,
+                 pose_model_path, classification_model_path):
+        video = file_hash(video_path)
+        detection = file_hash(detection_model_path)
+        pose = file_hash(pose_model_path)
+        classification = file_hash(classification_model_path)
+
+        self.detections = _ArrayStore(
+            os.path.join(cache_dir, f'detection-{_combine(video, detection)}.npz'),
+            {'num_boxes': ((), np.int16),
+             'boxes': ((MAX_BOXES, 4), np.float64),
+             'scores': ((MAX_BOXES,), np.float64)})
+        self.poses = _ArrayStore(
+            os.path.join(cache_dir, f'pose-{_combine(video, detection, pose)}.npz'),
+            {'keypoints': ((NUM_KEYPOINTS, 3), np.float32)})
+        self.classifications = _ArrayStore(
+            os.path.join(cache_dir, f'classification-{_combine(video, detection, pose, classification)}.npz'),
+            {'scores': ((2,), np.float32)})
+
+    def get_detection(self, index):
+        """
+        사람 감지 결과 반환
+
+        Returns:
+            tuple[np.ndarray, np.ndarray] | None: (경계 상자, 점수)
+        """
+        entry = self.detections.get(index)
+        if entry is None:
+            return None
+        count = int(entry['num_boxes'])
+        return entry['boxes'][:count], entry['scores'][:count]
+
+    def put_detection(self, index, boxes, scores):
+        count = min(len(boxes), MAX_BOXES)
+        padded_boxes = np.zeros((MAX_BOXES, 4), dtype=np.float64)
+        padded_scores = np.zeros(MAX_BOXES, dtype=np.float64)
+        padded_boxes[:count] = boxes[:count]
+        padded_scores[:count] = scores[:count]
+        self.detections.put(index, num_boxes=count, boxes=padded_boxes, scores=padded_scores)
+
+    def get_keypoints(self, index):
+        entry = self.poses.get(index)
+        return None if entry is None else entry['keypoints']
+
+    def put_keypoints(self, index, keypoints):
+        self.poses.put(index, keypoints=keypoints)
+
+    def get_class_scores(self, index):
+        entry = self.classifications.get(index)
+        return None if entry is None else entry['scores']
+
+    def put_class_scores(self, index, scores):
+        self.classifications.put(index, scores=scores)
+
+    def save(self):
+        """
+        캐시를 디스크에 저장
+        """
+        self.detections.save()
+        self.poses.save()
+        self.classifications.save()
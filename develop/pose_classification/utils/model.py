@@ -8,25 +8,26 @@ class OpenvinoModel:
     """
     OpenVINO 모델을 사용하기 위한 기본 클래스
     """
-    def __init__(self, model_path: str, device: str = 'CPU'):
+    def __init__(self, model_path: str, device: str = 'CPU', properties: dict = None):
         self.compiled_model = None
         self.input_layer = None
         self.output_layer = None
         self.height = 0
         self.width = 0
 
-        self._init_model(model_path, device)
+        self._init_model(model_path, device, properties)
     
-    def _init_model(self, model_path: str, device: str):
+    def _init_model(self, model_path: str, device: str, properties: dict = None):
         """
         모델 초기화
 
         Args:
             model_path (str): 모델 경로
             device (str): 추론에 사용할 장치
+            properties (dict, optional): compile_model에 전달할 OpenVINO 설정 (예: INFERENCE_NUM_THREADS)
         """
         model = core.read_model(model_path)
-        self.compiled_model = core.compile_model(model=model, device_name=device)
+        self.compiled_model = core.compile_model(model=model, device_name=device, config=properties or {})
         self.input_layer = self.compiled_model.input(0)
         self.output_layer = self.compiled_model.output(0)
         self.height, self.width = self.input_layer.shape[2:4]
@@ -53,8 +54,8 @@ class OpenvinoModel:
 
 
 class PersonDetector(OpenvinoModel):
-    def __init__(self, model_path: str, device: str = 'CPU'):
-        super().__init__(model_path, device)
+    def __init__(self, model_path: str, device: str = 'CPU', properties: dict = None):
+        super().__init__(model_path, device, properties)
     
     def predict(self, input_data: np.ndarray) -> np.ndarray:
         input_image = self._preprocess(input_data, transpose=True)
@@ -95,18 +96,22 @@ class PersonDetector(OpenvinoModel):
 
 
 class PoseEstimator(OpenvinoModel):
-    def __init__(self, model_path: str, device: str = 'CPU'):
-        super().__init__(model_path, device)
+    def __init__(self, model_path: str, device: str = 'CPU', properties: dict = None):
+        super().__init__(model_path, device, properties)
         self.height = 256
         self.width = 256
     
     def predict(self, input_data: np.ndarray) -> np.ndarray:
+        keypoints = self.estimate(input_data)
+        result_image = self.visualize(input_data, keypoints)
+
+        return result_image
+
+    def estimate(self, input_data: np.ndarray) -> np.ndarray:
         input_image = self._preprocess(input_data, transpose=False)
         results = self.compiled_model([input_image])[self.output_layer][0]
 
-        result_image = self.visualize(input_data, results[0])
-
-        return result_image
+        return results[0]
     
     def visualize(self, frame, keypoints):
         height, width, _ = frame.shape
@@ -142,13 +147,18 @@ class PoseEstimator(OpenvinoModel):
 
 
 class PoseClassifier(OpenvinoModel):
-    def __init__(self, model_path: str, device: str = 'CPU'):
-        super().__init__(model_path, device)
+    def __init__(self, model_path: str, device: str = 'CPU', properties: dict = None):
+        super().__init__(model_path, device, properties)
     
     def predict(self, input_data: np.ndarray) -> tuple[int, float]:
-        input_image = self._preprocess(input_data, transpose=True)
-        results = self.compiled_model([input_image])[self.output_layer]
+        results = self.classify(input_data)
         index = np.argmax(results)
         conf = np.max(results)
 
-        return index, conf
\ No newline at end of file
+        return index, conf
+
+    def classify(self, input_data: np.ndarray) -> np.ndarray:
+        input_image = self._preprocess(input_data, transpose=True)
+        results = self.compiled_model([input_image])[self.output_layer]
+
+        return results[0]
\ No newline at end of file
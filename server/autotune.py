@@ -0,0 +1,106 @@
+"""
+OpenVINO 실행 설정 탐색 프로그램
+
+기록된 영상으로 만든 모델별 입력으로 성능 힌트, 추론 스트림 수, 쓰레드 수, CPU 고정 여부 조합을
+이 장비에서 직접 측정하고, 목표에 가장 맞는 조합을 config.ini의 [openvino.<모델 종류>]에 저장합니다.
+측정은 [openvino] inference_cpus로 지정한 CPU에서 실행하므로 실제 서버와 같은 CPU 조건으로 비교합니다.
+모델은 config.ini [model]의 *_precision에 따라 실제로 실행할 모델(float 또는 INT8)을 측정합니다.
+
+사용 예:
+    python autotune.py incidents/                           # 프레임당 지연 시간 기준
+    python autotune.py incidents/ --target fps --jobs 2     # 카메라 2대의 전체 처리량 기준
+    python autotune.py incidents/ --models pose_estimation --dry-run
+"""
+import argparse
+import configparser
+import json
+import os
+import sys
+
+from utils.autotune import TARGETS, available_cpus, candidate_settings, tune
+from utils.clips import MODEL_KINDS, MODEL_PATHS, build_inputs, find_clips, read_frames
+from utils.model import select_model_path
+from utils.ov_config import OPENVINO_INFERENCE_CPUS, pin_current_thread, write_model_config
+
+
+REPORT_PATH = 'benchmarks/autotune_report.json'
+
+
+def format_settings(values: dict) -> str:
+    return f'hint={values["hint"]} streams={values["streams"]} threads={values["threads"]} pinning={values["pinning"]}'
+
+
+def format_result(result: dict) -> str:
+    if 'fps' in result:
+        return f'{result["fps"]:>8.1f}/s'
+    return f'{result["median_ms"]:>8.2f}ms (p90 {result["p90_ms"]:.2f}ms)'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('clips', type=str, help='Recorded clip (.avi) or directory of clips')
+    parser.add_argument('--target', choices=TARGETS, default='latency',
+                        help='latency: per-frame latency, fps: aggregate throughput')
+    parser.add_argument('--models', type=str, default=','.join(MODEL_KINDS),
+                        help='Comma-separated model kinds to tune')
+    parser.add_argument('--jobs', type=int, default=0,
+                        help='Concurrent requests for the fps target (number of cameras, 0: model default)')
+    parser.add_argument('--stride', type=int, default=10, help='Take every N-th frame of a clip')
+    parser.add_argument('--frames', type=int, default=100, help='Maximum frames')
+    parser.add_argument('--min-time', type=float, default=1.0, help='Minimum measuring time per setting (s)')
+    parser.add_argument('--config', type=str, default='config.ini', help='Config file to update')
+    parser.add_argument('--dry-run', action='store_true', help='Only print the results')
+    parser.add_argument('--report', type=str, default=REPORT_PATH, help='Report JSON path')
+    args = parser.parse_args()
+
+    kinds = [kind.strip() for kind in args.models.split(',')]
+    unknown = set(kinds) - set(MODEL_KINDS)
+    if unknown:
+        sys.exit(f'Unknown model kinds: {", ".join(sorted(unknown))}')
+
+    clips = find_clips(args.clips)
+    if not clips:
+        sys.exit(f'No clips found in {args.clips}')
+
+    # 서버의 추론 쓰레드와 같은 CPU에서 측정
+    pin_current_thread(OPENVINO_INFERENCE_CPUS)
+    settings = candidate_settings(available_cpus())
+    print(f'{len(clips)} clip(s), {available_cpus()} CPU(s), {len(settings)} setting(s) per model.')
+
+    inputs = build_inputs(read_frames(clips, args.stride, args.frames), MODEL_PATHS)
+
+    config = configparser.ConfigParser()
+    config.read(args.config)
+
+    report = {}
+    for kind in kinds:
+        if not inputs[kind]:
+            print(f'{kind}: no inputs (no person detected in the clips), skipped.')
+            continue
+        model_path = select_model_path(MODEL_PATHS[kind], config['model'][f'{kind}_precision'])
+        print(f'{kind}: measuring {model_path} with {len(inputs[kind])} inputs...')
+        results = tune(model_path, inputs[kind], args.target, settings, args.min_time, args.jobs)
+        if not results:
+            print(f'{kind}: no setting could be measured, skipped.')
+            continue
+        report[kind] = {'model': model_path, 'results': results}
+
+        for rank, result in enumerate(results[:5], 1):
+            print(f'  {rank}. {format_settings(result["settings"])}: {format_result(result)}')
+
+    print(f'{"model":<22} {"best setting":<52} {args.target:>10}')
+    for kind, result in report.items():
+        best = result['results'][0]
+        print(f'{kind:<22} {format_settings(best["settings"]):<52} {format_result(best)}')
+        if not args.dry_run:
+            write_model_config(args.config, kind, best['settings'])
+    if report and not args.dry_run:
+        print(f'Updated {args.config}.')
+
+    report_dir = os.path.dirname(args.report)
+    if report_dir:
+        os.makedirs(report_dir, exist_ok=True)
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump({'clips': clips, 'target': args.target, 'jobs': args.jobs,
+                   'cpus': available_cpus(), 'models': report}, f, indent=2)
+    print(f'Saved the report to {args.report}.')
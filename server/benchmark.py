@@ -0,0 +1,59 @@
+"""
+성능 측정 프로그램
+
+추론 경로의 주요 함수를 측정하고 저장된 기준값과 비교합니다.
+기준값보다 허용 오차 이상 느려진 항목이 있으면 종료 코드 1로 끝나므로 배포 전 검사에 사용할 수 있습니다.
+기준값은 측정한 장비에서만 의미가 있으므로 배포 장비에서 --update로 다시 만들어 저장합니다.
+
+사용 예:
+    python benchmark.py                        # 기준값과 비교
+    python benchmark.py --filter jpeg          # 이름에 'jpeg'가 포함된 항목만 측정
+    python benchmark.py --update               # 기준값 갱신
+"""
+import argparse
+import os
+import sys
+
+from utils.benchmark import compare, load_baseline, run, save_baseline
+
+
+BASELINE_PATH = 'benchmarks/baseline.json'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--baseline', type=str, default=BASELINE_PATH, help='Baseline JSON path')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown relative to the baseline median (0.25 = 25%%)')
+    parser.add_argument('--filter', type=str, default=None, help='Only run cases whose name contains this')
+    parser.add_argument('--min-time', type=float, default=0.5, help='Minimum measuring time per case (s)')
+    parser.add_argument('--update', action='store_true', help='Save the results as the new baseline')
+    args = parser.parse_args()
+
+    results = run(args.filter, args.min_time)
+    if results['stub_models']:
+        print(f'Using stand-in models for: {", ".join(results["stub_models"])}')
+
+    baseline = load_baseline(args.baseline) if os.path.exists(args.baseline) else None
+    if baseline is None:
+        rows = [(name, float('nan'), result['median_us'], float('nan'), 'new')
+                for name, result in results['cases'].items()]
+    else:
+        rows = compare(results, baseline, args.tolerance)
+
+    print(f'{"case":<42} {"baseline":>12} {"current":>12} {"ratio":>7}')
+    for name, expected, current, ratio, verdict in rows:
+        if verdict == 'new':
+            print(f'{name:<42} {"-":>12} {current:>10.1f}us {"-":>7} {verdict}')
+        else:
+            print(f'{name:<42} {expected:>10.1f}us {current:>10.1f}us {ratio:>7.2f} {verdict}')
+
+    if args.update:
+        save_baseline(args.baseline, results, baseline)
+        print(f'Saved the baseline to {args.baseline}.')
+        sys.exit(0)
+
+    regressions = [row[0] for row in rows if row[4] == 'REGRESSION']
+    if regressions:
+        print(f'{len(regressions)} regression(s): {", ".join(regressions)}')
+        sys.exit(1)
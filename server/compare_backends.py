@@ -0,0 +1,111 @@
+"""
+추론 백엔드 비교 프로그램
+
+세 모델을 같은 입력으로 백엔드(openvino, onnxruntime, dummy)별로 추론하여 지연 시간과
+OpenVINO 출력 대비 차이를 비교합니다. 결과를 보고 config.ini [backend]에서 모델마다 빠른 백엔드를 고릅니다.
+--streams를 지정하면 Inferencer를 그 수만큼 동시에 실행하여 카메라 수에 따른 파이프라인 처리량도 측정합니다.
+
+사용 예:
+    python compare_backends.py incidents/                               # 기록 영상으로 만든 입력
+    python compare_backends.py --backends openvino,onnxruntime          # 무작위 입력
+    python compare_backends.py --models none --streams 1,2,4,8 --pipeline-backend dummy
+"""
+import argparse
+import json
+import os
+import sys
+
+from utils.backend import BACKENDS, MODEL_KINDS, get_backend
+from utils.backend_benchmark import compare_backends, measure_pipeline, synthetic_inputs
+from utils.clips import MODEL_PATHS, build_inputs, find_clips, read_frames
+from utils.inference import (PERSON_DETECTION_MODEL_PATH, POSE_CLASSIFICATION_MODEL_PATH,
+                             POSE_ESTIMATION_MODEL_PATH)
+from utils.ov_config import model_config
+
+
+REPORT_PATH = 'benchmarks/backend_report.json'
+
+# 실제로 실행할 모델 경로 (config.ini [model] 정밀도 반영)
+SELECTED_MODEL_PATHS = {
+    'person_detection': PERSON_DETECTION_MODEL_PATH,
+    'pose_estimation': POSE_ESTIMATION_MODEL_PATH,
+    'pose_classification': POSE_CLASSIFICATION_MODEL_PATH,
+}
+
+
+def format_row(result: dict) -> str:
+    if 'error' in result:
+        return result['error']
+    row = f'{result["median_ms"]:>8.2f}ms {result["p90_ms"]:>8.2f}ms {result["fps"]:>8.1f}/s'
+    if 'accuracy' in result:
+        row += '  ' + ', '.join(f'{name} {value:.4f}' for name, value in result['accuracy'].items())
+    return row
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('clips', type=str, nargs='?', default=None,
+                        help='Recorded clip (.avi) or directory of clips (random inputs if omitted)')
+    parser.add_argument('--backends', type=str, default=','.join(BACKENDS),
+                        help='Comma-separated backends to compare')
+    parser.add_argument('--models', type=str, default=','.join(MODEL_KINDS),
+                        help='Comma-separated model kinds to compare (none: skip)')
+    parser.add_argument('--stride', type=int, default=10, help='Take every N-th frame of a clip')
+    parser.add_argument('--frames', type=int, default=100, help='Maximum frames')
+    parser.add_argument('--min-time', type=float, default=2.0, help='Minimum measuring time per backend (s)')
+    parser.add_argument('--streams', type=str, default='',
+                        help='Comma-separated Inferencer counts for the pipeline scaling test')
+    parser.add_argument('--pipeline-backend', choices=BACKENDS, default=None,
+                        help='Backend of every model in the pipeline test (default: config.ini [backend])')
+    parser.add_argument('--report', type=str, default=REPORT_PATH, help='Report JSON path')
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.backends.split(',')]
+    unknown = set(names) - set(BACKENDS)
+    if unknown:
+        sys.exit(f'Unknown backends: {", ".join(sorted(unknown))}')
+    kinds = [] if args.models == 'none' else [kind.strip() for kind in args.models.split(',')]
+    unknown = set(kinds) - set(MODEL_KINDS)
+    if unknown:
+        sys.exit(f'Unknown model kinds: {", ".join(sorted(unknown))}')
+
+    inputs = {}
+    if kinds and args.clips:
+        clips = find_clips(args.clips)
+        if not clips:
+            sys.exit(f'No clips found in {args.clips}')
+        inputs = build_inputs(read_frames(clips, args.stride, args.frames), MODEL_PATHS)
+
+    report = {'models': {}, 'pipeline': {}}
+    print(f'{"model":<22} {"backend":<12} {"median":>10} {"p90":>10} {"fps":>10}')
+    for kind in kinds:
+        model_inputs = inputs.get(kind)
+        if not model_inputs:
+            if args.clips:
+                print(f'{kind}: no inputs (no person detected in the clips), using random inputs.')
+            try:
+                session = get_backend('openvino').open(kind, SELECTED_MODEL_PATHS[kind])
+                model_inputs = synthetic_inputs(kind, session, args.frames)
+                session.close()
+            except RuntimeError:
+                model_inputs = synthetic_inputs(kind, count=args.frames)
+        result = compare_backends(kind, SELECTED_MODEL_PATHS[kind], model_inputs, names,
+                                  model_config(kind), args.min_time)
+        report['models'][kind] = result
+        for name, row in result.items():
+            print(f'{kind:<22} {name:<12} {format_row(row)}')
+
+    if args.streams:
+        backend_names = {kind: args.pipeline_backend for kind in MODEL_KINDS} if args.pipeline_backend else {}
+        print(f'{"streams":>7} {"total":>10} {"per stream":>12}')
+        for streams in (int(value) for value in args.streams.split(',')):
+            result = measure_pipeline(streams, backend_names, max(args.min_time, 1.0))
+            report['pipeline'][streams] = result
+            print(f'{streams:>7} {result["total_fps"]:>8.1f}/s {result["per_stream_fps"]:>10.1f}/s')
+
+    report_dir = os.path.dirname(args.report)
+    if report_dir:
+        os.makedirs(report_dir, exist_ok=True)
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump({'clips': args.clips, 'pipeline_backend': args.pipeline_backend, **report}, f, indent=2)
+    print(f'Saved the report to {args.report}.')
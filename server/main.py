@@ -3,19 +3,47 @@
 """
 import tkinter as tk
 import threading
+import time
 import traceback
 from queue import Queue
 
 import cv2
 
-from utils.communication import MessageSender, init_communication, remote_start
+from utils import metrics
+from utils.barbell import BarbellMonitor
+from utils.communication import CLIENT2_MODE, MessageSender, init_communication, remote_start
+from utils.decision import EVENT_RESET_WARNING, EVENT_SET_WARNING
+from utils.duty_cycle import DUTY_CYCLE_ENABLED, CaptureRateController
 from utils.inference import Inferencer, InferenceState
+from utils.load_shedding import (LEVEL_REDUCED_FPS, LoadShedController, SHED_ENABLED,
+                                 SHED_REDUCED_FPS)
+from utils.ov_config import OPENVINO_INFERENCE_CPUS, OPENVINO_IO_CPUS, pin_current_thread
+from utils.pipeline import PIPELINE_MODE
+from utils.record_log import InferenceLogWriter, RECORD_LOG_ENABLED
+from utils.recorder import (FrameRingBuffer, IncidentRecorder, RECORDER_ENABLED,
+                            RECORDER_MAX_BUFFER_BYTES, RECORDER_POST_SECONDS,
+                            RECORDER_PRE_SECONDS)
 from utils.thread import ImageReceiveThread, MessageReceiveThread
+from utils.trace import tracer
+from utils.worker import (InferenceSupervisor, WORKERS_ENABLED, WORKER_AFFINITY, WORKER_GROUPS,
+                          parse_affinity, parse_groups)
 
 
 # 프로세스 실행 여부
 running = True
 popup_state = False
+client1_recorder = None
+client1_record_log = None
+client1_rtt_monitor = None
+inference_supervisor = None
+client1_pipeline = None
+client1_capture_rate = None
+client2_image_receiver = None
+client2_barbell_monitor = None
+metrics_server = None
+last_emergency_time = None
+
+EMERGENCY_PRIORITY_SECONDS = 60  # 긴급 상황 이후 client1 스트림을 우선 처리할 시간(초)
 
 
 def _warning_popup_thread(message):
@@ -61,11 +89,98 @@ def show_warning_popup(message):
     popup_thread.start()
 
 
+def record_incident(reason: str):
+    """
+    사고 영상 저장 요청
+    """
+    if client1_recorder is not None:
+        client1_recorder.trigger(reason)
+
+
 def set_warning_handler():
     client1_message_sender.send('buzzer on')
+    metrics.alarms_sent.labels('client1', 'warning').inc()
+    record_incident('warning')
     show_warning_popup("Warning on Bench Press Zone!")
 
 
+def emergency_handler():
+    global last_emergency_time
+
+    last_emergency_time = time.monotonic()
+    metrics.alarms_sent.labels('client2', 'emergency').inc()
+    record_incident('emergency')
+    show_warning_popup("Warning on Bench Press Zone!")
+
+
+def barbell_handler():
+    """
+    서버에서 client2 프레임의 위험 구역에 바벨이 검출된 경우 (client2 stream 모드)
+    """
+    client2_message_sender.send('buzzer on')
+    emergency_handler()
+
+
+def worker_event_handler(camera: str, frame_id: int, event: int):
+    """
+    추론 워커 프로세스에서 전달된 경고 전환 이벤트 처리
+    """
+    if camera != 'client1':
+        return
+    if event == EVENT_SET_WARNING:
+        set_warning_handler()
+    elif event == EVENT_RESET_WARNING:
+        client1_message_sender.send('buzzer off')
+
+
+def is_client1_priority(state: InferenceState) -> bool:
+    """
+    client1 스트림이 경고/긴급 상황과 관련되어 부하 조절을 늦게 적용해야 하는지 여부
+    """
+    return (state.warning_active or state.pull_start_time is not None
+            or (last_emergency_time is not None
+                and time.monotonic() - last_emergency_time < EMERGENCY_PRIORITY_SECONDS))
+
+
+def shed_level_handler(stream: str, old_level: int, new_level: int):
+    """
+    부하 조절 단계 변경 시 추론 설정 및 클라이언트 전송 FPS 변경
+    """
+    if stream != 'client1':
+        return
+    inferencer.shed_level = new_level
+    if new_level >= LEVEL_REDUCED_FPS > old_level:
+        if client1_capture_rate is not None:
+            client1_capture_rate.set_limit(SHED_REDUCED_FPS)
+        else:
+            client1_message_sender.send(f'fps {SHED_REDUCED_FPS}')
+    elif old_level >= LEVEL_REDUCED_FPS > new_level:
+        if client1_capture_rate is not None:
+            client1_capture_rate.set_limit(0)
+        else:
+            client1_message_sender.send('fps 0')
+
+
+def client1_inference_done(context: dict):
+    """
+    pipelined 실행에서 client1 프레임 추론 완료 시 수신부터 완료까지의 지연 시간으로 부하 조절, 촬영 FPS 조절
+    """
+    if client1_capture_rate is not None:
+        client1_capture_rate.update(state)
+    if load_shedder is not None and 'enqueue_ns' in context:
+        load_shedder.observe('client1', (time.perf_counter_ns() - context['enqueue_ns']) / 1e9)
+
+
+def occupancy_handler(occupied: bool):
+    """
+    client1의 엣지 필터가 보낸 사람 유무 ('occupancy 0'은 사람이 없는 동안 주기적으로 수신)
+    사람이 없으면 이미지를 받지 않으므로 추론 쓰레드가 사람이 감지되지 않은 프레임으로 처리하도록 큐에 추가
+    """
+    client1_occupied.set(int(occupied))
+    if not occupied:
+        client1_image_receiver.put_vacant()
+
+
 def exit_process():
     """
     프로세스 종료
@@ -75,8 +190,30 @@ def exit_process():
     cv2.destroyAllWindows()
     client2_message_receiver.stop()
     client1_image_receiver.stop()
+    if client2_image_receiver is not None:
+        client2_image_receiver.stop()
+    if client2_barbell_monitor is not None:
+        client2_barbell_monitor.stop()
+    if client1_rtt_monitor is not None:
+        client1_rtt_monitor.stop()
+    if metrics_server is not None:
+        metrics_server.stop()
+    if inference_supervisor is not None:
+        inference_supervisor.stop()
+    if client1_pipeline is not None:
+        client1_pipeline.stop()
+    if client1_recorder is not None:
+        client1_recorder.stop()
+    if client1_record_log is not None:
+        client1_record_log.stop()
+        client1_record_log.join()
+    if tracer.enabled:
+        count = tracer.export_chrome()
+        print(f'Saved {count} trace spans.')
     client1_message_sender.send('buzzer off')
     client1_message_sender.send('exit')
+    if CLIENT2_MODE == 'stream':
+        client2_message_sender.send('exit')
     running = False
 
 
@@ -90,31 +227,134 @@ if __name__ == '__main__':
     # 쓰레드 객체
     client1_image_receiver: ImageReceiveThread = thread_dict['Client1 Image'][0]
     client1_receive_queue: Queue = thread_dict['Client1 Image'][1]
-    client1_message_sender: MessageSender = thread_dict['Client1 Message']
-    client2_message_receiver: MessageReceiveThread = thread_dict['Client2 Message']
+    client1_message_sender: MessageSender = thread_dict['Client1 Message'][0]
+    client1_message_receiver: MessageReceiveThread = thread_dict['Client1 Message'][1]
+    client2_message_sender: MessageSender = thread_dict['Client2 Message'][0]
+    client2_message_receiver: MessageReceiveThread = thread_dict['Client2 Message'][1]
+    if CLIENT2_MODE == 'stream':
+        client2_image_receiver = thread_dict['Client2 Image'][0]
+        client2_receive_queue: Queue = thread_dict['Client2 Image'][1]
+
+    # 사고 영상 기록 설정
+    if RECORDER_ENABLED:
+        client1_frame_buffer = FrameRingBuffer(
+            RECORDER_PRE_SECONDS + RECORDER_POST_SECONDS, RECORDER_MAX_BUFFER_BYTES)
+        client1_image_receiver.frame_buffer = client1_frame_buffer
+        client1_recorder = IncidentRecorder(client1_frame_buffer, 'client1')
+        client1_recorder.daemon = True
+        client1_recorder.start()
+
+    # 지표 제공 및 클라이언트 왕복 시간 측정
+    if metrics.METRICS_ENABLED:
+        metrics_server = metrics.MetricsServer(metrics.registry)
+        metrics_server.start()
+        client1_rtt_monitor = metrics.RttMonitor(client1_message_sender.send,
+                                                 metrics.client_rtt.labels('client1'))
+        client1_message_receiver.add_callback('pong', client1_rtt_monitor.on_pong)
+        client1_rtt_monitor.start()
+        print(f'Serving metrics on {metrics.METRICS_HOST}:{metrics.METRICS_PORT}.')
+
+    # client1 엣지 모드의 사람 유무 알림
+    client1_occupied = metrics.client_occupied.labels('client1')
+    client1_message_receiver.add_callback('occupancy 0', lambda: occupancy_handler(False))
+    client1_message_receiver.add_callback('occupancy 1', lambda: occupancy_handler(True))
 
-    # 쓰레드 시작
+    # 쓰레드 시작 (수신/디코딩 쓰레드는 추론과 다른 CPU에서 실행)
+    client1_image_receiver.cpus = OPENVINO_IO_CPUS
     client1_image_receiver.start()
+    client1_message_receiver.daemon = True
+    client1_message_receiver.start()
     client2_message_receiver.start()
+    if client2_image_receiver is not None:
+        client2_image_receiver.cpus = OPENVINO_IO_CPUS
+        client2_image_receiver.daemon = True
+        client2_image_receiver.start()
 
     # 추론 객체 생성
     pose_class = ['pull', 'push', 'unknown']
-    inferencer = Inferencer()
-    state = InferenceState()
+    load_shedder = None
+    if WORKERS_ENABLED:
+        # 카메라별 워커 프로세스에서 추론 (추론 기록도 워커에서 저장)
+        inference_supervisor = InferenceSupervisor(
+            parse_groups(WORKER_GROUPS), parse_affinity(WORKER_AFFINITY),
+            metrics_port=metrics.METRICS_PORT + 1 if metrics.METRICS_ENABLED else None)
+        inference_supervisor.on_event = worker_event_handler
+        inference_supervisor.start()
+    else:
+        # 추론 쓰레드(OpenVINO)는 모델을 컴파일하고 추론하는 메인 쓰레드의 CPU 설정을 따름
+        pin_current_thread(OPENVINO_INFERENCE_CPUS)
+        inferencer = Inferencer()
+        state = InferenceState()
+
+        # 프레임별 추론 기록 설정
+        if RECORD_LOG_ENABLED:
+            client1_record_log = InferenceLogWriter(name='client1')
+            client1_record_log.daemon = True
+            client1_record_log.start()
+            inferencer.record_log = client1_record_log
+
+        inferencer.on_set_warning = lambda: set_warning_handler()
+        inferencer.on_reset_warning = lambda: client1_message_sender.send('buzzer off')
+
+        # 지연 시간에 따른 부하 조절 (워커 프로세스 모드에서는 사용하지 않음)
+        if SHED_ENABLED:
+            load_shedder = LoadShedController()
+            load_shedder.add_stream('client1', lambda: is_client1_priority(state))
+            load_shedder.on_level_change = shed_level_handler
+
+        # 상태에 따라 client1 촬영 FPS 조절 (사람이 없으면 낮추고, 사람이 나타나면 바로 올림)
+        if DUTY_CYCLE_ENABLED:
+            client1_capture_rate = CaptureRateController(client1_message_sender.send,
+                                                         inferencer.engine.detection_frame_threshold)
+
+        # 단계별 쓰레드로 여러 프레임을 겹쳐서 추론
+        if PIPELINE_MODE == 'pipelined':
+            inferencer.start(client1_inference_done)
+            client1_pipeline = inferencer.pipeline
 
-    inferencer.on_set_warning = lambda: set_warning_handler()
-    inferencer.on_reset_warning = lambda: client1_message_sender.send('buzzer off')
+    # client2 프레임의 바벨 검출 (stream 모드, 추론 CPU에서 실행)
+    if client2_image_receiver is not None:
+        pin_current_thread(OPENVINO_INFERENCE_CPUS)
+        client2_barbell_monitor = BarbellMonitor(client2_receive_queue)
+        client2_barbell_monitor.on_detect = barbell_handler
+        client2_barbell_monitor.daemon = True
+        client2_barbell_monitor.start()
+    client1_queue_age = metrics.queue_age.labels('client1')
     client2_message_receiver.add_callback(
         "Warning on Bench Press Zone!", 
-        lambda: show_warning_popup("Warning on Bench Press Zone!"))
+        lambda: emergency_handler())
 
     # 무한 루프
     try:
         # Client1 이미지 추론
         while running:
             if not client1_receive_queue.empty():
-                frame = client1_receive_queue.get()
-                inferencer.inference(frame, state)
+                frame_id, enqueue_ns, frame = client1_receive_queue.get()
+                tracer.set_frame(frame_id)
+                dequeue_ns = time.perf_counter_ns()
+                tracer.record('queue wait', enqueue_ns, dequeue_ns)
+                client1_queue_age.observe((dequeue_ns - enqueue_ns) / 1e9)
+                # 엣지 필터의 사람 없음 알림 (이미지 없음)
+                if frame is None:
+                    if inference_supervisor is not None:
+                        inference_supervisor.submit_vacant('client1', frame_id)
+                    elif client1_pipeline is not None:
+                        inferencer.submit(None, state, frame_id=frame_id)
+                    else:
+                        inferencer.inference_vacant(state)
+                        if client1_capture_rate is not None:
+                            client1_capture_rate.update(state)
+                    continue
+                if inference_supervisor is not None:
+                    inference_supervisor.submit('client1', frame_id, frame)
+                elif client1_pipeline is not None:
+                    inferencer.submit(frame, state, frame_id=frame_id, enqueue_ns=enqueue_ns)
+                else:
+                    inferencer.inference(frame, state)
+                    if client1_capture_rate is not None:
+                        client1_capture_rate.update(state)
+                    if load_shedder is not None:
+                        load_shedder.observe('client1', (time.perf_counter_ns() - enqueue_ns) / 1e9)
                 cv2.imshow('frame', frame)
                 cv2.waitKey(1)
             if not client1_image_receiver.is_alive():
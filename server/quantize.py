@@ -0,0 +1,93 @@
+"""
+INT8 양자화 프로그램
+
+기록된 사고 영상으로 세 모델을 NNCF로 INT8 양자화하여 원본 옆에 '<모델 이름>-int8.xml'로 저장하고,
+보정에 사용하지 않은 영상으로 원본 대비 지연 시간, 처리량, 출력 차이를 측정하여 보고서로 저장합니다.
+결과를 확인한 후 config.ini [model]의 *_precision을 int8로 바꾸면 해당 모델만 INT8로 실행합니다.
+같은 영상, 같은 옵션으로 실행하면 같은 보정 입력을 사용합니다.
+
+사용 예:
+    python quantize.py incidents/                                   # 세 모델 모두 양자화 후 비교
+    python quantize.py incidents/ --models pose_classification --preset performance
+    python quantize.py incidents/ --skip-quantize                   # 이미 만든 INT8 모델만 다시 비교
+"""
+import argparse
+import json
+import os
+import sys
+
+from utils.clips import MODEL_KINDS, MODEL_PATHS, build_inputs, find_clips, read_frames, split_clips
+from utils.model import precision_model_path
+from utils.quantization import benchmark, quantize
+
+
+REPORT_PATH = 'benchmarks/quantization_report.json'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('clips', type=str, help='Recorded clip (.avi) or directory of clips')
+    parser.add_argument('--models', type=str, default=','.join(MODEL_KINDS),
+                        help='Comma-separated model kinds to quantize')
+    parser.add_argument('--holdout', type=float, default=0.2, help='Fraction of clips held out for evaluation')
+    parser.add_argument('--stride', type=int, default=10, help='Take every N-th frame of a clip')
+    parser.add_argument('--calibration-frames', type=int, default=300, help='Maximum calibration frames')
+    parser.add_argument('--evaluation-frames', type=int, default=200, help='Maximum evaluation frames')
+    parser.add_argument('--preset', choices=('mixed', 'performance'), default='mixed')
+    parser.add_argument('--accurate-bias-correction', action='store_true',
+                        help='Use the slower, more accurate bias correction')
+    parser.add_argument('--min-time', type=float, default=2.0, help='Minimum measuring time per model (s)')
+    parser.add_argument('--skip-quantize', action='store_true', help='Only benchmark existing INT8 models')
+    parser.add_argument('--report', type=str, default=REPORT_PATH, help='Report JSON path')
+    args = parser.parse_args()
+
+    kinds = [kind.strip() for kind in args.models.split(',')]
+    unknown = set(kinds) - set(MODEL_KINDS)
+    if unknown:
+        sys.exit(f'Unknown model kinds: {", ".join(sorted(unknown))}')
+
+    clips = find_clips(args.clips)
+    if not clips:
+        sys.exit(f'No clips found in {args.clips}')
+    calibration_clips, evaluation_clips = split_clips(clips, args.holdout)
+    print(f'{len(calibration_clips)} calibration clip(s), {len(evaluation_clips)} evaluation clip(s).')
+
+    # 원본 모델로 파이프라인을 실행하여 모델별 입력 생성
+    calibration = build_inputs(read_frames(calibration_clips, args.stride, args.calibration_frames), MODEL_PATHS)
+    evaluation = build_inputs(read_frames(evaluation_clips, args.stride, args.evaluation_frames), MODEL_PATHS)
+
+    report = {}
+    for kind in kinds:
+        if not calibration[kind] or not evaluation[kind]:
+            print(f'{kind}: no inputs (no person detected in the clips), skipped.')
+            continue
+        int8_path = precision_model_path(MODEL_PATHS[kind], 'int8')
+        if not args.skip_quantize:
+            print(f'{kind}: quantizing with {len(calibration[kind])} calibration inputs...')
+            quantize(MODEL_PATHS[kind], calibration[kind], int8_path, args.preset,
+                     fast_bias_correction=not args.accurate_bias_correction)
+            print(f'{kind}: saved {int8_path}')
+        elif not os.path.exists(int8_path):
+            print(f'{kind}: {int8_path} not found, skipped.')
+            continue
+        report[kind] = benchmark(kind, MODEL_PATHS[kind], evaluation[kind], args.min_time)
+
+    print(f'{"model":<22} {"precision":<9} {"median":>10} {"p90":>10} {"throughput":>12}')
+    for kind, result in report.items():
+        for precision in ('float', 'int8'):
+            row = result[precision]
+            print(f'{kind:<22} {precision:<9} {row["median_ms"]:>8.2f}ms {row["p90_ms"]:>8.2f}ms '
+                  f'{row["throughput_fps"]:>8.1f}/s')
+        speedup = result['float']['median_ms'] / result['int8']['median_ms']
+        accuracy = ', '.join(f'{name} {value:.4f}' for name, value in result['accuracy'].items())
+        print(f'{"":<22} speedup {speedup:.2f}x, {accuracy}')
+
+    report_dir = os.path.dirname(args.report)
+    if report_dir:
+        os.makedirs(report_dir, exist_ok=True)
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump({'clips': {'calibration': calibration_clips, 'evaluation': evaluation_clips},
+                   'options': {'preset': args.preset, 'stride': args.stride,
+                               'accurate_bias_correction': args.accurate_bias_correction},
+                   'models': report}, f, indent=2)
+    print(f'Saved the report to {args.report}.')
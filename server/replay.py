@@ -0,0 +1,61 @@
+"""
+추론 기록 재현 프로그램
+
+기록된 분류 결과로 경고 판단 상태 머신을 실시간보다 빠르게 재현합니다.
+판단 설정을 바꿔 가며 경고 발생/해제 시점을 확인할 때 사용합니다.
+
+사용 예:
+    python replay.py records/ --pull-state-duration 8 --verify
+"""
+import argparse
+import datetime
+import time
+
+from utils.decision import (DecisionEngine, EVENT_NONE, EVENT_RESET_WARNING,
+                            EVENT_SET_WARNING, DETECTION_FRAME_THRESHOLD, HISTORY_LENGTH,
+                            POSE_THRESHOLD, PULL_STATE_DURATION, replay)
+from utils.record_log import InferenceLogReader
+
+
+EVENT_NAMES = {EVENT_SET_WARNING: 'set warning', EVENT_RESET_WARNING: 'reset warning'}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('path', type=str, help='Record segment file or directory')
+    parser.add_argument('--pose-threshold', type=float, default=POSE_THRESHOLD)
+    parser.add_argument('--history-length', type=int, default=HISTORY_LENGTH)
+    parser.add_argument('--detection-frame-threshold', type=int, default=DETECTION_FRAME_THRESHOLD)
+    parser.add_argument('--pull-state-duration', type=float, default=PULL_STATE_DURATION)
+    parser.add_argument('--verify', action='store_true',
+                        help='Compare replayed events with the recorded events')
+    args = parser.parse_args()
+
+    records = InferenceLogReader(args.path).read()
+    engine = DecisionEngine(pose_threshold=args.pose_threshold,
+                            history_length=args.history_length,
+                            detection_frame_threshold=args.detection_frame_threshold,
+                            pull_state_duration=args.pull_state_duration)
+
+    start_time = time.perf_counter()
+    events = replay(records, engine)
+    elapsed_time = time.perf_counter() - start_time
+    print(f'Replayed {len(records)} frames in {elapsed_time:.2f}s.')
+
+    for frame_index, timestamp, event in events:
+        stamp = datetime.datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+        print(f'{stamp} frame {frame_index}: {EVENT_NAMES[event]}')
+
+    if args.verify:
+        recorded = records[records['event'] != EVENT_NONE]
+        recorded_events = list(zip(recorded['frame_index'].tolist(),
+                                   recorded['timestamp'].tolist(),
+                                   recorded['event'].tolist()))
+        if recorded_events == events:
+            print(f'OK: {len(events)} events match the recorded events.')
+        else:
+            print(f'MISMATCH: replayed {len(events)} events, recorded {len(recorded_events)} events.')
+            for replayed, expected in zip(events, recorded_events):
+                if replayed != expected:
+                    print(f'  first difference: replayed {replayed}, recorded {expected}')
+                    break
@@ -0,0 +1,88 @@
+"""
+판단 설정 탐색 프로그램
+
+기록된 분류 결과와 라벨링된 사고 구간으로 config.ini [inference] 설정 조합을 한꺼번에 평가하고,
+조합별 오경보율과 경보까지 걸린 시간, 파레토 최적 조합을 출력합니다.
+
+값 목록은 '0.6,0.7,0.8' 처럼 쉼표로 나열하거나 '0.5:0.95:0.05' (시작:끝:간격, 끝 포함) 형식으로 지정합니다.
+
+사용 예:
+    python sweep.py records/ incidents.csv --pose-threshold 0.5:0.95:0.05 \
+        --history-length 3,5,7,10,15 --pull-state-duration 3:15:1 --workers 8
+"""
+import argparse
+import csv
+import time
+
+import numpy as np
+
+from utils.decision import (DETECTION_FRAME_THRESHOLD, HISTORY_LENGTH, POSE_THRESHOLD,
+                            PULL_STATE_DURATION)
+from utils.record_log import InferenceLogReader
+from utils.sweep import (PARAMETER_NAMES, evaluate, load_incidents, make_grid,
+                         pareto_front, simulate_parallel)
+
+
+def parse_values(text: str, value_type: type) -> list:
+    """
+    '1,2,3' 또는 '시작:끝:간격' 형식의 값 목록 파싱
+    """
+    if ':' in text:
+        start, stop, step = (float(value) for value in text.split(':'))
+        values = np.arange(start, stop + step / 2, step)
+        return [value_type(round(value, 6)) for value in values]
+    return [value_type(value) for value in text.split(',')]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('records', type=str, help='Record segment file or directory')
+    parser.add_argument('incidents', type=str, help='CSV file of labeled incident intervals (start,end)')
+    parser.add_argument('--pose-threshold', type=str, default=str(POSE_THRESHOLD))
+    parser.add_argument('--history-length', type=str, default=str(HISTORY_LENGTH))
+    parser.add_argument('--detection-frame-threshold', type=str, default=str(DETECTION_FRAME_THRESHOLD))
+    parser.add_argument('--pull-state-duration', type=str, default=str(PULL_STATE_DURATION))
+    parser.add_argument('--tolerance', type=float, default=5.0,
+                        help='Seconds after an incident in which an alarm still counts as correct')
+    parser.add_argument('--workers', type=int, default=1, help='Number of worker processes')
+    parser.add_argument('--output', '-o', type=str, default='sweep.csv', help='Report CSV path')
+    args = parser.parse_args()
+
+    records = InferenceLogReader(args.records).read()
+    incidents = load_incidents(args.incidents)
+    grid = make_grid(pose_threshold=parse_values(args.pose_threshold, float),
+                     history_length=parse_values(args.history_length, int),
+                     detection_frame_threshold=parse_values(args.detection_frame_threshold, int),
+                     pull_state_duration=parse_values(args.pull_state_duration, float))
+    num_combinations = len(grid['pose_threshold'])
+    print(f'Evaluating {num_combinations} combinations over {len(records)} frames '
+          f'and {len(incidents)} incidents...')
+
+    start_time = time.perf_counter()
+    alarms = simulate_parallel(records, grid, workers=args.workers)
+    duration = float(records['timestamp'][-1] - records['timestamp'][0]) if len(records) else 0.0
+    metrics = evaluate(alarms, incidents, duration, tolerance=args.tolerance)
+    front = pareto_front(metrics['false_alarm_rate'], metrics['miss_rate'],
+                         metrics['mean_time_to_alarm'])
+    print(f'Done in {time.perf_counter() - start_time:.1f}s.')
+
+    # 전체 결과 저장
+    is_pareto = np.zeros(num_combinations, dtype=bool)
+    is_pareto[front] = True
+    columns = list(PARAMETER_NAMES) + list(metrics.keys())
+    with open(args.output, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns + ['pareto'])
+        for i in range(num_combinations):
+            row = [grid[name][i] for name in PARAMETER_NAMES] + [metrics[name][i] for name in metrics]
+            writer.writerow(row + [int(is_pareto[i])])
+    print(f'Saved the report: {args.output}')
+
+    # 파레토 최적 조합 출력 (오경보율 순)
+    print('\nPareto front (false alarms/h, miss rate, mean time to alarm):')
+    print('  threshold  history  detect_frames  pull_sec |  FA/h   miss   mean_tta  max_tta')
+    for i in front[np.argsort(metrics['false_alarm_rate'][front], kind='stable')]:
+        print(f"  {grid['pose_threshold'][i]:9.2f}  {grid['history_length'][i]:7d}  "
+              f"{grid['detection_frame_threshold'][i]:13d}  {grid['pull_state_duration'][i]:8.1f} | "
+              f"{metrics['false_alarm_rate'][i]:5.2f}  {metrics['miss_rate'][i]:5.2f}  "
+              f"{metrics['mean_time_to_alarm'][i]:8.2f}  {metrics['max_time_to_alarm'][i]:7.2f}")
@@ -0,0 +1,140 @@
+"""
+OpenVINO 실행 설정 탐색 모듈
+
+성능 힌트, 추론 스트림 수, 쓰레드 수, CPU 고정 여부 조합마다 모델을 컴파일하여
+실제 장비에서 기록 영상으로 만든 입력(utils.clips)으로 측정하고, 목표에 맞는 조합을 고릅니다.
+    latency: 요청 하나로 순서대로 추론할 때의 프레임당 지연 시간 중앙값이 가장 작은 조합
+    fps: 여러 요청(카메라)을 동시에 실행할 때의 초당 추론 수가 가장 큰 조합
+"""
+import itertools
+import os
+import statistics
+import time
+
+import numpy as np
+import openvino as ov
+
+from utils.backend import get_core
+from utils.ov_config import compile_config
+
+
+TARGETS = ('latency', 'fps')
+
+
+def candidate_settings(cpu_count: int) -> list[dict]:
+    """
+    측정할 실행 설정 조합
+
+    Args:
+        cpu_count (int): 추론에 사용할 수 있는 CPU 수
+
+    Returns:
+        list[dict]: hint, streams, threads, pinning 조합
+    """
+    hints = ('latency', 'throughput')
+    streams = sorted({0} | {count for count in (1, 2, 4, 8) if count <= cpu_count})
+    threads = sorted({0, max(1, cpu_count // 2), cpu_count})
+    pinning = ('true', 'false')
+    return [{'hint': hint, 'streams': stream_count, 'threads': thread_count, 'pinning': pin}
+            for hint, stream_count, thread_count, pin in itertools.product(hints, streams, threads, pinning)]
+
+
+def measure_latency(model_path: str, inputs: list[np.ndarray], config: dict,
+                    min_time: float = 2.0) -> dict[str, float]:
+    """
+    요청 하나로 순서대로 추론할 때의 프레임당 지연 시간 (카메라 하나의 추론 방식)
+
+    Args:
+        model_path (str): 모델 경로
+        inputs (list[np.ndarray]): 입력 텐서
+        config (dict): compile_model 설정
+        min_time (float): 최소 측정 시간(초)
+
+    Returns:
+        dict[str, float]: median_ms, p90_ms
+    """
+    compiled = get_core().compile_model(model_path, 'CPU', config)
+    request = compiled.create_infer_request()
+    request.infer({0: inputs[0]})   # 준비 실행
+    samples = []
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_time or len(samples) < 10:
+        input_tensor = inputs[len(samples) % len(inputs)]
+        begin = time.perf_counter()
+        request.infer({0: input_tensor})
+        samples.append((time.perf_counter() - begin) * 1000)
+    samples.sort()
+    return {'median_ms': statistics.median(samples), 'p90_ms': samples[int(0.9 * (len(samples) - 1))]}
+
+
+def measure_throughput(model_path: str, inputs: list[np.ndarray], config: dict,
+                       min_time: float = 2.0, jobs: int = 0) -> float:
+    """
+    여러 요청을 동시에 실행할 때의 초당 추론 수 (여러 카메라의 전체 처리량)
+
+    Args:
+        model_path (str): 모델 경로
+        inputs (list[np.ndarray]): 입력 텐서
+        config (dict): compile_model 설정
+        min_time (float): 최소 측정 시간(초)
+        jobs (int): 동시에 실행할 요청 수 (0이면 모델이 권장하는 수)
+
+    Returns:
+        float: 초당 추론 수
+    """
+    compiled = get_core().compile_model(model_path, 'CPU', config)
+    queue = ov.AsyncInferQueue(compiled, jobs)
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_time:
+        queue.start_async({0: inputs[count % len(inputs)]})
+        count += 1
+    queue.wait_all()
+    return count / (time.perf_counter() - start)
+
+
+def tune(model_path: str, inputs: list[np.ndarray], target: str, settings: list[dict],
+         min_time: float = 1.0, jobs: int = 0) -> list[dict]:
+    """
+    실행 설정 조합을 모두 측정하여 목표 기준으로 좋은 순서로 정렬
+
+    Args:
+        model_path (str): 모델 경로
+        inputs (list[np.ndarray]): 입력 텐서
+        target (str): 'latency' 또는 'fps'
+        settings (list[dict]): 측정할 조합 (candidate_settings)
+        min_time (float): 조합별 최소 측정 시간(초)
+        jobs (int): fps 목표에서 동시에 실행할 요청 수 (카메라 수, 0이면 모델이 권장하는 수)
+
+    Returns:
+        list[dict]: 조합별 {'settings', 'median_ms', 'p90_ms'} 또는 {'settings', 'fps'} (좋은 순서)
+    """
+    if target not in TARGETS:
+        raise ValueError(f'Unknown target: {target} (expected one of {TARGETS})')
+    results = []
+    for values in settings:
+        config = compile_config(**values)
+        try:
+            if target == 'latency':
+                result = measure_latency(model_path, inputs, config, min_time)
+            else:
+                result = {'fps': measure_throughput(model_path, inputs, config, min_time, jobs)}
+        except RuntimeError as e:
+            # 장치가 지원하지 않는 조합은 건너뜀
+            print(f'  {values}: {str(e).splitlines()[0]}')
+            continue
+        results.append({'settings': values, **result})
+    if target == 'latency':
+        results.sort(key=lambda result: (result['median_ms'], result['p90_ms']))
+    else:
+        results.sort(key=lambda result: -result['fps'])
+    return results
+
+
+def available_cpus() -> int:
+    """
+    현재 쓰레드가 사용할 수 있는 CPU 수
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
@@ -0,0 +1,414 @@
+"""
+추론 백엔드 모듈
+
+PersonDetector, PoseEstimator, PoseClassifier는 백엔드가 만든 InferenceSession으로만 추론하므로
+config.ini [backend]에서 모델마다 실행 런타임을 고를 수 있습니다.
+    openvino: OpenVINO IR (.xml), 같은 모델은 프로세스에서 한 번만 컴파일 (ov.Core는 처음 사용할 때 생성)
+    onnxruntime: 같은 이름의 ONNX 모델 (.onnx), onnxruntime이 설치되어 있어야 함
+    dummy: 모델 파일 없이 정해진 시간만큼 기다린 뒤 시드로 정해지는 결과를 반환 (파이프라인 부하 시험용)
+"""
+import configparser
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+import openvino as ov
+
+
+# 설정 가져오기
+__config = configparser.ConfigParser()
+__config.read('config.ini')
+
+MODEL_KINDS = ('person_detection', 'pose_estimation', 'pose_classification')
+BACKENDS = ('openvino', 'onnxruntime', 'dummy')
+
+MODEL_BACKENDS = {kind: __config['backend'][kind] for kind in MODEL_KINDS}
+DUMMY_LATENCIES = {kind: float(__config['backend'][f'dummy_{kind}_ms']) / 1000 for kind in MODEL_KINDS}
+DUMMY_SEED = int(__config['backend']['dummy_seed'])
+
+# dummy 백엔드의 입력 형태, 입력 자료형, 출력 형태 (실제 모델과 동일)
+DUMMY_MODELS = {
+    'person_detection': ((1, 3, 512, 512), np.float32, (1, 1, 200, 7)),
+    'pose_estimation': ((1, 256, 256, 3), np.uint8, (1, 1, 17, 3)),
+    'pose_classification': ((1, 3, 224, 224), np.float32, (1, 2)),
+}
+
+# dummy 백엔드가 반환하는 선 자세의 키 포인트 (y, x) - 코, 눈, 귀, 어깨, 팔꿈치, 손목, 골반, 무릎, 발목 순서
+DUMMY_POSE = np.array([
+    (0.12, 0.50), (0.10, 0.47), (0.10, 0.53), (0.11, 0.44), (0.11, 0.56),
+    (0.25, 0.38), (0.25, 0.62), (0.40, 0.34), (0.40, 0.66), (0.52, 0.33), (0.52, 0.67),
+    (0.55, 0.43), (0.55, 0.57), (0.73, 0.43), (0.73, 0.57), (0.92, 0.43), (0.92, 0.57),
+], dtype=np.float32)
+
+
+_core = None
+_core_lock = threading.Lock()
+
+
+def get_core() -> ov.Core:
+    """
+    프로세스에서 공유하는 OpenVINO Core (처음 호출할 때 생성)
+    """
+    global _core
+    with _core_lock:
+        if _core is None:
+            _core = ov.Core()
+    return _core
+
+
+class InferenceSession:
+    """
+    모델 하나를 추론하는 세션의 기본 클래스 (백엔드별로 구현)
+    출력은 복사본을 반환하므로 다음 추론 이후에도 보관할 수 있습니다.
+
+    Attributes:
+        input_shape (tuple): 입력 형태 (배치 크기를 바꿀 수 있는 세션은 배치 크기 1 기준)
+        input_dtype (np.dtype): 입력 자료형
+    """
+    input_shape = ()
+    input_dtype = np.float32
+
+    def infer(self, input_data: np.ndarray) -> np.ndarray:
+        """
+        입력으로 추론하고 첫 번째 출력의 복사본 반환
+        """
+        raise NotImplementedError
+
+    def infer_async(self, input_data: np.ndarray) -> Future:
+        """
+        비동기로 추론하고 첫 번째 출력의 복사본을 결과로 하는 Future 반환 (기본 구현은 바로 추론)
+        """
+        future = Future()
+        try:
+            future.set_result(self.infer(input_data))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def close(self):
+        """
+        세션이 사용한 자원 반환 (이후 이 세션은 사용할 수 없음)
+        """
+
+
+class InferRequestPool:
+    """
+    컴파일된 모델 하나의 InferRequest 모음
+    스트림은 요청 객체를 빌려 입력/출력 텐서를 계속 재사용하고, 다 쓰면 반환합니다.
+
+    Args:
+        compiled_model (ov.CompiledModel): 컴파일된 모델
+    """
+    def __init__(self, compiled_model: ov.CompiledModel):
+        self.compiled_model = compiled_model
+        self.created = 0            # 생성한 요청 객체 수
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> ov.InferRequest:
+        """
+        쉬고 있는 요청 객체를 빌림 (없으면 새로 생성)
+        """
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+            self.created += 1
+        return self.compiled_model.create_infer_request()
+
+    def release(self, request: ov.InferRequest):
+        """
+        빌린 요청 객체 반환
+        """
+        with self._lock:
+            self._idle.append(request)
+
+    @contextmanager
+    def lease(self):
+        """
+        with 문 안에서만 요청 객체를 빌림
+        """
+        request = self.acquire()
+        try:
+            yield request
+        finally:
+            self.release(request)
+
+
+class ModelRegistry:
+    """
+    IR 파일을 (경로, 장치, 설정, 배치 크기)마다 프로세스에서 한 번만 컴파일하여 공유하는 클래스
+    카메라(Inferencer)를 추가해도 모델을 다시 컴파일하지 않고 요청 객체만 빌립니다.
+
+    Args:
+        core (ov.Core, optional): OpenVINO Core (기본값: 처음 컴파일할 때 get_core())
+    """
+    def __init__(self, core: ov.Core = None):
+        self._core = core
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_path: str, device: str = 'CPU', config: dict = None,
+            max_batch_size: int = None) -> InferRequestPool:
+        """
+        컴파일된 모델의 요청 객체 모음 반환 (처음 요청 시 컴파일)
+
+        Args:
+            model_path (str): 모델 경로
+            device (str): 추론에 사용할 장치
+            config (dict, optional): compile_model 설정
+            max_batch_size (int, optional): 배치 크기를 1 ~ max_batch_size로 바꿔서 컴파일
+
+        Returns:
+            InferRequestPool: 요청 객체 모음 (compiled_model 속성으로 모델 접근)
+        """
+        config = config or {}
+        key = (os.path.abspath(model_path), device, tuple(sorted(config.items())), max_batch_size)
+        with self._lock:
+            pool = self._entries.get(key)
+            if pool is None:
+                core = self._core or get_core()
+                model = core.read_model(model_path)
+                if max_batch_size is not None:
+                    model.reshape({model.input(0): ov.PartialShape(
+                        [ov.Dimension(1, max_batch_size), *model.input(0).partial_shape[1:]])})
+                compiled_model = core.compile_model(model=model, device_name=device, config=config)
+                pool = InferRequestPool(compiled_model)
+                self._entries[key] = pool
+        return pool
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# 프로세스 전체에서 공유하는 모델 모음
+model_registry = ModelRegistry()
+
+
+class OpenvinoSession(InferenceSession):
+    """
+    공유 컴파일 모델에서 요청 객체 하나를 빌려 계속 사용하는 세션
+
+    Args:
+        pool (InferRequestPool): 컴파일된 모델의 요청 객체 모음
+    """
+    def __init__(self, pool: InferRequestPool):
+        self._pool = pool
+        self.request = pool.acquire()
+        input_layer = pool.compiled_model.input(0)
+        self.input_shape = tuple(input_layer.partial_shape.get_min_shape())
+        self.input_dtype = input_layer.element_type.to_dtype()
+        self._async_executor = None     # 비동기 추론 쓰레드 (처음 사용할 때 생성)
+        self._async_lock = threading.Lock()
+
+    def infer(self, input_data: np.ndarray) -> np.ndarray:
+        # 출력 텐서는 다음 추론에서 덮어쓰므로 결과를 보관하려면 복사가 필요
+        self.request.infer({0: input_data}, share_outputs=True)
+        return self.request.get_output_tensor(0).data.copy()
+
+    def infer_async(self, input_data: np.ndarray) -> Future:
+        # 추론 쓰레드 수는 OpenVINO가 권장하는 요청 수 (쓰레드마다 요청 객체를 빌려 동기 추론, 추론 중에는 GIL을 놓음)
+        # AsyncInferQueue 콜백은 종료 시점에 OpenVINO 쓰레드와 경합하여 프로세스가 비정상 종료될 수 있어 사용하지 않음
+        with self._async_lock:
+            if self._async_executor is None:
+                requests = self._pool.compiled_model.get_property('OPTIMAL_NUMBER_OF_INFER_REQUESTS')
+                self._async_executor = ThreadPoolExecutor(max_workers=max(1, requests),
+                                                          thread_name_prefix='infer-async')
+        return self._async_executor.submit(self._infer_leased, input_data)
+
+    def _infer_leased(self, input_data: np.ndarray) -> np.ndarray:
+        with self._pool.lease() as request:
+            request.infer({0: input_data}, share_outputs=True)
+            return request.get_output_tensor(0).data.copy()
+
+    def close(self):
+        if self._async_executor is not None:
+            self._async_executor.shutdown(wait=True)
+            self._async_executor = None
+        if self.request is not None:
+            self._pool.release(self.request)
+            self.request = None
+
+
+class OnnxruntimeSession(InferenceSession):
+    """
+    onnxruntime.InferenceSession을 사용하는 세션 (InferenceSession.run은 여러 쓰레드에서 동시에 호출 가능)
+
+    Args:
+        session (onnxruntime.InferenceSession): 공유 세션
+    """
+    # onnxruntime 입력 자료형 이름
+    DTYPES = {'tensor(float)': np.float32, 'tensor(float16)': np.float16, 'tensor(uint8)': np.uint8,
+              'tensor(int8)': np.int8, 'tensor(int32)': np.int32, 'tensor(int64)': np.int64}
+
+    def __init__(self, session):
+        self._session = session
+        model_input = session.get_inputs()[0]
+        self._input_name = model_input.name
+        self._output_names = [session.get_outputs()[0].name]
+        # 고정되지 않은 차원(배치 크기 등)은 1로 봄
+        self.input_shape = tuple(dim if isinstance(dim, int) and dim > 0 else 1 for dim in model_input.shape)
+        self.input_dtype = self.DTYPES[model_input.type]
+
+    def infer(self, input_data: np.ndarray) -> np.ndarray:
+        # OpenVINO와 달리 자료형을 자동으로 변환하지 않음 (예: MoveNet ONNX의 int32 입력)
+        input_data = np.ascontiguousarray(input_data, dtype=self.input_dtype)
+        return self._session.run(self._output_names, {self._input_name: input_data})[0]
+
+
+
+class DummySession(InferenceSession):
+    """
+    모델 없이 latency초 동안 기다린 뒤 시드로 정해지는 결과를 반환하는 세션
+    (기다리는 동안 GIL을 놓으므로 실제 런타임처럼 다른 쓰레드가 실행됨)
+        person_detection: 프레임 가운데의 사람 한 명
+        pose_estimation: 선 자세에서 조금씩 흔들리는 키 포인트
+        pose_classification: 무작위 점수
+
+    Args:
+        kind (str): 모델 종류
+        latency (float): 이미지 한 장의 추론 시간(초)
+        seed (int): 결과를 정하는 시드 (같은 시드의 세션은 같은 순서로 같은 결과를 반환)
+    """
+    def __init__(self, kind: str, latency: float, seed: int):
+        self.kind = kind
+        self.latency = latency
+        self.input_shape, self.input_dtype, self._output_shape = DUMMY_MODELS[kind]
+        self._rng = np.random.default_rng([seed, MODEL_KINDS.index(kind)])
+
+    def infer(self, input_data: np.ndarray) -> np.ndarray:
+        batch_size = len(input_data)
+        if self.latency > 0:
+            time.sleep(self.latency * batch_size)
+
+        if self.kind == 'person_detection':
+            # [1, 1, N * batch, 7] - 이미지마다 사람 한 명, 나머지 행은 이미지 번호 -1
+            count = self._output_shape[2]
+            output = np.zeros((1, 1, count * batch_size, 7), dtype=np.float32)
+            output[0, 0, :, 0] = -1
+            for i in range(batch_size):
+                jitter = self._rng.normal(0, 0.005, 4)
+                output[0, 0, i] = (i, 1, 0.9, *(np.array([0.3, 0.1, 0.7, 0.9]) + jitter))
+            return output
+
+        if self.kind == 'pose_estimation':
+            output = np.empty(self._output_shape, dtype=np.float32)
+            output[0, 0, :, :2] = DUMMY_POSE + self._rng.normal(0, 0.005, DUMMY_POSE.shape)
+            output[0, 0, :, 2] = self._rng.uniform(0.6, 0.95, len(DUMMY_POSE))
+            return output
+
+        scores = self._rng.random(self._output_shape[1:])
+        return (scores / scores.sum())[None].astype(np.float32)
+
+
+
+def onnx_model_path(model_path: str) -> str:
+    """
+    IR 모델 경로에 대응하는 ONNX 모델 경로 (예: models/pose-classification-03.onnx)
+    """
+    return os.path.splitext(model_path)[0] + '.onnx'
+
+
+class Backend:
+    """
+    모델 경로와 설정으로 InferenceSession을 만드는 백엔드의 기본 클래스
+    """
+    name = ''
+
+    def open(self, kind: str, model_path: str, device: str = 'CPU', config: dict = None,
+             max_batch_size: int = None) -> InferenceSession:
+        """
+        추론 세션 생성
+
+        Args:
+            kind (str): 모델 종류 (MODEL_KINDS)
+            model_path (str): IR 모델 경로
+            device (str): 추론에 사용할 장치
+            config (dict, optional): OpenVINO compile_model 설정 (utils.ov_config.model_config)
+            max_batch_size (int, optional): 배치 크기를 1 ~ max_batch_size로 바꿀 수 있는 세션
+
+        Returns:
+            InferenceSession: 추론 세션
+        """
+        raise NotImplementedError
+
+
+class OpenvinoBackend(Backend):
+    name = 'openvino'
+
+    def open(self, kind, model_path, device='CPU', config=None, max_batch_size=None):
+        return OpenvinoSession(model_registry.get(model_path, device, config, max_batch_size))
+
+
+class OnnxruntimeBackend(Backend):
+    """
+    onnxruntime 백엔드 (CPU 실행, 같은 모델과 쓰레드 설정의 세션은 공유)
+    OpenVINO 설정 중 INFERENCE_NUM_THREADS만 intra_op_num_threads로 사용합니다.
+    배치 세션은 ONNX 모델의 배치 차원이 고정되지 않았을 때만 만들 수 있습니다.
+    """
+    name = 'onnxruntime'
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def open(self, kind, model_path, device='CPU', config=None, max_batch_size=None):
+        import onnxruntime
+
+        path = onnx_model_path(model_path)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f'{path} not found (export the model to ONNX next to {model_path})')
+        threads = (config or {}).get('INFERENCE_NUM_THREADS', 0)
+        key = (os.path.abspath(path), threads)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                options = onnxruntime.SessionOptions()
+                options.intra_op_num_threads = threads
+                session = onnxruntime.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+                self._sessions[key] = session
+
+        if max_batch_size is not None and isinstance(session.get_inputs()[0].shape[0], int) \
+                and session.get_inputs()[0].shape[0] < max_batch_size:
+            raise ValueError(f'{path} has a fixed batch size; max_batch_size {max_batch_size} is not supported')
+        return OnnxruntimeSession(session)
+
+
+class DummyBackend(Backend):
+    """
+    dummy 백엔드 (모델 파일을 읽지 않음, 세션마다 순서대로 다른 시드 사용)
+    """
+    name = 'dummy'
+
+    def __init__(self, latencies: dict[str, float] = None, seed: int = DUMMY_SEED):
+        self.latencies = latencies if latencies is not None else DUMMY_LATENCIES
+        self.seed = seed
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def open(self, kind, model_path, device='CPU', config=None, max_batch_size=None):
+        with self._lock:
+            seed = self.seed + self._opened
+            self._opened += 1
+        return DummySession(kind, self.latencies[kind], seed)
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(name: str) -> Backend:
+    """
+    이름에 해당하는 백엔드 (프로세스에서 하나만 생성하여 공유)
+    """
+    if name not in BACKENDS:
+        raise ValueError(f'Unknown backend: {name} (expected one of {BACKENDS})')
+    with _backends_lock:
+        backend = _backends.get(name)
+        if backend is None:
+            backend = {'openvino': OpenvinoBackend, 'onnxruntime': OnnxruntimeBackend,
+                       'dummy': DummyBackend}[name]()
+            _backends[name] = backend
+    return backend
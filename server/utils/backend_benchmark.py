@@ -0,0 +1,148 @@
+"""
+추론 백엔드 비교 모듈
+
+같은 입력으로 백엔드(utils.backend)별 모델 추론 시간과 OpenVINO 대비 출력 차이를 측정하고,
+Inferencer 여러 개를 동시에 실행하여 카메라 수에 따른 전체 파이프라인 처리량을 측정합니다.
+"""
+import statistics
+import threading
+import time
+
+import numpy as np
+
+from utils import backend as backends
+from utils.backend import DUMMY_MODELS, InferenceSession, get_backend
+from utils.benchmark import synthetic_frame
+from utils.clips import compare_outputs
+from utils.inference import Inferencer
+
+
+def synthetic_inputs(kind: str, session: InferenceSession = None, count: int = 50, seed: int = 0) -> list[np.ndarray]:
+    """
+    세션 입력 형태의 무작위 입력 (기록 영상이 없을 때 사용)
+
+    Args:
+        kind (str): 모델 종류
+        session (InferenceSession, optional): 입력 형태를 가져올 세션 (없으면 DUMMY_MODELS 형태)
+        count (int): 입력 수
+        seed (int): 시드
+
+    Returns:
+        list[np.ndarray]: 입력 텐서
+    """
+    if session is not None:
+        shape, dtype = session.input_shape, session.input_dtype
+    else:
+        shape, dtype, _ = DUMMY_MODELS[kind]
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, shape).astype(dtype) for _ in range(count)]
+
+
+def measure_session(session: InferenceSession, inputs: list[np.ndarray], min_time: float = 2.0) -> dict[str, float]:
+    """
+    세션 하나로 입력을 순서대로 추론할 때의 지연 시간
+
+    Returns:
+        dict[str, float]: median_ms, p90_ms, fps
+    """
+    session.infer(inputs[0])     # warm-up
+    samples = []
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_time or len(samples) < len(inputs):
+        input_tensor = inputs[len(samples) % len(inputs)]
+        begin = time.perf_counter()
+        session.infer(input_tensor)
+        samples.append(time.perf_counter() - begin)
+    samples.sort()
+    return {'median_ms': statistics.median(samples) * 1000,
+            'p90_ms': samples[int(0.9 * (len(samples) - 1))] * 1000,
+            'fps': len(samples) / sum(samples)}
+
+
+def compare_backends(kind: str, model_path: str, inputs: list[np.ndarray], names: list[str],
+                     config: dict = None, min_time: float = 2.0) -> dict:
+    """
+    백엔드별 추론 시간과 OpenVINO 출력 대비 차이 (OpenVINO를 비교하지 않거나 dummy 백엔드면 차이는 생략)
+
+    Args:
+        kind (str): 모델 종류
+        model_path (str): IR 모델 경로 (onnxruntime은 같은 이름의 .onnx)
+        inputs (list[np.ndarray]): 입력 텐서
+        names (list[str]): 비교할 백엔드 이름
+        config (dict, optional): compile_model 설정
+        min_time (float): 백엔드별 최소 측정 시간(초)
+
+    Returns:
+        dict: 백엔드별 {'median_ms', 'p90_ms', 'fps', 'accuracy'} 또는 {'error'}
+    """
+    report = {}
+    reference = None
+    for name in names:
+        try:
+            session = get_backend(name).open(kind, model_path, config=config)
+        except (ImportError, FileNotFoundError, RuntimeError, ValueError) as e:
+            report[name] = {'error': str(e).splitlines()[0]}
+            continue
+        try:
+            report[name] = measure_session(session, inputs, min_time)
+            if name == 'dummy':
+                continue
+            outputs = [session.infer(input_tensor) for input_tensor in inputs]
+            if name == 'openvino':
+                reference = outputs
+            if reference is not None:
+                report[name]['accuracy'] = compare_outputs(kind, reference, outputs)
+        finally:
+            session.close()
+    return report
+
+
+def measure_pipeline(streams: int, backend_names: dict[str, str], min_time: float = 5.0,
+                     width: int = 640, height: int = 480) -> dict[str, float]:
+    """
+    Inferencer를 streams개 만들어 쓰레드마다 같은 합성 프레임을 계속 추론할 때의 처리량
+    (카메라 수에 따른 파이프라인 확장성 측정, dummy 백엔드를 쓰면 모델 없이 측정 가능)
+
+    Args:
+        streams (int): 동시에 실행할 Inferencer 수
+        backend_names (dict[str, str]): 모델 종류별 백엔드 (config.ini [backend] 대신 사용)
+        min_time (float): 측정 시간(초)
+        width (int): 프레임 너비
+        height (int): 프레임 높이
+
+    Returns:
+        dict[str, float]: total_fps, per_stream_fps
+    """
+    # Inferencer는 만들 때 backends.MODEL_BACKENDS를 읽으므로 측정하는 동안만 바꿈
+    previous = dict(backends.MODEL_BACKENDS)
+    backends.MODEL_BACKENDS.update(backend_names)
+    try:
+        inferencers = [Inferencer(name=f'pipeline{i}') for i in range(streams)]
+    finally:
+        backends.MODEL_BACKENDS.update(previous)
+
+    frame = synthetic_frame(width, height)
+    counts = [0] * streams
+    stop = threading.Event()
+
+    def run(index: int):
+        inferencer = inferencers[index]
+        state = inferencer.engine.create_state()
+        while not stop.is_set():
+            inferencer.inference(frame, state)
+            counts[index] += 1
+
+    threads = [threading.Thread(target=run, args=(i,), daemon=True) for i in range(streams)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    stop.wait(min_time)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    for inferencer in inferencers:
+        inferencer.close()
+
+    total = sum(counts) / elapsed
+    return {'total_fps': total, 'per_stream_fps': total / streams}
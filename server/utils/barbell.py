@@ -0,0 +1,132 @@
+"""
+바벨 검출 모듈
+
+client2가 stream 모드로 보낸 프레임에서 위험 구역(ROI)의 바벨을 서버에서 검출합니다.
+client2의 process_frames와 같은 판단(ROI 안에 신뢰도 임계값을 넘는 바벨)을 하고,
+검출되면 on_detect를 호출하여 client2에 부저 명령을 보냅니다.
+라즈베리 파이 CPU 대신 서버에서 검출하므로 긴급 상황 검출 FPS가 높아집니다.
+"""
+import configparser
+import queue
+import threading
+import time
+import traceback
+from queue import Queue
+
+import numpy as np
+
+from utils import metrics
+from utils.model import BarbellDetector
+from utils.ov_config import model_config
+from utils.pipeline import Pipeline, PipelineGraph, Stage
+
+
+# 설정 가져오기
+__config = configparser.ConfigParser()
+__config.read('config.ini')
+
+BARBELL_MODEL_PATH = __config['barbell']['model']
+BARBELL_CONFIDENCE_THRESHOLD = float(__config['barbell']['confidence_threshold'])
+BARBELL_ROI = tuple(int(value) for value in __config['barbell']['roi'].strip('() ').split(','))
+BARBELL_COOLDOWN = float(__config['barbell']['cooldown'])
+
+
+def crop_danger_zone(frame: np.ndarray, roi: tuple = BARBELL_ROI) -> np.ndarray:
+    """
+    위험 구역만 크롭하는 함수
+
+    Args:
+        frame (numpy.ndarray): 비디오 프레임
+        roi (tuple): 위험 구역 (x1, y1, x2, y2)
+
+    Returns:
+        numpy.ndarray: 크롭된 위험 구역
+    """
+    x1, y1, x2, y2 = roi
+    return frame[y1:y2, x1:x2]
+
+
+class BarbellMonitor(threading.Thread):
+    """
+    client2 프레임의 바벨 검출 쓰레드
+    검출이 프레임 수신보다 느리면 밀린 프레임은 버리고 가장 최근 프레임만 검출합니다. (client2의 latest_frame과 같음)
+
+    Args:
+        frame_queue (Queue): 수신한 프레임(ReceivedFrame)이 저장된 큐
+        name (str, optional): 지표에 사용할 클라이언트 이름
+    """
+    def __init__(self, frame_queue: Queue, name: str = 'client2'):
+        super().__init__()
+        self._queue = frame_queue
+        self._running = True
+        self.detector = BarbellDetector(BARBELL_MODEL_PATH, config=model_config('barbell_detection'))
+        self.on_detect = self._default_callback
+        self._last_alarm_time = None
+
+        # 지표
+        self._frames_inferred = metrics.frames_inferred.labels(name)
+        self._frames_superseded = metrics.frames_superseded.labels(name)
+        self._detector_latency = metrics.model_latency.labels(name, 'BarbellDetector')
+
+        self.pipeline = Pipeline(self._build_graph(), name)
+
+    def _default_callback(self):
+        print('Barbell detected in the danger zone.')
+
+    def _build_graph(self) -> PipelineGraph:
+        """
+        단계 그래프
+            crop: 위험 구역 크롭
+            detect: 바벨 검출
+            alert: 검출되면 cooldown 간격으로 on_detect 호출
+        """
+        return PipelineGraph([
+            Stage('crop', crop_danger_zone, ('frame',), ('roi',)),
+            Stage('detect', self._stage_detect, ('roi',), ('detections',), thread_safe=False),
+            Stage('alert', self._stage_alert, ('detections', 'timestamp'), thread_safe=False),
+        ], sources=('frame', 'timestamp'))
+
+    def _stage_detect(self, roi: np.ndarray) -> tuple:
+        with self._detector_latency.time():
+            return self.detector.predict(roi, BARBELL_CONFIDENCE_THRESHOLD)
+
+    def _stage_alert(self, detections: tuple, timestamp: float):
+        boxes, _, _ = detections
+        if len(boxes) == 0:
+            return
+        if self._last_alarm_time is not None and timestamp - self._last_alarm_time < BARBELL_COOLDOWN:
+            return
+        self._last_alarm_time = timestamp
+        self.on_detect()
+
+    def detect(self, frame: np.ndarray) -> dict:
+        """
+        프레임 하나의 바벨 검출 (단계 출력이 담긴 컨텍스트 반환)
+        """
+        context = self.pipeline.run({'frame': frame, 'timestamp': time.monotonic()})
+        self._frames_inferred.inc()
+        return context
+
+    def run(self):
+        try:
+            while self._running:
+                try:
+                    received = self._queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                # 밀린 프레임은 버리고 가장 최근 프레임만 검출
+                while True:
+                    try:
+                        received = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    self._frames_superseded.inc()
+                self.detect(received.image)
+        except Exception as e:
+            traceback.print_exc()
+            self._running = False
+        finally:
+            self.detector.close()
+
+    def stop(self):
+        self._running = False
@@ -0,0 +1,369 @@
+"""
+성능 측정 모듈
+
+추론 경로의 주요 함수를 합성 입력으로 반복 측정하고, 저장된 기준값(JSON)과 비교합니다.
+실제 모델 파일이 없으면 입력/출력 형태만 같은 작은 대체 IR 모델을 만들어 사용합니다.
+"""
+import json
+import os
+import platform
+import socket
+import statistics
+import struct
+import tempfile
+import time
+from collections import deque
+from queue import Queue
+
+import cv2
+import numpy as np
+import openvino as ov
+import openvino.opset13 as ops
+
+from utils.decision import DecisionEngine, median_index
+from utils.inference import (Inferencer, PERSON_DETECTION_MODEL_PATH,
+                             POSE_CLASSIFICATION_MODEL_PATH, POSE_ESTIMATION_MODEL_PATH)
+from utils.model import PersonDetector, PoseClassifier, PoseEstimator
+from utils.state_store import StateStore
+from utils.thread import ImageReceiveThread
+
+
+# 카메라 해상도 (너비, 높이)
+CAMERA_RESOLUTIONS = [(640, 480), (1280, 720)]
+
+# 대체 모델의 입력/출력 형태와 입력 자료형
+STUB_MODELS = {
+    'person_detection': ([1, 3, 512, 512], [1, 1, 200, 7], ov.Type.f32),
+    'pose_estimation': ([1, 256, 256, 3], [1, 1, 17, 3], ov.Type.u8),
+    'pose_classification': ([1, 3, 224, 224], [1, 2], ov.Type.f32),
+}
+
+
+def model_available(model_path: str) -> bool:
+    """
+    IR 모델 파일(.xml, .bin)이 모두 있는지 확인
+    """
+    return os.path.exists(model_path) and os.path.exists(os.path.splitext(model_path)[0] + '.bin')
+
+
+def build_stub_model(path: str, input_shape: list[int], output_shape: list[int],
+                     input_type: ov.Type = ov.Type.f32) -> str:
+    """
+    입력/출력 형태만 실제 모델과 같은 작은 IR 모델 생성
+
+    Args:
+        path (str): 저장할 .xml 경로
+        input_shape (list[int]): 입력 형태
+        output_shape (list[int]): 출력 형태
+        input_type (ov.Type): 입력 자료형
+
+    Returns:
+        str: 저장한 .xml 경로
+    """
+    parameter = ops.parameter(input_shape, input_type, name='input')
+    value = ops.convert(parameter, ov.Type.f32) if input_type != ov.Type.f32 else parameter
+    mean = ops.reduce_mean(value, ops.constant(np.arange(len(input_shape), dtype=np.int64)), keep_dims=True)
+    mean = ops.reshape(mean, ops.constant(np.ones(len(output_shape), dtype=np.int64)), special_zero=False)
+    weights = ops.constant(np.random.default_rng(0).random(output_shape, dtype=np.float32))
+    output = ops.multiply(mean, weights)
+    model = ov.Model([output], [parameter], 'stub')
+    ov.save_model(model, path)
+    return path
+
+
+def resolve_model_paths(stub_dir: str) -> tuple[dict[str, str], list[str]]:
+    """
+    실제 모델 경로를 반환하고, 없는 모델은 대체 모델을 만들어 그 경로를 반환
+
+    Returns:
+        dict[str, str]: 모델 종류별 경로
+        list[str]: 대체 모델을 사용한 모델 종류
+    """
+    paths = {
+        'person_detection': PERSON_DETECTION_MODEL_PATH,
+        'pose_estimation': POSE_ESTIMATION_MODEL_PATH,
+        'pose_classification': POSE_CLASSIFICATION_MODEL_PATH,
+    }
+    stubbed = []
+    for kind, path in paths.items():
+        if not model_available(path):
+            input_shape, output_shape, input_type = STUB_MODELS[kind]
+            paths[kind] = build_stub_model(os.path.join(stub_dir, f'{kind}.xml'),
+                                           input_shape, output_shape, input_type)
+            stubbed.append(kind)
+    return paths, stubbed
+
+
+def measure(function: callable, min_time: float = 0.5, min_runs: int = 20, warmup: int = 5) -> dict:
+    """
+    함수 실행 시간 측정
+
+    Args:
+        function (callable): 측정할 함수 (인자 없음)
+        min_time (float): 최소 측정 시간(초)
+        min_runs (int): 최소 실행 횟수
+        warmup (int): 측정 전 실행 횟수
+
+    Returns:
+        dict: median_us, p90_us, min_us, runs
+    """
+    for _ in range(warmup):
+        function()
+
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < min_runs or time.perf_counter() < deadline:
+        start = time.perf_counter_ns()
+        function()
+        samples.append(time.perf_counter_ns() - start)
+
+    samples.sort()
+    return {
+        'median_us': statistics.median(samples) / 1000,
+        'p90_us': samples[int(0.9 * (len(samples) - 1))] / 1000,
+        'min_us': samples[0] / 1000,
+        'runs': len(samples),
+    }
+
+
+def synthetic_frame(width: int, height: int, seed: int = 0) -> np.ndarray:
+    """
+    JPEG 압축률이 실제 영상과 비슷하도록 그라디언트에 잡음을 더한 합성 이미지
+    """
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    base = np.stack([np.broadcast_to(x, (height, width)),
+                     np.broadcast_to(y, (height, width)),
+                     (x + y) / 2], axis=2)
+    noise = rng.normal(0, 8, (height, width, 3))
+    return np.clip(base + noise, 0, 255).astype(np.uint8)
+
+
+def synthetic_detections(count: int = 200, positives: int = 3, seed: int = 0) -> np.ndarray:
+    """
+    사람 검출 모델 출력 형태 [1, 1, N, 7]의 합성 결과 (positives개만 임계값 이상)
+    """
+    rng = np.random.default_rng(seed)
+    detections = np.zeros((1, 1, count, 7), dtype=np.float32)
+    detections[0, 0, :, 2] = rng.uniform(0.0, 0.4, count)
+    detections[0, 0, :positives, 2] = rng.uniform(0.6, 1.0, positives)
+    xy = rng.uniform(0.0, 0.5, (count, 2))
+    detections[0, 0, :, 3:5] = xy
+    detections[0, 0, :, 5:7] = xy + rng.uniform(0.1, 0.5, (count, 2))
+    return detections
+
+
+def synthetic_keypoints(seed: int = 0) -> np.ndarray:
+    """
+    모든 키 포인트의 신뢰도가 임계값 이상인 합성 키 포인트 (17, 3)
+    """
+    rng = np.random.default_rng(seed)
+    keypoints = rng.uniform(0.1, 0.9, (17, 3)).astype(np.float32)
+    keypoints[:, 2] = rng.uniform(0.5, 1.0, 17)
+    return keypoints
+
+
+class LoopbackLink:
+    """
+    루프백 TCP 연결로 클라이언트와 같은 방식(길이 + JPEG)의 프레임을 보내고
+    서버의 ImageReceiveThread가 큐에 넣을 때까지 기다리는 측정용 연결
+    """
+    def __init__(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(1)
+        self._sender = socket.create_connection(listener.getsockname())
+        receiver, _ = listener.accept()
+        listener.close()
+
+        self._queue = Queue()
+        self._thread = ImageReceiveThread(receiver, self._queue, client='benchmark')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def round_trip(self, img_bytes: bytes):
+        self._sender.sendall(struct.pack(">L", len(img_bytes)) + img_bytes)
+        self._queue.get()
+
+    def close(self):
+        self._sender.sendall(struct.pack(">L", 0))
+        self._thread.join()
+        self._sender.close()
+
+
+def build_cases(model_paths: dict[str, str]) -> dict[str, callable]:
+    """
+    측정 항목 생성
+
+    Args:
+        model_paths (dict[str, str]): 모델 종류별 경로
+
+    Returns:
+        dict[str, callable]: 항목 이름별 측정 함수
+    """
+    detector = PersonDetector(model_paths['person_detection'])
+    estimator = PoseEstimator(model_paths['pose_estimation'])
+    classifier = PoseClassifier(model_paths['pose_classification'])
+    # 모델을 불러오지 않은 Inferencer (_crop_roi만 사용)
+    inferencer = Inferencer.__new__(Inferencer)
+
+    frame = synthetic_frame(640, 480)
+    roi = frame[60:420, 200:440]
+    boxes = np.array([[200.0, 60.0, 440.0, 420.0]])
+    detections = synthetic_detections()
+    keypoints = synthetic_keypoints()
+    skeleton_image = estimator.visualize(roi, keypoints)
+    process_results = detector._PersonDetector__process_results
+
+    cases = {
+        'PersonDetector._preprocess[640x480]': lambda: detector._preprocess(frame, transpose=True),
+        'PoseEstimator._preprocess[240x360]': lambda: estimator._preprocess(roi, transpose=False),
+        'PoseClassifier._preprocess[240x360]': lambda: classifier._preprocess(skeleton_image, transpose=True),
+        'PersonDetector.__process_results[200]': lambda: process_results(480, 640, detections),
+        'PoseEstimator.visualize[240x360]': lambda: estimator.visualize(roi, keypoints),
+        'Inferencer._crop_roi': lambda: inferencer._crop_roi(frame, boxes, 10),
+    }
+
+    # 분류 결과 히스토리의 중앙값 필터와 분류 결과 한 건의 상태 갱신
+    history = deque(np.random.default_rng(0).integers(0, 3, 10).tolist(), maxlen=10)
+    engine = DecisionEngine(clock=lambda: 0.0)
+    state = engine.create_state()
+    pose_inputs = iter(np.random.default_rng(1).integers(0, 2, 1 << 20).tolist())
+
+    def update_pose():
+        engine.begin_frame(state)
+        engine.update_pose(state, next(pose_inputs), 0.9)
+
+    cases['median_index[10]'] = lambda: median_index(history)
+    cases['DecisionEngine.update_pose'] = update_pose
+
+    # 1000개 스트림의 한 프레임을 배열 연산으로 갱신
+    store = StateStore(DecisionEngine(clock=lambda: 0.0), capacity=1000)
+    streams = np.array([store.add_stream() for _ in range(1000)])
+    store_inputs = np.random.default_rng(2)
+    store_time = [0.0]
+
+    def update_store():
+        store_time[0] += 0.033
+        required = store.update_detection(streams, np.full(len(streams), store_time[0]),
+                                          store_inputs.random(len(streams)) < 0.99)
+        selected = streams[required]
+        store.update_pose(selected, store_inputs.integers(0, 2, len(selected)),
+                          store_inputs.uniform(0.5, 1.0, len(selected)))
+
+    cases['StateStore.update[1000]'] = update_store
+
+    # 카메라 해상도별 JPEG 인코딩/디코딩
+    for width, height in CAMERA_RESOLUTIONS:
+        image = synthetic_frame(width, height)
+        encoded = cv2.imencode('.jpg', image)[1]
+        cases[f'jpeg.encode[{width}x{height}]'] = lambda image=image: cv2.imencode('.jpg', image)
+        cases[f'jpeg.decode[{width}x{height}]'] = \
+            lambda encoded=encoded: cv2.imdecode(encoded, cv2.IMREAD_COLOR)
+
+    return cases
+
+
+def run(case_filter: str = None, min_time: float = 0.5) -> dict:
+    """
+    모든 항목 측정
+
+    Args:
+        case_filter (str, optional): 이름에 이 문자열이 포함된 항목만 측정
+        min_time (float): 항목별 최소 측정 시간(초)
+
+    Returns:
+        dict: machine, stub_models, cases
+    """
+    with tempfile.TemporaryDirectory() as stub_dir:
+        model_paths, stubbed = resolve_model_paths(stub_dir)
+        cases = build_cases(model_paths)
+
+        results = {}
+        for name, function in cases.items():
+            if case_filter and case_filter not in name:
+                continue
+            results[name] = measure(function, min_time)
+
+        # 루프백 소켓으로 프레임 송신부터 수신 쓰레드의 큐 삽입(디코딩 포함)까지
+        for width, height in CAMERA_RESOLUTIONS:
+            name = f'socket.loopback[{width}x{height}]'
+            if case_filter and case_filter not in name:
+                continue
+            img_bytes = cv2.imencode('.jpg', synthetic_frame(width, height))[1].tobytes()
+            link = LoopbackLink()
+            try:
+                results[name] = measure(lambda: link.round_trip(img_bytes), min_time)
+            finally:
+                link.close()
+
+    return {'machine': machine_info(), 'stub_models': stubbed, 'cases': results}
+
+
+def machine_info() -> dict:
+    """
+    측정 환경 정보
+    """
+    return {
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+        'openvino': ov.__version__,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[tuple[str, float, float, float, str]]:
+    """
+    측정 결과를 기준값과 비교
+
+    Args:
+        results (dict): run()의 결과
+        baseline (dict): 기준값 (run()의 결과와 같은 형식, 항목별 'tolerance'로 허용 오차 지정 가능)
+        tolerance (float): 기본 허용 오차 (0.2: 기준값보다 20% 느린 것까지 허용)
+
+    Returns:
+        list[tuple]: (항목 이름, 기준값(us), 측정값(us), 비율, 판정) 목록
+            판정: 'ok', 'faster', 'REGRESSION', 'new'
+    """
+    rows = []
+    for name, result in results['cases'].items():
+        expected = baseline['cases'].get(name)
+        current = result['median_us']
+        if expected is None:
+            rows.append((name, float('nan'), current, float('nan'), 'new'))
+            continue
+        limit = expected.get('tolerance', tolerance)
+        ratio = current / expected['median_us']
+        if ratio > 1 + limit:
+            verdict = 'REGRESSION'
+        elif ratio < 1 / (1 + limit):
+            verdict = 'faster'
+        else:
+            verdict = 'ok'
+        rows.append((name, expected['median_us'], current, ratio, verdict))
+    return rows
+
+
+def load_baseline(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: dict, baseline: dict = None):
+    """
+    측정 결과를 기준값으로 저장
+    기존 기준값의 항목별 허용 오차는 유지하고, 이번에 측정하지 않은 항목(--filter)도 그대로 둡니다.
+    """
+    if baseline is not None:
+        for name, result in results['cases'].items():
+            if 'tolerance' in baseline['cases'].get(name, {}):
+                result['tolerance'] = baseline['cases'][name]['tolerance']
+        results = dict(results, cases={**baseline['cases'], **results['cases']})
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+        f.write('\n')
@@ -0,0 +1,184 @@
+"""
+기록 영상 입력 모듈
+
+기록된 사고 영상(recorder의 MJPEG AVI)에서 프레임을 뽑고, 원본 모델로 실제 파이프라인과 같은 순서로
+실행하여 모델별 입력 텐서를 만듭니다. 양자화 보정(quantize.py)과 실행 설정 탐색(autotune.py)에 사용합니다.
+같은 입력에 대한 원본 모델과 다른 모델의 출력 차이도 비교합니다. (quantization, backend_benchmark)
+    person_detection: 프레임
+    pose_estimation: 사람 검출 결과로 크롭한 ROI
+    pose_classification: 키 포인트로 그린 skeleton 이미지
+"""
+import configparser
+import glob
+import os
+
+import cv2
+import numpy as np
+
+from utils.backend import MODEL_KINDS
+from utils.model import PersonDetector, PoseClassifier, PoseEstimator
+
+
+# 설정 가져오기
+__config = configparser.ConfigParser()
+__config.read('config.ini')
+
+MODEL_PATHS = {kind: __config['model'][kind] for kind in MODEL_KINDS}  # 원본(float) 모델 경로
+
+DETECTION_THRESHOLD = 0.5   # 검출 결과 비교에 사용할 최소 점수
+KEYPOINT_THRESHOLD = 0.3    # 키 포인트 비교에 사용할 최소 신뢰도
+PCK_THRESHOLD = 0.05        # 키 포인트가 일치한다고 볼 최대 거리 (정규화 좌표)
+
+
+def find_clips(path: str) -> list[str]:
+    """
+    영상 파일 목록 (디렉토리면 안의 .avi 파일, 이름 순)
+    """
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, '*.avi')))
+    return [path]
+
+
+def split_clips(clips: list[str], holdout: float) -> tuple[list[str], list[str]]:
+    """
+    영상 단위로 보정용과 평가용 분리 (같은 영상의 프레임이 양쪽에 섞이지 않도록)
+    영상이 하나뿐이면 같은 영상을 양쪽에 사용합니다.
+
+    Args:
+        clips (list[str]): 영상 파일 목록
+        holdout (float): 평가용 영상 비율
+
+    Returns:
+        list[str]: 보정용 영상
+        list[str]: 평가용 영상
+    """
+    if len(clips) < 2:
+        return clips, clips
+    count = min(len(clips) - 1, max(1, round(len(clips) * holdout)))
+    # 일정 간격으로 뽑아 날짜/시간대가 한쪽에 몰리지 않도록 함
+    step = len(clips) / count
+    holdout_indices = {int(i * step) for i in range(count)}
+    calibration = [clip for i, clip in enumerate(clips) if i not in holdout_indices]
+    evaluation = [clip for i, clip in enumerate(clips) if i in holdout_indices]
+    return calibration, evaluation
+
+
+def read_frames(clips: list[str], stride: int, max_frames: int) -> list[np.ndarray]:
+    """
+    영상에서 stride 프레임마다 하나씩, 전체 영상에 고르게 최대 max_frames개 읽기
+    """
+    frames = []
+    per_clip = max(1, max_frames // max(1, len(clips)))
+    for clip in clips:
+        capture = cv2.VideoCapture(clip)
+        index = 0
+        taken = 0
+        while taken < per_clip:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            if index % stride == 0:
+                frames.append(frame)
+                taken += 1
+            index += 1
+        capture.release()
+    return frames[:max_frames]
+
+
+def _crop_roi(frame: np.ndarray, box: np.ndarray, padding: int = 10) -> np.ndarray:
+    """
+    Inferencer._crop_roi와 같은 크롭
+    """
+    height, width, _ = frame.shape
+    x1, y1, x2, y2 = list(map(int, box))
+    return frame[max(0, y1 - padding):min(height, y2 + padding), max(0, x1 - padding):min(width, x2 + padding)]
+
+
+def build_inputs(frames: list[np.ndarray], model_paths: dict[str, str]) -> dict[str, list[np.ndarray]]:
+    """
+    원본 모델로 파이프라인을 실행하여 모델별 입력 텐서 생성
+
+    Args:
+        frames (list[np.ndarray]): 비디오 프레임
+        model_paths (dict[str, str]): 모델 종류별 원본 모델 경로
+
+    Returns:
+        dict[str, list[np.ndarray]]: 모델 종류별 입력 텐서 목록 (사람이 없는 프레임은 자세 모델 입력 없음)
+    """
+    detector = PersonDetector(model_paths['person_detection'])
+    estimator = PoseEstimator(model_paths['pose_estimation'])
+    classifier = PoseClassifier(model_paths['pose_classification'])
+
+    inputs = {kind: [] for kind in MODEL_KINDS}
+    try:
+        for frame in frames:
+            inputs['person_detection'].append(detector._preprocess(frame, transpose=True))
+            boxes, _, _ = detector.predict(frame)
+            if len(boxes) == 0:
+                continue
+            roi = _crop_roi(frame, boxes[0])
+            if roi.size == 0:
+                continue
+            inputs['pose_estimation'].append(estimator._preprocess(roi, transpose=False))
+            keypoints = estimator.estimate(roi)
+            # 서버와 같은 방식으로 만든 skeleton 이미지
+            classifier_input = classifier._preprocess(estimator.visualize(roi, keypoints), transpose=True)
+            inputs['pose_classification'].append(classifier_input.astype(np.float32))
+    finally:
+        detector.close()
+        estimator.close()
+        classifier.close()
+    return inputs
+
+
+def _box_iou(a: np.ndarray, b: np.ndarray) -> float:
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    intersection = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+def compare_outputs(kind: str, reference: list[np.ndarray], outputs: list[np.ndarray]) -> dict[str, float]:
+    """
+    원본 모델 출력 대비 다른 모델(INT8 모델, 다른 백엔드) 출력의 차이 (정답 라벨 대신 원본 모델 결과를 기준으로 사용)
+
+    Args:
+        kind (str): 모델 종류
+        reference (list[np.ndarray]): 원본 모델 출력
+        outputs (list[np.ndarray]): 비교할 모델 출력
+
+    Returns:
+        dict[str, float]: 모델 종류별 비교 지표
+            person_detection: 사람 검출 여부 일치율, 가장 높은 점수 상자의 평균 IoU
+            pose_estimation: 신뢰도가 높은 키 포인트의 평균 거리, PCK (PCK_THRESHOLD 이내 비율)
+            pose_classification: 분류 결과 일치율, 최대 점수 차이
+    """
+    if kind == 'person_detection':
+        agreement, ious = [], []
+        for ref, out in zip(reference, outputs):
+            ref = ref.reshape(-1, 7)
+            out = out.reshape(-1, 7)
+            ref = ref[ref[:, 2] > DETECTION_THRESHOLD]
+            out = out[out[:, 2] > DETECTION_THRESHOLD]
+            agreement.append((len(ref) > 0) == (len(out) > 0))
+            if len(ref) and len(out):
+                ious.append(_box_iou(ref[ref[:, 2].argmax(), 3:7], out[out[:, 2].argmax(), 3:7]))
+        return {'detection_agreement': float(np.mean(agreement)),
+                'top_box_iou': float(np.mean(ious)) if ious else float('nan')}
+
+    if kind == 'pose_estimation':
+        distances = []
+        for ref, out in zip(reference, outputs):
+            ref = ref.reshape(17, 3)
+            out = out.reshape(17, 3)
+            visible = ref[:, 2] > KEYPOINT_THRESHOLD
+            distances.extend(np.linalg.norm(ref[visible, :2] - out[visible, :2], axis=1).tolist())
+        distances = np.array(distances)
+        return {'keypoint_distance': float(distances.mean()) if len(distances) else float('nan'),
+                'pck': float((distances < PCK_THRESHOLD).mean()) if len(distances) else float('nan')}
+
+    reference = np.concatenate([ref.reshape(1, -1) for ref in reference])
+    outputs = np.concatenate([out.reshape(1, -1) for out in outputs])
+    return {'class_agreement': float((reference.argmax(axis=1) == outputs.argmax(axis=1)).mean()),
+            'max_score_delta': float(np.abs(reference - outputs).max())}
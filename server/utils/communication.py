@@ -12,7 +12,7 @@ import socket
 from typing import Any
 from queue import Queue
 
-from utils.thread import ImageReceiveThread, MessageReceiveThread
+from utils.thread import MESSAGE_DELIMITER, ImageReceiveThread, MessageReceiveThread
 
 
 # 설정 가져오기
@@ -29,17 +29,25 @@ CLIENT1_MESSAGE_PORT = int(config['client1']['msg_port'])
 CLIENT2_IP = config['client2']['ip']
 CLIENT2_REMOTE_PORT = int(config['client2']['remote_port'])
 CLIENT2_MESSAGE_PORT = int(config['client2']['msg_port'])
+CLIENT2_IMAGE_PORT = int(config['client2']['img_port'])
+CLIENT2_MODE = config['client2']['mode']
+
+CLIENT2_MODES = ('local', 'stream')  # local: client2가 바벨 검출, stream: client2는 프레임만 전송하고 서버가 검출
+if CLIENT2_MODE not in CLIENT2_MODES:
+    raise ValueError(f'Unknown client2 mode: {CLIENT2_MODE} (expected one of {CLIENT2_MODES})')
 
 
 class MessageSender:
     """
     클라이언트로 메시지를 전송하는 클래스
+    여러 쓰레드(추론, 부하 조절, 왕복 시간 측정)에서 호출하므로 전송은 잠금으로 보호합니다.
 
     Args:
         client_socket (socket.socket): 클라이언트 소켓
     """
     def __init__(self, client_socket: socket.socket):
         self._socket = client_socket
+        self._lock = threading.Lock()
     
     def __del__(self):
         self._socket.close()
@@ -49,9 +57,11 @@ class MessageSender:
         메시지 전송
 
         Args:
-            message (str): 전송할 메시지
+            message (str): 전송할 메시지 (구분자는 붙여서 전송)
         """
-        self._socket.sendall(message.encode('utf-8'))
+        data = message.encode('utf-8') + MESSAGE_DELIMITER
+        with self._lock:
+            self._socket.sendall(data)
 
 
 def remote_start():
@@ -94,9 +104,15 @@ def accept_connection(
         image_receive_thread = ImageReceiveThread(client_socket, receive_queue)
         return_dict[key] = (image_receive_thread, receive_queue)
     elif key == 'Client1 Message':
-        return_dict[key] = MessageSender(client_socket)
+        # 같은 소켓으로 클라이언트의 응답(pong)도 수신
+        return_dict[key] = (MessageSender(client_socket), MessageReceiveThread(client_socket))
+    elif key == 'Client2 Image':
+        receive_queue = Queue()
+        image_receive_thread = ImageReceiveThread(client_socket, receive_queue, client='client2')
+        return_dict[key] = (image_receive_thread, receive_queue)
     elif key == 'Client2 Message':
-        return_dict[key] = MessageReceiveThread(client_socket)
+        # stream 모드에서는 같은 소켓으로 부저 명령도 전송
+        return_dict[key] = (MessageSender(client_socket), MessageReceiveThread(client_socket))
     else:
         raise ValueError(f'Invalid key: {key}')
 
@@ -110,6 +126,8 @@ def init_communication(return_dict: dict):
         (CLIENT1_MESSAGE_PORT, 'Client1 Message'),
         (CLIENT2_MESSAGE_PORT, 'Client2 Message')
     ]
+    if CLIENT2_MODE == 'stream':
+        ports.append((CLIENT2_IMAGE_PORT, 'Client2 Image'))
 
     # 통신 쓰레드 생성
     temp_threads = []
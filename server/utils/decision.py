@@ -0,0 +1,266 @@
+"""
+경고 판단 모듈
+
+모델 호출과 분리된 순수 상태 머신으로, 분류 결과와 시간만으로 경고 발생/해제를 판단합니다.
+시계를 주입할 수 있으므로 기록된 분류 결과로 실시간보다 빠르게 재현할 수 있습니다.
+"""
+import configparser
+import time
+from collections import deque
+from typing import Callable
+
+import numpy as np
+
+
+# 설정 가져오기
+__config = configparser.ConfigParser()
+__config.read('config.ini')
+
+POSE_THRESHOLD = float(__config['inference']['pose_threshold'])
+PULL_STATE_DURATION = int(__config['inference']['pull_state_duration'])
+INITIAL_FRAME_IGNORE = int(__config['inference']['initial_frame_ignore'])
+DETECTION_FRAME_THRESHOLD = int(__config['inference']['detection_frame_threshold'])
+HISTORY_LENGTH = int(__config['inference']['history_length'])
+LOW_CONFIDENCE_LIMIT = 5  # 연속으로 신뢰도가 낮으면 unknown 상태로 바꾸는 프레임 수
+
+# 경고 전환 이벤트
+EVENT_NONE = 0
+EVENT_SET_WARNING = 1
+EVENT_RESET_WARNING = 2
+
+
+class InferenceState:
+    """
+    추론 상태를 관리하는 클래스
+
+    Args:
+        history_length (int): 결과 히스토리 및 신뢰도 히스토리의 버퍼 크기
+    """
+    def __init__(self, history_length: int = HISTORY_LENGTH):
+        self.selected_index = 2  # 마지막으로 선택된 상태(0: pull, 1: push, 2: unknown)
+        self.result_history = deque(maxlen=history_length)  # 최근 N개의 결과를 저장할 deque
+        self.conf_history = deque(maxlen=history_length)  # 최근 N개의 신뢰도를 저장할 deque
+        self.pull_start_time = None  # 'pull' 상태가 시작된 시간을 기록
+        self.warning_active = False  # 경고 상태 여부
+        self.last_warning_time = None  # 마지막으로 메시지를 보낸 시간
+        self.person_detected_frame_count = 0  # 사람이 감지된 프레임 수
+        self.low_confidence_count = 0  # 신뢰도가 낮은 프레임 수
+        self.person_detected = False  # 사람이 감지되었는지 여부
+
+        # 마지막 프레임의 추론 결과 (기록용)
+        self.frame_index = -1  # 프레임 번호
+        self.timestamp = None  # 추론 시간
+        self.boxes = None  # 감지된 사람의 경계 상자
+        self.box_scores = None  # 경계 상자 점수
+        self.keypoints = None  # 키 포인트
+        self.class_scores = None  # 자세 분류 점수
+        self.predicted_index = None  # 자세 분류 결과 (자세 추론을 하지 않은 경우 None)
+        self.confidence = None  # 자세 분류 신뢰도
+        self.event = EVENT_NONE  # 경고 전환 이벤트
+
+    def begin_frame(self, timestamp: float):
+        """
+        새 프레임 추론 시작 시 마지막 프레임 결과 초기화
+
+        Args:
+            timestamp (float): 프레임 추론 시간
+        """
+        self.frame_index += 1
+        self.timestamp = timestamp
+        self.boxes = None
+        self.box_scores = None
+        self.keypoints = None
+        self.class_scores = None
+        self.predicted_index = None
+        self.confidence = None
+        self.event = EVENT_NONE
+
+    def reset_state(self):
+        """
+        상태 초기화
+        """
+        self.warning_active = False
+        self.person_detected_frame_count = 0
+        self.pull_start_time = None
+        self.result_history.clear()
+        self.conf_history.clear()
+        self.selected_index = 2
+
+
+def median_index(history) -> int:
+    """
+    결과 히스토리의 중간값 (int(np.median(history))와 같은 값)
+
+    Args:
+        history (Iterable[int]): 결과 히스토리
+
+    Returns:
+        int: 중간값
+    """
+    values = sorted(history)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return int(values[middle])
+    # 짝수 개인 경우 가운데 두 값의 평균을 버림
+    return int((values[middle - 1] + values[middle]) / 2)
+
+
+class DecisionEngine:
+    """
+    분류 결과로 경고 발생/해제를 판단하는 상태 머신
+    모델을 호출하지 않으며, 시간은 state.timestamp(프레임 시작 시 clock으로 읽은 값)만 사용합니다.
+
+    Args:
+        pose_threshold (float): 자세 분류 신뢰도 임계값
+        history_length (int): 중간값 필터링에 사용할 결과 수
+        detection_frame_threshold (int): 포즈 측정을 활성화하기 위해 필요한 프레임 수
+        pull_state_duration (float): 경고를 발생시키는 'pull' 상태 유지 시간(초)
+        low_confidence_limit (int): unknown 상태로 바꾸는 연속 저신뢰도 프레임 수
+        clock (Callable[[], float]): 현재 시간을 반환하는 함수
+    """
+    def __init__(self,
+                 pose_threshold: float = POSE_THRESHOLD,
+                 history_length: int = HISTORY_LENGTH,
+                 detection_frame_threshold: int = DETECTION_FRAME_THRESHOLD,
+                 pull_state_duration: float = PULL_STATE_DURATION,
+                 low_confidence_limit: int = LOW_CONFIDENCE_LIMIT,
+                 clock: Callable[[], float] = time.time):
+        self.pose_threshold = pose_threshold
+        self.history_length = history_length
+        self.detection_frame_threshold = detection_frame_threshold
+        self.pull_state_duration = pull_state_duration
+        self.low_confidence_limit = low_confidence_limit
+        self.clock = clock
+
+    def create_state(self) -> InferenceState:
+        """
+        이 엔진의 설정에 맞는 상태 객체 생성
+
+        Returns:
+            InferenceState: 상태 객체
+        """
+        return InferenceState(self.history_length)
+
+    def begin_frame(self, state: InferenceState):
+        """
+        새 프레임 시작 (시계를 한 번만 읽어 프레임 시간으로 사용)
+
+        Args:
+            state (InferenceState): 상태 객체
+        """
+        state.begin_frame(self.clock())
+
+    def update_detection(self, state: InferenceState, person_detected: bool) -> bool:
+        """
+        사람 감지 결과로 상태 갱신
+
+        Args:
+            state (InferenceState): 상태 객체
+            person_detected (bool): 사람 감지 여부
+
+        Returns:
+            bool: 자세 추론이 필요한지 여부
+        """
+        state.person_detected = person_detected
+
+        # 사람이 감지되면
+        if person_detected:
+            state.person_detected_frame_count += 1
+            # detection_frame_threshold만큼 프레임 소모 후 포즈 측정 활성화
+            return state.person_detected_frame_count > self.detection_frame_threshold
+
+        # 사람이 감지되지 않으면 변수 초기화
+        if state.warning_active:
+            state.event = EVENT_RESET_WARNING
+        state.reset_state()
+        return False
+
+    def update_pose(self, state: InferenceState, predicted_index: int, confidence: float):
+        """
+        자세 분류 결과로 상태 갱신
+
+        Args:
+            state (InferenceState): 상태 객체
+            predicted_index (int): 자세 분류 결과
+            confidence (float): 자세 분류 신뢰도
+        """
+        # 결과의 신뢰도가 pose_threshold를 넘은 경우
+        if confidence > self.pose_threshold:
+            # 결과와 신뢰도를 기록
+            state.result_history.append(predicted_index)
+            state.conf_history.append(confidence)
+
+            # result_history.maxlen 주기로 중간값 필터링
+            if len(state.result_history) == state.result_history.maxlen:
+                state.selected_index = median_index(state.result_history)
+
+            # pull동작인 경우 _update_pull_state활성화
+            if state.selected_index == 0:
+                self._update_pull_state(state)
+            # 그 외의 동작은 pull동작 변수 초기화
+            else:
+                state.pull_start_time = None
+
+            # 신뢰도 낮은 프레임 수 초기화
+            state.low_confidence_count = 0
+
+        # 신뢰도가 pose_threshold보다 낮은 경우
+        else:
+            state.low_confidence_count += 1
+            # 연속으로 low_confidence_limit번 낮은 결과가 나오면 unknown 상태
+            if state.low_confidence_count >= self.low_confidence_limit:
+                state.selected_index = 2  # unknown
+                state.low_confidence_count = 0
+
+    def _update_pull_state(self, state: InferenceState):
+        """
+        'pull' 상태를 처리하는 내부 함수
+
+        Args:
+            state (InferenceState): 상태 객체
+        """
+        if state.pull_start_time is None:
+            state.pull_start_time = state.timestamp
+
+        elapsed_time = state.timestamp - state.pull_start_time
+        # pull_state_duration만큼의 시간동안 pull상태가 지속되는 경우
+        if elapsed_time > self.pull_state_duration:
+            if not state.warning_active:
+                state.event = EVENT_SET_WARNING
+            state.warning_active = True # warning 활성화
+            state.pull_start_time = None
+
+
+def replay(records: np.ndarray, engine: DecisionEngine = None) -> list[tuple[int, float, int]]:
+    """
+    기록된 추론 결과(RECORD_DTYPE 레코드 배열)로 상태 머신을 재현하는 함수
+    기록 시간을 시계로 사용하므로 실시간보다 훨씬 빠르게 실행됩니다.
+
+    Args:
+        records (np.ndarray): 추론 기록 레코드 배열
+        engine (DecisionEngine, optional): 판단 엔진 (기본값: config.ini 설정)
+
+    Returns:
+        list[tuple[int, float, int]]: (프레임 번호, 시간, 이벤트) 목록
+    """
+    if engine is None:
+        engine = DecisionEngine()
+    state = engine.create_state()
+
+    # 레코드 필드 접근 비용을 줄이기 위해 열 단위로 변환
+    timestamps = records['timestamp'].tolist()
+    frame_indexes = records['frame_index'].tolist()
+    person_detected = records['person_detected'].astype(bool).tolist()
+    pose_inferred = records['pose_inferred'].astype(bool).tolist()
+    predicted_indexes = records['predicted_index'].tolist()
+    confidences = records['confidence'].tolist()
+
+    events = []
+    for i in range(len(timestamps)):
+        state.begin_frame(timestamps[i])
+        if engine.update_detection(state, person_detected[i]) and pose_inferred[i]:
+            engine.update_pose(state, predicted_indexes[i], confidences[i])
+        if state.event != EVENT_NONE:
+            events.append((frame_indexes[i], timestamps[i], state.event))
+
+    return events
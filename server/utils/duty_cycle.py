@@ -0,0 +1,144 @@
+"""
+클라이언트 촬영 FPS 조절 모듈
+
+InferenceState로 벤치의 상황을 판단하여 클라이언트에 촬영/전송 FPS를 요청합니다.
+    idle: 사람이 감지되지 않음 - 낮은 FPS
+    warm-up: 사람이 감지되었지만 detection_frame_threshold 프레임이 지나지 않음 - 중간 FPS
+    active: 자세 추론 중이거나 'pull' 상태/경고 중 - 최대 FPS
+FPS를 올리는 변경은 바로 요청하고, 내리는 변경은 낮은 단계가 downshift_seconds 동안 유지된 후 요청합니다.
+부하 조절(utils.load_shedding)의 FPS 제한이 있으면 두 값 중 낮은 FPS를 요청합니다.
+"""
+import configparser
+import threading
+import time
+from typing import Callable
+
+from utils import metrics
+from utils.decision import InferenceState
+
+
+# 설정 가져오기
+__config = configparser.ConfigParser()
+__config.read('config.ini')
+
+DUTY_CYCLE_ENABLED = __config['duty_cycle'].getboolean('enabled')
+DUTY_CYCLE_IDLE_FPS = int(__config['duty_cycle']['idle_fps'])
+DUTY_CYCLE_WARMUP_FPS = int(__config['duty_cycle']['warmup_fps'])
+DUTY_CYCLE_ACTIVE_FPS = int(__config['duty_cycle']['active_fps'])
+DUTY_CYCLE_DOWNSHIFT_SECONDS = float(__config['duty_cycle']['downshift_seconds'])
+
+# 단계
+PHASE_IDLE = 0
+PHASE_WARMUP = 1
+PHASE_ACTIVE = 2
+PHASE_NAMES = ['idle', 'warm-up', 'active']
+
+
+def capture_phase(state: InferenceState, detection_frame_threshold: int) -> int:
+    """
+    상태에 맞는 촬영 단계
+
+    Args:
+        state (InferenceState): 상태 객체
+        detection_frame_threshold (int): 자세 추론을 시작하는 연속 감지 프레임 수 (DecisionEngine)
+
+    Returns:
+        int: PHASE_IDLE, PHASE_WARMUP, PHASE_ACTIVE
+    """
+    if state.warning_active or state.pull_start_time is not None:
+        return PHASE_ACTIVE
+    if not state.person_detected:
+        return PHASE_IDLE
+    if state.person_detected_frame_count > detection_frame_threshold:
+        return PHASE_ACTIVE
+    return PHASE_WARMUP
+
+
+def combine_fps(fps: int, limit: int) -> int:
+    """
+    요청 FPS와 FPS 제한 중 낮은 값 (0은 제한 없음)
+    """
+    if limit <= 0:
+        return fps
+    return limit if fps <= 0 else min(fps, limit)
+
+
+class CaptureRateController:
+    """
+    상태에 따라 클라이언트 촬영 FPS를 요청하는 클래스
+    추론 쓰레드(update)와 부하 조절(set_limit)에서 호출할 수 있습니다.
+
+    Args:
+        send (Callable[[str], None]): 클라이언트에 메시지를 전송하는 함수 ('fps N' 전송)
+        detection_frame_threshold (int): 자세 추론을 시작하는 연속 감지 프레임 수
+        name (str, optional): 지표에 사용할 클라이언트 이름
+        phase_fps (tuple): 단계별 FPS (idle, warm-up, active), 0은 제한 없음
+        downshift_seconds (float): 낮은 단계가 이 시간(초) 동안 유지되면 FPS를 내림
+        clock (Callable[[], float]): 현재 시간을 반환하는 함수
+    """
+    def __init__(self, send: Callable[[str], None], detection_frame_threshold: int, name: str = 'client1',
+                 phase_fps: tuple = (DUTY_CYCLE_IDLE_FPS, DUTY_CYCLE_WARMUP_FPS, DUTY_CYCLE_ACTIVE_FPS),
+                 downshift_seconds: float = DUTY_CYCLE_DOWNSHIFT_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.send = send
+        self.detection_frame_threshold = detection_frame_threshold
+        self.name = name
+        self.phase_fps = phase_fps
+        self.downshift_seconds = downshift_seconds
+        self.clock = clock
+
+        self.phase = None           # 현재 단계 (처음 update 전에는 None)
+        self.limit = 0              # 부하 조절의 FPS 제한 (0: 제한 없음)
+        self._lower_since = None    # 낮은 단계가 시작된 시간
+        self._requested = None      # 마지막으로 요청한 FPS
+        self._lock = threading.Lock()
+
+        # 지표
+        self._requested_fps = metrics.client_requested_fps.labels(name)
+
+    def update(self, state: InferenceState):
+        """
+        프레임 추론 후 상태로 단계 갱신 (FPS가 바뀌면 클라이언트에 요청)
+
+        Args:
+            state (InferenceState): 상태 객체
+        """
+        phase = capture_phase(state, self.detection_frame_threshold)
+        with self._lock:
+            if self.phase is None or phase > self.phase:
+                self._set_phase(phase)
+            elif phase < self.phase:
+                now = self.clock()
+                if self._lower_since is None:
+                    self._lower_since = now
+                elif now - self._lower_since >= self.downshift_seconds:
+                    self._set_phase(phase)
+            else:
+                self._lower_since = None
+
+    def set_limit(self, fps: int):
+        """
+        부하 조절의 FPS 제한 변경
+
+        Args:
+            fps (int): 최대 FPS (0: 제한 없음)
+        """
+        with self._lock:
+            self.limit = fps
+            if self.phase is not None:
+                self._request()
+
+    def _set_phase(self, phase: int):
+        if phase != self.phase:
+            print(f'Capture phase of {self.name}: {PHASE_NAMES[phase]}')
+        self.phase = phase
+        self._lower_since = None
+        self._request()
+
+    def _request(self):
+        fps = combine_fps(self.phase_fps[self.phase], self.limit)
+        if fps == self._requested:
+            return
+        self._requested = fps
+        self._requested_fps.set(fps)
+        self.send(f'fps {fps}')
@@ -2,178 +2,449 @@
 자세 추론 모듈
 """
 import configparser
+import functools
+import os
 import time
-from collections import deque
+import weakref
+from concurrent.futures import Future
 
 import cv2
 import numpy as np
 
-from utils.model import PersonDetector, PoseClassifier, PoseEstimator
+from utils import metrics
+from utils.load_shedding import (LEVEL_DETECTOR_CADENCE, LEVEL_FAST_POSE, LEVEL_NORMAL,
+                                 LEVEL_SKIP_STATIC, SHED_DETECTOR_INTERVAL,
+                                 SHED_FAST_POSE_MODEL_PATH, SHED_MOTION_THRESHOLD,
+                                 keypoint_motion)
+from utils.backend import MODEL_BACKENDS
+from utils.decision import (DecisionEngine, InferenceState, EVENT_RESET_WARNING,
+                            EVENT_SET_WARNING)
+from utils.model import PersonDetector, PoseClassifier, PoseEstimator, select_model_path
+from utils.ov_config import model_config
+from utils.pipeline import PIPELINE_EXECUTORS, Pipeline, PipelineGraph, Stage, parse_executors
+from utils.pose_cache import POSE_CACHE_ENABLED, POSE_CACHE_MOTION_THRESHOLD, PoseClassCache
+from utils.trace import tracer
 
 
 # 설정 가져오기
 __config = configparser.ConfigParser()
 __config.read('config.ini')
 
-PERSON_DETECTION_MODEL_PATH = __config['model']['person_detection']
-POSE_ESTIMATION_MODEL_PATH = __config['model']['pose_estimation']
-POSE_CLASSIFICATION_MODEL_PATH = __config['model']['pose_classification']
+PERSON_DETECTION_MODEL_PATH = select_model_path(__config['model']['person_detection'],
+                                                __config['model']['person_detection_precision'])
+POSE_ESTIMATION_MODEL_PATH = select_model_path(__config['model']['pose_estimation'],
+                                               __config['model']['pose_estimation_precision'])
+POSE_CLASSIFICATION_MODEL_PATH = select_model_path(__config['model']['pose_classification'],
+                                                   __config['model']['pose_classification_precision'])
 
-POSE_THRESHOLD = float(__config['inference']['pose_threshold'])
-PULL_STATE_DURATION = int(__config['inference']['pull_state_duration'])
-INITIAL_FRAME_IGNORE = int(__config['inference']['initial_frame_ignore'])
-DETECTION_FRAME_THRESHOLD = int(__config['inference']['detection_frame_threshold'])
-HISTORY_LENGTH = int(__config['inference']['history_length'])
+# 사람이 검출되지 않은 검출 결과 (boxes, scores, labels)
+NO_DETECTIONS = (np.zeros((0, 4)), np.array([]), np.array([]))
 
+# 상태를 갱신하고 그 결과를 사용하는 단계 (decide=False이면 그래프에서 뺌)
+DECISION_STAGES = ('decide', 'alert', 'record')
 
-class InferenceState:
+
+class _ShedCache:
     """
-    추론 상태를 관리하는 클래스
+    부하 조절 단계, 움직임 판단, 자세 추론 여부 판단에서 재사용할 상태별 마지막 추론 결과
     """
     def __init__(self):
-        self.selected_index = 2  # 마지막으로 선택된 상태(0: pull, 1: push, 2: unknown)
-        self.result_history = deque(maxlen=HISTORY_LENGTH)  # 최근 N개의 결과를 저장할 deque
-        self.conf_history = deque(maxlen=HISTORY_LENGTH)  # 최근 N개의 신뢰도를 저장할 deque
-        self.pull_start_time = None  # 'pull' 상태가 시작된 시간을 기록
-        self.warning_active = False  # 경고 상태 여부
-        self.last_warning_time = None  # 마지막으로 메시지를 보낸 시간
-        self.person_detected_frame_count = 0  # 사람이 감지된 프레임 수
-        self.low_confidence_count = 0  # 신뢰도가 낮은 프레임 수
-        self.person_detected = False  # 사람이 감지되었는지 여부
-    
-    def reset_state(self):
-        """
-        상태 초기화
-        """
-        self.warning_active = False
-        self.person_detected_frame_count = 0
-        self.pull_start_time = None
-        self.result_history.clear()
-        self.conf_history.clear()
-        self.selected_index = 2
+        self.detections = None  # 마지막 사람 검출 결과
+        self.frames_since_detection = 0  # 마지막 사람 검출 이후 프레임 수
+        self.keypoints = None  # 마지막으로 자세 분류한 키 포인트
+        self.class_scores = None  # 마지막 자세 분류 점수
+        self.detected_frames = 0  # 연속으로 사람이 감지된 프레임 수 (gate 단계)
 
 
 class Inferencer:
     """
     자세 추론을 위한 클래스
+
+    Args:
+        engine (DecisionEngine, optional): 경고 판단 엔진 (기본값: config.ini 설정)
+        name (str, optional): 지표에 사용할 클라이언트 이름
+        max_batch_size (int, optional): 사람 검출 모델의 최대 배치 크기 (여러 카메라의 프레임을 묶어서 검출할 때)
+        decide (bool, optional): False이면 decide/alert/record 단계를 빼고 분류 결과까지만 계산
+            (여러 스트림의 상태를 utils.state_store로 한 번에 갱신할 때)
     """
-    def __init__(self):
-        self.person_detector = PersonDetector(PERSON_DETECTION_MODEL_PATH)
-        self.pose_estimator = PoseEstimator(POSE_ESTIMATION_MODEL_PATH)
-        self.pose_classifier = PoseClassifier(POSE_CLASSIFICATION_MODEL_PATH)
+    def __init__(self, engine: DecisionEngine = None, name: str = 'client1', max_batch_size: int = 1,
+                 decide: bool = True):
+        self.engine = engine if engine is not None else DecisionEngine()
+        self.person_detector = PersonDetector(PERSON_DETECTION_MODEL_PATH, max_batch_size=max_batch_size,
+                                              config=model_config('person_detection'),
+                                              backend=MODEL_BACKENDS['person_detection'])
+        self.pose_estimator = PoseEstimator(POSE_ESTIMATION_MODEL_PATH, config=model_config('pose_estimation'),
+                                            backend=MODEL_BACKENDS['pose_estimation'])
+        self.pose_classifier = PoseClassifier(POSE_CLASSIFICATION_MODEL_PATH,
+                                              config=model_config('pose_classification'),
+                                              backend=MODEL_BACKENDS['pose_classification'])
 
         self.on_set_warning = self._default_callback
         self.on_reset_warning = self._default_callback
+        self.record_log = None  # 프레임별 추론 기록 (InferenceLogWriter)
+
+        # 부하 조절 (utils.load_shedding 단계)
+        self.shed_level = LEVEL_NORMAL
+        self.fast_pose_estimator = None  # 빠른 자세 추정 모델 (처음 필요할 때 로드)
+        self._shed_cache = weakref.WeakKeyDictionary()  # state -> _ShedCache (상태 객체가 사라지면 함께 제거)
+
+        # 자세 분류 결과 캐시 (양자화한 키 포인트가 같으면 분류 생략)
+        self.pose_cache = PoseClassCache(name=name) if POSE_CACHE_ENABLED else None
+
+        # 지표 (레이블 조회를 프레임마다 반복하지 않도록 미리 가져옴)
+        self._frames_inferred = metrics.frames_inferred.labels(name)
+        self._inference_latency = metrics.stage_latency.labels(name, 'inference')
+        self._detector_latency = metrics.model_latency.labels(name, 'PersonDetector')
+        self._batch_detector_latency = metrics.model_latency.labels(name, 'PersonDetector.batch')
+        self._estimator_latency = metrics.model_latency.labels(name, 'PoseEstimator')
+        self._classifier_latency = metrics.model_latency.labels(name, 'PoseClassifier')
+        self._fast_estimator_latency = metrics.model_latency.labels(name, 'PoseEstimator.fast')
+        self._motion_skips = metrics.pose_motion_skips.labels(name)
+
+        # 단계 그래프 (config.ini [pipeline] executors로 단계별 실행기 지정)
+        graph = self._build_graph()
+        executors = parse_executors(PIPELINE_EXECUTORS)
+        if not decide:
+            graph = PipelineGraph([stage for stage in graph.stages if stage.name not in DECISION_STAGES],
+                                  graph.sources)
+            executors = {stage: executor for stage, executor in executors.items() if stage not in DECISION_STAGES}
+        graph.configure(executors)
+        self.pipeline = Pipeline(graph, name)
     
     def _default_callback(self):
         pass
 
-    def inference(self, frame: np.ndarray, state: InferenceState):
+    def close(self):
+        """
+        파이프라인 종료 후 모델의 세션 반환 (컴파일된 모델은 다른 Inferencer와 공유하므로 유지)
+        """
+        self.pipeline.stop()
+        self.person_detector.close()
+        self.pose_estimator.close()
+        self.pose_classifier.close()
+        if self.fast_pose_estimator is not None:
+            self.fast_pose_estimator.close()
+
+    def _get_shed_cache(self, state: InferenceState) -> _ShedCache:
+        cache = self._shed_cache.get(state)
+        if cache is None:
+            cache = self._shed_cache.setdefault(state, _ShedCache())
+        return cache
+
+    def _get_pose_estimator(self) -> tuple:
+        """
+        부하 조절 단계에 맞는 자세 추정 모델과 지연 시간 지표
+        빠른 모델 파일이 없으면 기존 모델을 사용합니다.
+        """
+        if self.shed_level >= LEVEL_FAST_POSE and os.path.exists(SHED_FAST_POSE_MODEL_PATH):
+            if self.fast_pose_estimator is None:
+                self.fast_pose_estimator = PoseEstimator(SHED_FAST_POSE_MODEL_PATH,
+                                                         config=model_config('pose_estimation'),
+                                                         backend=MODEL_BACKENDS['pose_estimation'])
+            return self.fast_pose_estimator, self._fast_estimator_latency
+        return self.pose_estimator, self._estimator_latency
+
+    def inference(self, frame: np.ndarray, state: InferenceState, detections: tuple = None) -> dict:
         """
         입력된 이미지를 추론하는 함수
 
         Args:
             frame (numpy.ndarray): 비디오 프레임
             state (InferenceState): 상태를 관리하는 객체
+            detections (tuple, optional): 미리 계산한 사람 검출 결과 (predict_batch 결과의 한 항목)
+
+        Returns:
+            dict: 단계 출력이 담긴 프레임 컨텍스트
         """
-        # 사람 감지
-        boxes, scores, labels = self.person_detector.predict(frame)
-        state.person_detected = len(boxes) > 0
+        with self._inference_latency.time():
+            context = self.pipeline.run(self._context(frame, state, detections))
+        self._frames_inferred.inc()
+        return context
 
-        # 사람이 감지되면
-        if state.person_detected:
-            state.person_detected_frame_count += 1
-            # detection_frame_threshold만큼 프레임 소모 후 포즈 측정 활성화
-            if state.person_detected_frame_count > DETECTION_FRAME_THRESHOLD:
-                self._inference_pose(frame, boxes, state)
+    def inference_vacant(self, state: InferenceState) -> dict:
+        """
+        클라이언트의 엣지 필터가 사람이 없다고 알린 경우 이미지 없이 사람이 감지되지 않은 프레임으로 상태 갱신
+        (detect 단계는 검출 결과가 이미 있으므로 건너뛰고, decide 이후 단계만 실행)
 
-        # 사람이 감지되지 않으면 변수 초기화
-        else:
-            if state.warning_active:
-                self.on_reset_warning()
-            state.reset_state() 
+        Args:
+            state (InferenceState): 상태를 관리하는 객체
 
-    def _crop_roi(self, frame: np.ndarray, boxes: np.ndarray, padding: int = 0):
+        Returns:
+            dict: 단계 출력이 담긴 프레임 컨텍스트
+        """
+        context = self.pipeline.run(self._context(None, state, NO_DETECTIONS))
+        self._frames_inferred.inc()
+        return context
+
+    def start(self, on_complete=None):
         """
-        사람 영역만 크롭하는 함수
-        
+        단계별 쓰레드로 여러 프레임을 겹쳐서 추론하는 pipelined 실행 시작 (이후 submit으로 프레임 추가)
+
         Args:
-            frame (numpy.ndarray): 비디오 프레임
-            boxes (list): 감지된 객체의 경계 상자 리스트
-            padding (int, optional): 경계 상자에 추가할 여백
+            on_complete (Callable[[dict], None], optional): 프레임 추론이 끝날 때마다 프레임 컨텍스트로 호출
+                (frame_id, enqueue_ns 등 submit에 전달한 값과 단계 출력, 실패 시 'error' 포함)
+        """
+        def complete(context: dict):
+            self._inference_latency.observe((time.perf_counter_ns() - context['submit_ns']) / 1e9)
+            self._frames_inferred.inc()
+            if 'error' in context:
+                print(f'Inference failed in {context["error_stage"]}: {context["error"]!r}')
+            if on_complete is not None:
+                on_complete(context)
 
-        Returns:
-            numpy.ndarray: 크롭된 ROI(관심 영역)
-        """
-        height, width, _ = frame.shape
-        x1, y1, x2, y2 = list(map(int, boxes[0]))
-        x1 = max(0, x1 - padding)
-        y1 = max(0, y1 - padding)
-        x2 = min(width, x2 + padding)
-        y2 = min(height, y2 + padding)
-        roi = frame[y1:y2, x1:x2]
-        return roi
-    
-    def _inference_pose(self, frame: np.ndarray, boxes: np.ndarray, state: InferenceState):
+        self.pipeline.start(complete)
+
+    def submit(self, frame: np.ndarray, state: InferenceState, **extra):
         """
-        포즈를 처리하는 내부 함수
+        pipelined 실행에 프레임 추가 (첫 단계의 큐가 가득 차면 기다림)
 
         Args:
-            frame (numpy.ndarray): 비디오 프레임
-            boxes (list): 감지된 객체의 경계 상자 리스트
+            frame (numpy.ndarray): 비디오 프레임 (None: 사람 없음 알림, inference_vacant와 같음)
             state (InferenceState): 상태를 관리하는 객체
+            **extra: 컨텍스트에 함께 넣을 값 (frame_id, enqueue_ns 등)
         """
-        # 관심 영역(ROI) 크롭
-        roi = self._crop_roi(frame, boxes, 10)
+        context = self._context(frame, state, NO_DETECTIONS if frame is None else None)
+        context.update(extra)
+        context['submit_ns'] = time.perf_counter_ns()
+        self.pipeline.submit(context)
 
-        # ROI내에서 포즈 추정 이미지 추출
-        skeleton_image = self.pose_estimator.predict(roi)
+    def _context(self, frame: np.ndarray, state: InferenceState, detections: tuple = None) -> dict:
+        """
+        파이프라인에 넣을 프레임 컨텍스트 (프레임 시간은 넣을 때 한 번만 읽음)
+        """
+        return {'frame': frame, 'state': state, 'timestamp': self.engine.clock(), 'detections': detections}
 
-        # 추출한 포즈 추정 이미지로 포즈 분류
-        predicted_index, confidence = self.pose_classifier.predict(skeleton_image)
+    def detect_batch(self, frames: list[np.ndarray]) -> list[tuple]:
+        """
+        여러 프레임의 사람 검출을 한 번의 추론으로 수행 (결과는 inference()의 detections로 전달)
 
-        # 결과의 신뢰도가 pose_threshold를 넘은 경우
-        if confidence > POSE_THRESHOLD:
-            # 결과와 신뢰도를 기록
-            state.result_history.append(predicted_index)
-            state.conf_history.append(confidence)
+        Args:
+            frames (list[numpy.ndarray]): 비디오 프레임 목록
 
-            # result_history.maxlen 주기로 중간값 필터링
-            if len(state.result_history) == state.result_history.maxlen:
-                state.selected_index = int(np.median(state.result_history))
+        Returns:
+            list[tuple]: 프레임별 (boxes, scores, labels)
+        """
+        if len(frames) == 1:
+            with self._detector_latency.time():
+                return [self.person_detector.predict(frames[0])]
+        with self._batch_detector_latency.time():
+            return self.person_detector.predict_batch(frames)
 
-            # pull동작인 경우 _handle_pull_state활성화
-            if state.selected_index == 0:
-                self._handle_pull_state(state)
-            # 그 외의 동작은 pull동작 변수 초기화
-            else:
-                state.pull_start_time = None
+    def _build_graph(self) -> PipelineGraph:
+        """
+        기본 단계 그래프
+            detect: 사람 검출 (부하 조절 중에는 일정 간격으로만 검출)
+            gate: 사람이 detection_frame_threshold 프레임 넘게 감지되면 경계 상자 전달
+            crop: ROI 크롭
+            pose: 키 포인트 추정
+            skeleton: 움직임이 적거나 캐시에 있으면 이전 분류 점수, 아니면 skeleton 이미지
+            classify: 자세 분류
+            decide: 프레임 결과로 상태 갱신 (상태는 이 단계에서만 바꿈)
+            alert: 경고 전환 이벤트 전달
+            record: 프레임별 추론 기록
+        """
+        return PipelineGraph([
+            Stage('detect', self._stage_detect, ('frame', 'state'), ('detections',),
+                  async_function=self._stage_detect_async, thread_safe=False),
+            Stage('gate', self._stage_gate, ('state', 'detections'), ('boxes',)),
+            Stage('crop', functools.partial(crop_roi, padding=10), ('frame', 'boxes'), ('roi',)),
+            Stage('pose', self._stage_pose, ('roi',), ('keypoints',),
+                  async_function=self._stage_pose_async, thread_safe=False),
+            Stage('skeleton', self._stage_skeleton, ('state', 'roi', 'keypoints'),
+                  ('skeleton', 'pose_key', 'class_scores'), thread_safe=False),
+            Stage('classify', self._stage_classify, ('state', 'keypoints', 'skeleton', 'pose_key?'),
+                  ('class_scores',), thread_safe=False),
+            Stage('decide', self._stage_decide, ('state', 'timestamp', 'detections', 'keypoints?', 'class_scores?'),
+                  ('event',), thread_safe=False),
+            Stage('alert', self._stage_alert, ('event',)),
+            Stage('record', self._stage_record, ('state', 'event')),
+        ], sources=('frame', 'state', 'timestamp', 'detections'))
 
-            # 신뢰도 낮은 프레임 수 초기화
-            state.low_confidence_count = 0
+    def _stage_detect(self, frame: np.ndarray, state: InferenceState) -> tuple:
+        """
+        사람 감지 (부하 조절 중에는 detector_interval 프레임마다 검출하고 그 사이에는 이전 결과 재사용)
+        """
+        cache = self._get_shed_cache(state)
+        if (self.shed_level >= LEVEL_DETECTOR_CADENCE and cache.detections is not None
+                and cache.frames_since_detection < SHED_DETECTOR_INTERVAL - 1):
+            cache.frames_since_detection += 1
+            return cache.detections
+        with self._detector_latency.time():
+            detections = self.person_detector.predict(frame)
+        cache.detections = detections
+        cache.frames_since_detection = 0
+        return detections
+
+    def _stage_detect_async(self, frame: np.ndarray, state: InferenceState) -> Future:
+        cache = self._get_shed_cache(state)
+        if (self.shed_level >= LEVEL_DETECTOR_CADENCE and cache.detections is not None
+                and cache.frames_since_detection < SHED_DETECTOR_INTERVAL - 1):
+            cache.frames_since_detection += 1
+            future = Future()
+            future.set_result(cache.detections)
+            return future
+        # 이후 프레임은 검출이 끝나기 전에 시작하므로 검출 간격은 시작한 프레임 기준으로 계산
+        cache.frames_since_detection = 0
+        start = time.perf_counter_ns()
+        future = self.person_detector.predict_async(frame)
+
+        def done(completed: Future):
+            self._detector_latency.observe((time.perf_counter_ns() - start) / 1e9)
+            if completed.exception() is None:
+                cache.detections = completed.result()
+
+        future.add_done_callback(done)
+        return future
+
+    def _stage_gate(self, state: InferenceState, detections: tuple) -> np.ndarray:
+        """
+        사람이 감지되고 detection_frame_threshold만큼 프레임이 지나면 경계 상자 전달 (자세 추론 필요)
+        DecisionEngine.update_detection과 같은 규칙으로 연속 감지 프레임 수를 따로 세므로
+        decide 단계에서 상태를 갱신하기 전에 판단할 수 있습니다.
+        사람이 감지되지 않으면 이전 사람의 검출/분류 결과를 다음 사람에게 재사용하지 않도록 지웁니다.
+        """
+        boxes = detections[0]
+        cache = self._get_shed_cache(state)
+        if len(boxes) == 0:
+            cache.detected_frames = 0
+            cache.detections = None
+            cache.keypoints = None
+            cache.class_scores = None
+            return None
+        cache.detected_frames += 1
+        return boxes if cache.detected_frames > self.engine.detection_frame_threshold else None
+
+    def _stage_pose(self, roi: np.ndarray) -> np.ndarray:
+        """
+        ROI내에서 키 포인트 추정
+        """
+        pose_estimator, estimator_latency = self._get_pose_estimator()
+        with estimator_latency.time():
+            return pose_estimator.estimate(roi)
 
-        # 신뢰도가 pose_threshold보다 낮은 경우
+    def _stage_pose_async(self, roi: np.ndarray) -> Future:
+        pose_estimator, estimator_latency = self._get_pose_estimator()
+        start = time.perf_counter_ns()
+        future = pose_estimator.estimate_async(roi)
+        future.add_done_callback(lambda _: estimator_latency.observe((time.perf_counter_ns() - start) / 1e9))
+        return future
+
+    def _stage_skeleton(self, state: InferenceState, roi: np.ndarray, keypoints: np.ndarray) -> dict:
+        """
+        분류할 skeleton 이미지 생성
+        마지막으로 분류한 프레임보다 움직임이 적거나 (부하 조절 중에는 더 큰 임계값 사용)
+        자세 분류 결과 캐시에 같은 키가 있으면 이미지 대신 저장된 점수 반환
+        """
+        cache = self._get_shed_cache(state)
+        if self.shed_level >= LEVEL_SKIP_STATIC:
+            motion_threshold = SHED_MOTION_THRESHOLD
         else:
-            state.low_confidence_count += 1
-            # 연속으로 5번 낮은 결과가 나오면 unknown 상태
-            if state.low_confidence_count >= 5:
-                state.selected_index = 2  # unknown
-                state.low_confidence_count = 0
+            motion_threshold = POSE_CACHE_MOTION_THRESHOLD if POSE_CACHE_ENABLED else 0.0
+        if cache.class_scores is not None and keypoint_motion(keypoints, cache.keypoints) < motion_threshold:
+            self._motion_skips.inc()
+            return {'class_scores': cache.class_scores}
+
+        key = None
+        if self.pose_cache is not None:
+            key = self.pose_cache.key(keypoints, roi.shape)
+            class_scores = self.pose_cache.get(key)
+            if class_scores is not None:
+                cache.keypoints = keypoints
+                cache.class_scores = class_scores
+                return {'class_scores': class_scores}
+
+        pose_estimator, _ = self._get_pose_estimator()
+        with tracer.span('PoseEstimator.postprocess'):
+            skeleton_image = pose_estimator.visualize(roi, keypoints)
+        return {'skeleton': skeleton_image, 'pose_key': key}
 
-    def _handle_pull_state(self, state: InferenceState):
+    def _stage_classify(self, state: InferenceState, keypoints: np.ndarray, skeleton_image: np.ndarray,
+                        key: bytes = None) -> np.ndarray:
         """
-        'pull' 상태를 처리하는 내부 함수
+        skeleton 이미지로 자세 분류
+        """
+        with self._classifier_latency.time():
+            class_scores = self.pose_classifier.classify(skeleton_image)
 
-        Args:
-            state (InferenceState): 상태를 관리하는 객체
+        if key is not None:
+            self.pose_cache.put(key, class_scores)
+        cache = self._get_shed_cache(state)
+        cache.keypoints = keypoints
+        cache.class_scores = class_scores
+        return class_scores
+
+    def _stage_decide(self, state: InferenceState, timestamp: float, detections: tuple,
+                      keypoints: np.ndarray = None, class_scores: np.ndarray = None) -> int:
+        """
+        프레임 결과로 상태 갱신 (프레임 순서대로 실행되므로 pipelined 실행에서도 순서가 바뀌지 않음)
+
+        Returns:
+            int: 경고 전환 이벤트
         """
-        if state.pull_start_time is None:
-            state.pull_start_time = time.time()
+        state.begin_frame(timestamp)
+        boxes, scores, _ = detections
+        state.boxes = boxes
+        state.box_scores = scores
+
+        with tracer.span('decision'):
+            pose_required = self.engine.update_detection(state, len(boxes) > 0)
+        if pose_required and class_scores is not None:
+            with tracer.span('PoseClassifier.postprocess'):
+                predicted_index = int(np.argmax(class_scores))
+                confidence = float(np.max(class_scores))
 
-        elapsed_time = time.time() - state.pull_start_time
-        # pull_state_duration만큼의 시간동안 pull상태가 지속되는 경우
-        if elapsed_time > PULL_STATE_DURATION:
-            if not state.warning_active:
+            state.keypoints = keypoints
+            state.class_scores = class_scores
+            state.predicted_index = predicted_index
+            state.confidence = confidence
+
+            # 분류 결과로 상태 갱신
+            with tracer.span('decision'):
+                self.engine.update_pose(state, predicted_index, confidence)
+        return state.event
+
+    def _stage_alert(self, event: int):
+        """
+        경고 전환 이벤트 전달
+        """
+        if event == EVENT_SET_WARNING:
+            with tracer.span('alert'):
                 self.on_set_warning()
-            state.warning_active = True # warning 활성화
-            state.pull_start_time = None
+        elif event == EVENT_RESET_WARNING:
+            with tracer.span('alert'):
+                self.on_reset_warning()
+
+    def _stage_record(self, state: InferenceState, event: int):
+        """
+        프레임별 추론 기록
+        """
+        if self.record_log is not None:
+            self.record_log.write(state)
+
+    def _crop_roi(self, frame: np.ndarray, boxes: np.ndarray, padding: int = 0):
+        """
+        사람 영역만 크롭하는 함수 (crop_roi)
+        """
+        return crop_roi(frame, boxes, padding)
+
+
+def crop_roi(frame: np.ndarray, boxes: np.ndarray, padding: int = 0) -> np.ndarray:
+    """
+    사람 영역만 크롭하는 함수 (프로세스 실행기에서 실행할 수 있도록 모듈 함수로 정의)
+    
+    Args:
+        frame (numpy.ndarray): 비디오 프레임
+        boxes (list): 감지된 객체의 경계 상자 리스트
+        padding (int, optional): 경계 상자에 추가할 여백
+
+    Returns:
+        numpy.ndarray: 크롭된 ROI(관심 영역)
+    """
+    height, width, _ = frame.shape
+    x1, y1, x2, y2 = list(map(int, boxes[0]))
+    x1 = max(0, x1 - padding)
+    y1 = max(0, y1 - padding)
+    x2 = min(width, x2 + padding)
+    y2 = min(height, y2 + padding)
+    roi = frame[y1:y2, x1:x2]
+    return roi
@@ -0,0 +1,210 @@
+"""
+부하 조절 모듈
+
+스트림별 종단 간 지연 시간(프레임 수신 ~ 추론 완료)을 예산과 비교하여,
+서버가 밀리면 단계적으로 처리량을 줄이고 부하가 줄면 자동으로 되돌립니다.
+
+단계:
+    0. 정상
+    1. 사람 검출 주기 늘리기 (나머지 프레임은 이전 검출 결과 재사용)
+    2. 빠른 자세 추정 모델 사용 (예: MoveNet Lightning)
+    3. 움직임이 적은 프레임은 자세 분류 생략 (이전 분류 결과 재사용)
+    4. 클라이언트 전송 FPS 낮추기
+
+경고/긴급 상황과 관련된 스트림은 다른 스트림을 모두 최대 단계까지 낮춘 후에 낮추고, 가장 먼저 되돌립니다.
+빠른 자세 추정 모델 파일이 없으면 2단계는 효과가 없으므로 건너뜁니다.
+"""
+import configparser
+import os
+import time
+from collections import deque
+from typing import Callable
+
+import numpy as np
+
+from utils import metrics
+from utils.debug import current_time
+
+
+# 설정 가져오기
+__config = configparser.ConfigParser()
+__config.read('config.ini')
+
+SHED_ENABLED = __config['load_shedding'].getboolean('enabled')
+SHED_BUDGET = float(__config['load_shedding']['budget_ms']) / 1000
+SHED_WINDOW = int(__config['load_shedding']['window'])
+SHED_RECOVER_RATIO = float(__config['load_shedding']['recover_ratio'])
+SHED_RECOVER_HOLD = float(__config['load_shedding']['recover_hold'])
+SHED_COOLDOWN = float(__config['load_shedding']['cooldown'])
+SHED_DETECTOR_INTERVAL = int(__config['load_shedding']['detector_interval'])
+SHED_FAST_POSE_MODEL_PATH = __config['load_shedding']['fast_pose_model']
+SHED_MOTION_THRESHOLD = float(__config['load_shedding']['motion_threshold'])
+SHED_REDUCED_FPS = int(__config['load_shedding']['reduced_fps'])
+
+# 단계
+LEVEL_NORMAL = 0
+LEVEL_DETECTOR_CADENCE = 1
+LEVEL_FAST_POSE = 2
+LEVEL_SKIP_STATIC = 3
+LEVEL_REDUCED_FPS = 4
+LEVEL_NAMES = ['normal', 'detector cadence', 'fast pose model',
+               'skip static classification', 'reduced client fps']
+
+KEYPOINT_THRESHOLD = 0.3    # 움직임 계산에 사용할 키 포인트의 최소 신뢰도
+
+
+def keypoint_motion(keypoints: np.ndarray, previous: np.ndarray) -> float:
+    """
+    두 프레임 사이 키 포인트의 평균 이동 거리 (정규화 좌표)
+    두 프레임 모두에서 신뢰도가 높은 키 포인트가 없으면 무한대를 반환합니다.
+
+    Args:
+        keypoints (np.ndarray): 현재 키 포인트 (17, 3) - (y, x, score)
+        previous (np.ndarray): 이전 키 포인트
+
+    Returns:
+        float: 평균 이동 거리
+    """
+    visible = (keypoints[:, 2] > KEYPOINT_THRESHOLD) & (previous[:, 2] > KEYPOINT_THRESHOLD)
+    if not visible.any():
+        return float('inf')
+    return float(np.linalg.norm(keypoints[visible, :2] - previous[visible, :2], axis=1).mean())
+
+
+class _Stream:
+    """
+    스트림 하나의 부하 조절 상태
+    """
+    def __init__(self, name: str, window: int, is_priority: Callable[[], bool]):
+        self.name = name
+        self.level = LEVEL_NORMAL
+        self.latencies = deque(maxlen=window)
+        self.is_priority = is_priority
+        self.level_gauge = metrics.shed_level.labels(name)
+
+    def p90(self) -> float:
+        values = sorted(self.latencies)
+        return values[int(0.9 * (len(values) - 1))]
+
+
+class LoadShedController:
+    """
+    스트림별 지연 시간으로 부하 조절 단계를 정하는 클래스
+
+    Args:
+        budget (float): 종단 간 지연 시간 예산(초), 스트림의 최근 지연 시간 90 백분위수와 비교
+        window (int): 지연 시간을 모을 최근 프레임 수
+        recover_ratio (float): 모든 스트림이 예산 * recover_ratio 아래면 부하가 줄어든 것으로 판단
+        recover_hold (float): 부하가 줄어든 상태가 이 시간(초) 동안 유지되면 한 단계 되돌림
+        cooldown (float): 단계를 바꾼 후 다음 변경까지 최소 시간(초)
+        max_level (int): 최대 단계
+        skip_levels (set[int], optional): 건너뛸 단계 (기본값: 빠른 자세 추정 모델 파일이 없으면 LEVEL_FAST_POSE)
+        clock (Callable[[], float]): 현재 시간을 반환하는 함수
+    """
+    def __init__(self, budget: float = SHED_BUDGET, window: int = SHED_WINDOW,
+                 recover_ratio: float = SHED_RECOVER_RATIO, recover_hold: float = SHED_RECOVER_HOLD,
+                 cooldown: float = SHED_COOLDOWN, max_level: int = LEVEL_REDUCED_FPS,
+                 skip_levels: set[int] = None, clock: Callable[[], float] = time.monotonic):
+        if skip_levels is None:
+            skip_levels = set()
+            if not os.path.exists(SHED_FAST_POSE_MODEL_PATH):
+                print(f'Warning: fast pose model {SHED_FAST_POSE_MODEL_PATH} not found. '
+                      f'Load shedding skips level {LEVEL_FAST_POSE} ({LEVEL_NAMES[LEVEL_FAST_POSE]}).')
+                skip_levels.add(LEVEL_FAST_POSE)
+        self.budget = budget
+        self.window = window
+        self.recover_ratio = recover_ratio
+        self.recover_hold = recover_hold
+        self.cooldown = cooldown
+        self.max_level = max_level
+        self.skip_levels = set(skip_levels) - {LEVEL_NORMAL}
+        self.clock = clock
+        self.on_level_change = self._default_callback   # (스트림 이름, 이전 단계, 새 단계)를 받는 콜백 함수
+
+        self._streams = {}
+        self._last_change = float('-inf')
+        self._recover_since = None
+
+    def _default_callback(self, name: str, old_level: int, new_level: int):
+        pass
+
+    def add_stream(self, name: str, is_priority: Callable[[], bool] = lambda: False):
+        """
+        스트림 추가
+
+        Args:
+            name (str): 스트림 이름
+            is_priority (Callable[[], bool]): 경고/긴급 상황과 관련된 스트림인지 반환하는 함수
+        """
+        self._streams[name] = _Stream(name, self.window, is_priority)
+
+    def level(self, name: str) -> int:
+        return self._streams[name].level
+
+    def _step(self, level: int, step: int) -> int:
+        """
+        건너뛸 단계를 제외한 다음(step=1) 또는 이전(step=-1) 단계
+        """
+        level += step
+        while level in self.skip_levels:
+            level += step
+        return level
+
+    def observe(self, name: str, latency: float):
+        """
+        프레임 하나의 종단 간 지연 시간 기록 후 단계 조정
+
+        Args:
+            name (str): 스트림 이름
+            latency (float): 지연 시간(초)
+        """
+        self._streams[name].latencies.append(latency)
+        self._evaluate()
+
+    def _set_level(self, stream: _Stream, level: int, reason: str):
+        old_level = stream.level
+        stream.level = level
+        stream.level_gauge.set(level)
+        stream.latencies.clear()
+        self._last_change = self.clock()
+        print(f'[{current_time()}] Load shedding: {stream.name} level {old_level} -> {level} '
+              f'({LEVEL_NAMES[level]}), {reason}')
+        self.on_level_change(stream.name, old_level, level)
+
+    def _evaluate(self):
+        now = self.clock()
+        if now - self._last_change < self.cooldown:
+            return
+
+        # 지연 시간을 충분히 모은 스트림만 판단
+        ready = [stream for stream in self._streams.values() if len(stream.latencies) == self.window]
+        if not ready:
+            return
+        p90 = {stream.name: stream.p90() for stream in ready}
+        worst = max(p90, key=p90.get)
+
+        if p90[worst] > self.budget:
+            self._recover_since = None
+            # 우선순위가 낮고 단계가 낮은 스트림부터 한 단계 낮춤
+            candidates = [stream for stream in self._streams.values()
+                          if self._step(stream.level, 1) <= self.max_level]
+            if candidates:
+                stream = min(candidates, key=lambda stream: (stream.is_priority(), stream.level))
+                self._set_level(stream, self._step(stream.level, 1),
+                                f'{worst} p90 {p90[worst] * 1000:.0f} ms > budget {self.budget * 1000:.0f} ms')
+            return
+
+        if len(ready) == len(self._streams) and p90[worst] < self.budget * self.recover_ratio:
+            if self._recover_since is None:
+                self._recover_since = now
+            elif now - self._recover_since >= self.recover_hold:
+                # 우선순위가 높고 단계가 높은 스트림부터 한 단계 되돌림
+                degraded = [stream for stream in self._streams.values() if stream.level > LEVEL_NORMAL]
+                if degraded:
+                    stream = max(degraded, key=lambda stream: (stream.is_priority(), stream.level))
+                    self._set_level(stream, self._step(stream.level, -1),
+                                    f'p90 {p90[worst] * 1000:.0f} ms < {self.budget * self.recover_ratio * 1000:.0f} ms '
+                                    f'for {self.recover_hold:.0f}s')
+                self._recover_since = now
+        else:
+            self._recover_since = None
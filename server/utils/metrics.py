@@ -0,0 +1,384 @@
+"""
+지표 수집 모듈
+
+클라이언트/단계별 카운터, 게이지, 지연 시간 히스토그램을 모아
+로컬 HTTP 엔드포인트에서 Prometheus 텍스트 형식으로 제공합니다.
+
+값 갱신은 잠금 없이 수행합니다. 시계열 하나를 갱신하는 쓰레드는 보통 하나뿐이고,
+GIL 아래에서 조회 시점에 값이 한 프레임 정도 어긋나는 것은 지표 용도로 문제가 되지 않습니다.
+"""
+import bisect
+import configparser
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# 설정 가져오기
+__config = configparser.ConfigParser()
+__config.read('config.ini')
+
+METRICS_ENABLED = __config['metrics'].getboolean('enabled')
+METRICS_HOST = __config['metrics']['host']
+METRICS_PORT = int(__config['metrics']['port'])
+METRICS_RTT_INTERVAL = float(__config['metrics']['rtt_interval'])
+
+
+def _latency_buckets(lowest: float = 50e-6, highest: float = 60.0, sub_buckets: int = 4) -> list[float]:
+    """
+    HDR 히스토그램 방식의 로그-선형 버킷 경계
+    2배 구간마다 sub_buckets개의 같은 간격 버킷을 두어 모든 범위에서 상대 오차가 비슷합니다.
+    """
+    bounds = []
+    base = lowest
+    while base < highest:
+        step = base / sub_buckets
+        for i in range(1, sub_buckets + 1):
+            bounds.append(round(base + step * i, 9))
+        base *= 2
+    return bounds
+
+
+LATENCY_BUCKETS = _latency_buckets()
+
+
+def _format_labels(labelnames: tuple, values: tuple, extra: str = '') -> str:
+    parts = [f'{name}="{value}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+class _Metric:
+    """
+    레이블별 시계열을 가지는 지표의 기본 클래스
+    """
+    type_name = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values, **kwargs):
+        """
+        레이블 값에 해당하는 시계열 반환 (처음 호출 시 생성)
+        """
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self, key: tuple, child) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.documentation}',
+                 f'# TYPE {self.name} {self.type_name}']
+        for key, child in list(self._children.items()):
+            lines.extend(self._samples(key, child))
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+
+class Counter(_Metric):
+    """
+    증가만 하는 카운터
+    """
+    type_name = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def _samples(self, key, child):
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}']
+
+
+class _GaugeChild:
+    __slots__ = ('value', 'function')
+
+    def __init__(self):
+        self.value = 0.0
+        self.function = None
+
+    def set(self, value: float):
+        self.value = value
+
+    def set_function(self, function: callable):
+        """
+        조회 시점에 값을 계산할 함수 설정 (예: 큐 길이)
+        """
+        self.function = function
+
+    def get(self) -> float:
+        return self.function() if self.function is not None else self.value
+
+
+class Gauge(_Metric):
+    """
+    임의의 값을 가지는 게이지
+    """
+    type_name = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def _samples(self, key, child):
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.get())}']
+
+
+class _HistogramChild:
+    __slots__ = ('bounds', 'counts', 'sum')
+
+    def __init__(self, bounds: list[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def time(self):
+        """
+        with 문 안의 실행 시간을 기록
+        """
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ('_child', '_start')
+
+    def __init__(self, child: _HistogramChild):
+        self._child = child
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._child.observe(time.perf_counter() - self._start)
+        return False
+
+
+class Histogram(_Metric):
+    """
+    로그-선형 버킷 히스토그램 (기본 버킷: 50us ~ 60s)
+    """
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (),
+                 buckets: list[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = list(buckets)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def _samples(self, key, child):
+        counts = list(child.counts)
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + [math.inf], counts):
+            cumulative += count
+            # 비어있는 중간 버킷은 생략하여 출력 크기를 줄임 (누적 값이므로 정보 손실 없음)
+            if count == 0 and not math.isinf(bound):
+                continue
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f'{self.name}_sum{labels} {_format_value(child.sum)}')
+        lines.append(f'{self.name}_count{labels} {sum(counts)}')
+        return lines
+
+
+class Registry:
+    """
+    지표 모음
+    """
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple = (),
+                  buckets: list[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        Prometheus 텍스트 형식 출력
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsServer(threading.Thread):
+    """
+    /metrics 경로로 지표를 제공하는 HTTP 서버 쓰레드
+
+    Args:
+        registry (Registry): 지표 모음
+        port (int): 포트 번호
+        host (str): 바인드 주소 (기본값: config.ini [metrics] host)
+    """
+    def __init__(self, registry: 'Registry', port: int = METRICS_PORT, host: str = METRICS_HOST):
+        super().__init__()
+        self.daemon = True
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+
+    def run(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+
+
+class RttMonitor(threading.Thread):
+    """
+    주기적으로 'ping'을 보내고 'pong' 수신까지의 왕복 시간을 기록하는 쓰레드
+
+    Args:
+        send (callable): 메시지 전송 함수
+        gauge (_GaugeChild): 왕복 시간을 기록할 게이지
+        interval (float): 측정 주기(초)
+    """
+    def __init__(self, send: callable, gauge, interval: float = METRICS_RTT_INTERVAL):
+        super().__init__()
+        self.daemon = True
+        self._send = send
+        self._gauge = gauge
+        self._interval = interval
+        self._sent_time = None
+        self._running = True
+
+    def on_pong(self):
+        """
+        'pong' 수신 시 호출
+        """
+        if self._sent_time is not None:
+            self._gauge.set(time.perf_counter() - self._sent_time)
+            self._sent_time = None
+
+    def run(self):
+        while self._running:
+            self._sent_time = time.perf_counter()
+            try:
+                self._send('ping')
+            except OSError:
+                break
+            time.sleep(self._interval)
+
+    def stop(self):
+        self._running = False
+
+
+# 서버 지표
+registry = Registry()
+frames_received = registry.counter(
+    'bsp_frames_received_total', 'Frames received from the client', ('client',))
+frames_decoded = registry.counter(
+    'bsp_frames_decoded_total', 'Frames decoded successfully', ('client',))
+frames_dropped = registry.counter(
+    'bsp_frames_dropped_total', 'Frames dropped because they were incomplete or could not be decoded', ('client',))
+frames_superseded = registry.counter(
+    'bsp_frames_superseded_total', 'Frames skipped because a newer frame was already waiting', ('client',))
+frames_inferred = registry.counter(
+    'bsp_frames_inferred_total', 'Frames processed by the Inferencer', ('client',))
+model_latency = registry.histogram(
+    'bsp_model_latency_seconds', 'Latency of each model call', ('client', 'model'))
+stage_latency = registry.histogram(
+    'bsp_stage_latency_seconds', 'Latency of each pipeline stage', ('client', 'stage'))
+pipeline_stage_skipped = registry.counter(
+    'bsp_pipeline_stage_skipped_total', 'Frames that skipped a pipeline stage (missing inputs or outputs already set)',
+    ('client', 'stage'))
+pipeline_queue_depth = registry.gauge(
+    'bsp_pipeline_queue_depth', 'Frames waiting in front of each pipeline stage (pipelined mode)', ('client', 'stage'))
+detector_batch_size = registry.histogram(
+    'bsp_detector_batch_size', 'Frames per batched PersonDetector call', ('client',),
+    buckets=[1, 2, 3, 4, 6, 8, 12, 16, 24, 32])
+queue_age = registry.histogram(
+    'bsp_queue_age_seconds', 'Time a frame waited in the receive queue', ('client',))
+queue_depth = registry.gauge(
+    'bsp_queue_depth', 'Frames waiting in the receive queue', ('client',))
+alarms_sent = registry.counter(
+    'bsp_alarms_sent_total', 'Alarms sent', ('client', 'type'))
+client_occupied = registry.gauge(
+    'bsp_client_occupied', 'Occupancy reported by the client edge filter (1: person, 0: nobody)', ('client',))
+client_requested_fps = registry.gauge(
+    'bsp_client_requested_fps', 'Capture rate last requested from the client (0: unlimited)', ('client',))
+client_rtt = registry.gauge(
+    'bsp_client_rtt_seconds', 'Last measured message round-trip time to the client', ('client',))
+shed_level = registry.gauge(
+    'bsp_shed_level', 'Current load shedding level (0: normal)', ('client',))
+scheduler_served = registry.counter(
+    'bsp_scheduler_served_total', 'Frames served by the inference scheduler', ('client',))
+scheduler_service_time = registry.counter(
+    'bsp_scheduler_service_seconds_total', 'Inference time spent on each stream', ('client',))
+scheduler_guaranteed = registry.counter(
+    'bsp_scheduler_guaranteed_total', 'Frames served ahead of turn to keep the minimum rate', ('client',))
+scheduler_weight = registry.gauge(
+    'bsp_scheduler_weight', 'Current scheduling weight of each stream', ('client',))
+pose_cache_lookups = registry.counter(
+    'bsp_pose_cache_lookups_total', 'Pose classification cache lookups', ('client', 'result'))
+pose_cache_size = registry.gauge(
+    'bsp_pose_cache_entries', 'Entries in the pose classification cache', ('client',))
+pose_cache_hit_ratio = registry.gauge(
+    'bsp_pose_cache_hit_ratio', 'Pose classification cache hit ratio since start', ('client',))
+pose_motion_skips = registry.counter(
+    'bsp_pose_motion_skips_total', 'Pose classifications skipped because the keypoints barely moved', ('client',))
@@ -1,23 +1,80 @@
+import os
+from concurrent.futures import Future
+
 import cv2
 import numpy as np
-import openvino as ov
+
+from utils.backend import get_backend
+from utils.trace import tracer
 
 
-core = ov.Core()
+PRECISIONS = ('float', 'int8')  # float: 원본 IR (FP32/FP16), int8: quantize.py로 만든 INT8 IR
 
 
-class OpenvinoModel:
+def precision_model_path(model_path: str, precision: str) -> str:
     """
-    OpenVINO 모델을 사용하기 위한 기본 클래스
+    정밀도별 모델 경로 (INT8 모델은 원본 옆에 '-int8'을 붙여 저장)
+
+    Args:
+        model_path (str): 원본 모델 경로
+        precision (str): 'float' 또는 'int8'
+
+    Returns:
+        str: 모델 경로 (예: models/person-detection-0202-int8.xml)
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f'Unknown precision: {precision} (expected one of {PRECISIONS})')
+    if precision == 'float':
+        return model_path
+    stem, ext = os.path.splitext(model_path)
+    return f'{stem}-{precision}{ext}'
+
+
+def select_model_path(model_path: str, precision: str) -> str:
+    """
+    설정한 정밀도의 모델 경로 (해당 정밀도의 모델이 없으면 원본 모델 사용)
+    """
+    path = precision_model_path(model_path, precision)
+    if path != model_path and not os.path.exists(path):
+        print(f'Warning: {path} not found. Using {model_path}.')
+        return model_path
+    return path
+
+
+def _then(future: Future, function) -> Future:
+    """
+    future의 결과에 function을 적용한 결과의 Future (후처리는 추론을 완료한 쓰레드에서 실행)
+    """
+    result = Future()
+
+    def done(completed: Future):
+        try:
+            result.set_result(function(completed.result()))
+        except Exception as e:
+            result.set_exception(e)
+
+    future.add_done_callback(done)
+    return result
+
+
+class InferenceModel:
+    """
+    추론 백엔드(utils.backend)의 세션으로 모델을 사용하기 위한 기본 클래스
 
     Args:
         model_path (str): 모델 경로
         device (str): 추론에 사용할 장치
+        config (dict, optional): compile_model 설정 (성능 힌트, 스트림 수, 쓰레드 수, CPU 고정)
+        backend (str): 추론 백엔드 (openvino, onnxruntime, dummy)
     """
-    def __init__(self, model_path: str, device: str = 'CPU'):
-        self.compiled_model = None
-        self.input_layer = None
-        self.output_layer = None
+    kind = ''   # 모델 종류 (utils.backend.MODEL_KINDS)
+
+    def __init__(self, model_path: str, device: str = 'CPU', config: dict = None, backend: str = 'openvino'):
+        self.model_path = model_path
+        self.device = device
+        self.config = config or {}
+        self.backend = get_backend(backend)
+        self.session = None
         self.height = 0
         self.width = 0
 
@@ -31,12 +88,17 @@ class OpenvinoModel:
             model_path (str): 모델 경로
             device (str): 추론에 사용할 장치
         """
-        model = core.read_model(model_path)
-        self.compiled_model = core.compile_model(model=model, device_name=device)
-        self.input_layer = self.compiled_model.input(0)
-        self.output_layer = self.compiled_model.output(0)
-        self.height, self.width = self.input_layer.shape[2:4]
-        
+        # 같은 모델은 한 번만 불러오고, 이 객체(스트림)는 세션 하나를 계속 사용
+        self.session = self.backend.open(self.kind, model_path, device, self.config)
+        self.height, self.width = self.session.input_shape[2:4]
+
+    def close(self):
+        """
+        세션 반환 (이후 이 객체는 사용할 수 없음)
+        """
+        if self.session is not None:
+            self.session.close()
+            self.session = None
 
     def _preprocess(self, input_data: np.ndarray, transpose: bool = True) -> np.ndarray:
         """
@@ -58,16 +120,39 @@ class OpenvinoModel:
         return input_image
 
 
-class PersonDetector(OpenvinoModel):
+class PersonDetector(InferenceModel):
     """
     사람 검출 모델 클래스
 
     Args:
         model_path (str): 모델 경로
         device (str): 추론에 사용할 장치
+        max_batch_size (int): predict_batch에 한 번에 넣을 수 있는 최대 이미지 수
+        config (dict, optional): compile_model 설정
+        backend (str): 추론 백엔드
     """
-    def __init__(self, model_path: str, device: str = 'CPU'):
-        super().__init__(model_path, device)
+    kind = 'person_detection'
+
+    def __init__(self, model_path: str, device: str = 'CPU', max_batch_size: int = 1, config: dict = None,
+                 backend: str = 'openvino'):
+        super().__init__(model_path, device, config, backend)
+        self.max_batch_size = max_batch_size
+        self.batch_session = None       # 배치 크기가 1 ~ max_batch_size인 모델의 세션
+        if max_batch_size > 1:
+            self._init_batch_model()
+
+    def _init_batch_model(self):
+        """
+        배치 크기를 1 ~ max_batch_size로 바꾼 모델 준비
+        """
+        self.batch_session = self.backend.open(self.kind, self.model_path, self.device, self.config,
+                                               max_batch_size=self.max_batch_size)
+
+    def close(self):
+        super().close()
+        if self.batch_session is not None:
+            self.batch_session.close()
+            self.batch_session = None
     
     def predict(self, input_data: np.ndarray) -> np.ndarray:
         """
@@ -79,11 +164,61 @@ class PersonDetector(OpenvinoModel):
         Returns:
             np.ndarray: 추론 결과
         """
-        input_image = self._preprocess(input_data, transpose=True)
-        results = self.compiled_model([input_image])[self.output_layer]
+        with tracer.span('PersonDetector.preprocess'):
+            input_image = self._preprocess(input_data, transpose=True)
+        with tracer.span('PersonDetector.infer'):
+            results = self.session.infer(input_image)
+
+        with tracer.span('PersonDetector.postprocess'):
+            height, width, _ = input_data.shape
+            processed_results = self.__process_results(height, width, results)
+
+        return processed_results
+
+    def predict_async(self, input_data: np.ndarray) -> Future:
+        """
+        전처리 후 비동기로 추론하고 predict()와 같은 결과의 Future 반환 (추론하는 동안 다른 프레임 처리 가능)
+
+        Args:
+            input_data (np.ndarray): 입력 이미지
 
+        Returns:
+            Future: (boxes, scores, labels)
+        """
+        with tracer.span('PersonDetector.preprocess'):
+            input_image = self._preprocess(input_data, transpose=True)
         height, width, _ = input_data.shape
-        processed_results = self.__process_results(height, width, results)
+        return _then(self.session.infer_async(input_image),
+                     lambda results: self.__process_results(height, width, results))
+
+    def predict_batch(self, input_data: list[np.ndarray]) -> list[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        여러 이미지를 한 번의 추론으로 처리
+
+        Args:
+            input_data (list[np.ndarray]): 입력 이미지 목록 (최대 max_batch_size개, 크기는 서로 달라도 됨)
+
+        Returns:
+            list[tuple]: 이미지별 predict() 결과
+        """
+        if len(input_data) > self.max_batch_size:
+            raise ValueError(f'Batch size {len(input_data)} exceeds max_batch_size {self.max_batch_size}')
+        if self.batch_session is None:
+            self._init_batch_model()
+
+        with tracer.span('PersonDetector.preprocess'):
+            input_images = np.concatenate([self._preprocess(frame, transpose=True) for frame in input_data])
+        with tracer.span('PersonDetector.infer'):
+            results = self.batch_session.infer(input_images)
+
+        # 출력은 [1, 1, N * batch, 7]이며 첫 번째 값이 배치 내 이미지 번호 (-1: 빈 행)
+        with tracer.span('PersonDetector.postprocess'):
+            detections = results.reshape(-1, 7)
+            processed_results = []
+            for i, frame in enumerate(input_data):
+                height, width, _ = frame.shape
+                processed_results.append(
+                    self.__process_results(height, width, detections[detections[:, 0] == i]))
 
         return processed_results
     
@@ -129,18 +264,22 @@ class PersonDetector(OpenvinoModel):
         return np.array(boxes), np.array(scores), np.array(labels)
 
 
-class PoseEstimator(OpenvinoModel):
+class PoseEstimator(InferenceModel):
     """
     자세 추정 모델 클래스
 
     Args:
         model_path (str): 모델 경로
         device (str): 추론에 사용할 장치
+        config (dict, optional): compile_model 설정
+        backend (str): 추론 백엔드
     """
-    def __init__(self, model_path: str, device: str = 'CPU'):
-        super().__init__(model_path, device)
-        self.height = 256
-        self.width = 256
+    kind = 'pose_estimation'
+
+    def __init__(self, model_path: str, device: str = 'CPU', config: dict = None, backend: str = 'openvino'):
+        super().__init__(model_path, device, config, backend)
+        # NHWC 입력 (Thunder: 256, Lightning: 192)
+        self.height, self.width = self.session.input_shape[1:3]
     
     def predict(self, input_data: np.ndarray) -> np.ndarray:
         """
@@ -152,12 +291,41 @@ class PoseEstimator(OpenvinoModel):
         Returns:
             np.ndarray: skeleton 이미지
         """
-        input_image = self._preprocess(input_data, transpose=False)
-        results = self.compiled_model([input_image])[self.output_layer][0]
-
-        result_image = self.visualize(input_data, results[0])
+        keypoints = self.estimate(input_data)
+        result_image = self.visualize(input_data, keypoints)
 
         return result_image
+
+    def estimate(self, input_data: np.ndarray) -> np.ndarray:
+        """
+        입력 이미지의 키 포인트 추정
+
+        Args:
+            input_data (np.ndarray): 입력 이미지
+
+        Returns:
+            np.ndarray: 키 포인트 (17, 3) - (y, x, score), 좌표는 [0, 1]로 정규화
+        """
+        with tracer.span('PoseEstimator.preprocess'):
+            input_image = self._preprocess(input_data, transpose=False)
+        with tracer.span('PoseEstimator.infer'):
+            results = self.session.infer(input_image)[0]
+
+        return results[0]
+
+    def estimate_async(self, input_data: np.ndarray) -> Future:
+        """
+        전처리 후 비동기로 추론하고 estimate()와 같은 결과의 Future 반환
+
+        Args:
+            input_data (np.ndarray): 입력 이미지
+
+        Returns:
+            Future: 키 포인트 (17, 3)
+        """
+        with tracer.span('PoseEstimator.preprocess'):
+            input_image = self._preprocess(input_data, transpose=False)
+        return _then(self.session.infer_async(input_image), lambda results: results[0][0])
     
     def visualize(self, frame: np.ndarray, keypoints: np.ndarray) -> np.ndarray:
         """
@@ -201,16 +369,20 @@ class PoseEstimator(OpenvinoModel):
         return canvas
 
 
-class PoseClassifier(OpenvinoModel):
+class PoseClassifier(InferenceModel):
     """
     자세 분류 모델 클래스
 
     Args:
         model_path (str): 모델 경로
         device (str): 추론에 사용할 장치
+        config (dict, optional): compile_model 설정
+        backend (str): 추론 백엔드
     """
-    def __init__(self, model_path: str, device: str = 'CPU'):
-        super().__init__(model_path, device)
+    kind = 'pose_classification'
+
+    def __init__(self, model_path: str, device: str = 'CPU', config: dict = None, backend: str = 'openvino'):
+        super().__init__(model_path, device, config, backend)
     
     def predict(self, input_data: np.ndarray) -> tuple[int, float]:
         """
@@ -223,9 +395,99 @@ class PoseClassifier(OpenvinoModel):
             int: 추론 결과 index
             float: 추론 결과 confidence
         """
-        input_image = self._preprocess(input_data, transpose=True)
-        results = self.compiled_model([input_image])[self.output_layer]
+        results = self.classify(input_data)
         index = np.argmax(results)
         conf = np.max(results)
 
-        return index, conf
\ No newline at end of file
+        return index, conf
+
+    def classify(self, input_data: np.ndarray) -> np.ndarray:
+        """
+        입력 이미지의 클래스별 점수 계산
+
+        Args:
+            input_data (np.ndarray): 입력 이미지
+
+        Returns:
+            np.ndarray: 클래스별 점수 (0: pull, 1: push)
+        """
+        with tracer.span('PoseClassifier.preprocess'):
+            input_image = self._preprocess(input_data, transpose=True)
+        with tracer.span('PoseClassifier.infer'):
+            results = self.session.infer(input_image)
+
+        return results[0]
+
+class BarbellDetector(InferenceModel):
+    """
+    바벨 검출 모델 클래스 (client2의 YOLOv5 모델을 OpenVINO IR로 변환한 모델)
+    출력은 [1, N, 5 + 클래스 수] 텐서 (cx, cy, w, h, objectness, 클래스별 점수)입니다.
+
+    Args:
+        model_path (str): 모델 경로
+        device (str): 추론에 사용할 장치
+        config (dict, optional): compile_model 설정
+        backend (str): 추론 백엔드
+    """
+    kind = 'barbell_detection'
+
+    def predict(self, input_data: np.ndarray, thresh: float = 0.8) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        입력 이미지에 대한 추론 수행
+
+        Args:
+            input_data (np.ndarray): 입력 이미지 (BGR)
+            thresh (float): 신뢰도 임계값 (objectness * 클래스 점수)
+
+        Returns:
+            tuple: 입력 이미지 좌표의 경계 상자 (N, 4), 점수 (N,), 클래스 (N,)
+        """
+        with tracer.span('BarbellDetector.preprocess'):
+            input_image, scale, pad_x, pad_y = self._letterbox(input_data)
+        with tracer.span('BarbellDetector.infer'):
+            results = self.session.infer(input_image)
+
+        with tracer.span('BarbellDetector.postprocess'):
+            return self.__process_results(results, scale, pad_x, pad_y, thresh)
+
+    def _letterbox(self, input_data: np.ndarray) -> tuple[np.ndarray, float, int, int]:
+        """
+        비율을 유지하여 입력 크기에 맞추고 남는 부분은 회색(114)으로 채움 (YOLOv5 전처리와 같음)
+
+        Returns:
+            tuple: 입력 텐서 (1, 3, height, width), 배율, 왼쪽 여백, 위쪽 여백
+        """
+        height, width, _ = input_data.shape
+        scale = min(self.width / width, self.height / height)
+        resized_width, resized_height = round(width * scale), round(height * scale)
+        pad_x = (self.width - resized_width) // 2
+        pad_y = (self.height - resized_height) // 2
+
+        canvas = np.full((self.height, self.width, 3), 114, dtype=np.uint8)
+        canvas[pad_y:pad_y + resized_height, pad_x:pad_x + resized_width] = cv2.resize(
+            input_data, (resized_width, resized_height), interpolation=cv2.INTER_LINEAR)
+        image = cv2.cvtColor(canvas, cv2.COLOR_BGR2RGB).transpose(2, 0, 1)
+        return np.expand_dims(image, axis=0).astype(np.float32) / 255, scale, pad_x, pad_y
+
+    def __process_results(self, results: np.ndarray, scale: float, pad_x: int, pad_y: int,
+                          thresh: float, iou_thresh: float = 0.45):
+        """
+        추론 결과 처리 (임계값 이상의 후보를 NMS로 정리하고 입력 이미지 좌표로 변환)
+        """
+        candidates = results.reshape(-1, results.shape[-1])
+        class_scores = candidates[:, 5:] * candidates[:, 4:5]
+        labels = class_scores.argmax(axis=1)
+        scores = class_scores[np.arange(len(candidates)), labels]
+        keep = scores > thresh
+        if not keep.any():
+            return np.array([]).reshape(0, 4), np.array([]), np.array([])
+
+        cx, cy, w, h = candidates[keep, :4].T
+        boxes = np.stack([cx - w / 2, cy - h / 2, w, h], axis=1)
+        scores, labels = scores[keep], labels[keep]
+        indices = np.array(cv2.dnn.NMSBoxes(boxes.tolist(), scores.tolist(), thresh, iou_thresh)).reshape(-1)
+
+        boxes = boxes[indices]
+        boxes[:, 2:] += boxes[:, :2]
+        boxes = (boxes - [pad_x, pad_y, pad_x, pad_y]) / scale
+        return boxes, scores[indices].astype(float), labels[indices]
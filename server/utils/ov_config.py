@@ -0,0 +1,105 @@
+"""
+OpenVINO 실행 설정 모듈
+
+config.ini의 [openvino.<모델 종류>] 섹션을 compile_model 설정으로 바꾸고,
+수신/디코딩 쓰레드와 추론 쓰레드가 같은 CPU를 두고 경쟁하지 않도록 CPU를 나눠서 고정합니다.
+(OpenVINO 추론 쓰레드는 모델을 컴파일하고 추론하는 쓰레드의 CPU 설정을 따름)
+"""
+import configparser
+import os
+
+from utils.worker import parse_affinity
+
+
+# 설정 가져오기
+__config = configparser.ConfigParser()
+__config.read('config.ini')
+
+OPENVINO_IO_CPUS = parse_affinity(__config['openvino']['io_cpus'])[0]
+OPENVINO_INFERENCE_CPUS = parse_affinity(__config['openvino']['inference_cpus'])[0]
+
+HINTS = ('none', 'latency', 'throughput')
+PINNING = ('default', 'true', 'false')
+
+
+def compile_config(hint: str = 'none', streams: int = 0, threads: int = 0, pinning: str = 'default') -> dict:
+    """
+    실행 설정을 compile_model 설정으로 변환
+
+    Args:
+        hint (str): 성능 힌트 (none, latency, throughput)
+        streams (int): 추론 스트림 수 (0이면 힌트/기본값)
+        threads (int): 추론 쓰레드 수 (0이면 힌트/기본값)
+        pinning (str): 추론 쓰레드 CPU 고정 여부 (default, true, false)
+
+    Returns:
+        dict: compile_model 설정
+    """
+    if hint not in HINTS:
+        raise ValueError(f'Unknown hint: {hint} (expected one of {HINTS})')
+    if pinning not in PINNING:
+        raise ValueError(f'Unknown pinning: {pinning} (expected one of {PINNING})')
+    config = {}
+    if hint != 'none':
+        config['PERFORMANCE_HINT'] = hint.upper()
+    if streams > 0:
+        config['NUM_STREAMS'] = streams
+    if threads > 0:
+        config['INFERENCE_NUM_THREADS'] = threads
+    if pinning != 'default':
+        config['ENABLE_CPU_PINNING'] = pinning == 'true'
+    return config
+
+
+def _section_values(section: configparser.SectionProxy) -> dict:
+    return {'hint': section['hint'], 'streams': int(section['streams']),
+            'threads': int(section['threads']), 'pinning': section['pinning']}
+
+
+def model_config(kind: str) -> dict:
+    """
+    모델 종류별 compile_model 설정 ([openvino.<모델 종류>] 섹션)
+    """
+    return compile_config(**_section_values(__config[f'openvino.{kind}']))
+
+
+def pin_current_thread(cpus: list[int] | None):
+    """
+    호출한 쓰레드만 지정한 CPU에서 실행 (Linux에서는 쓰레드 단위로 적용, 이후 만든 쓰레드도 따름)
+    """
+    if cpus and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cpus)
+
+
+def write_model_config(path: str, kind: str, values: dict):
+    """
+    config.ini의 [openvino.<모델 종류>] 섹션 값 변경 (주석과 다른 섹션은 그대로 유지)
+
+    Args:
+        path (str): 설정 파일 경로
+        kind (str): 모델 종류
+        values (dict): hint, streams, threads, pinning
+    """
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().split('\n')
+
+    section = f'[openvino.{kind}]'
+    if section not in (line.strip() for line in lines):
+        raise ValueError(f'{section} not found in {path}')
+
+    in_section = False
+    remaining = dict(values)
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if stripped.startswith('['):
+            in_section = stripped == section
+            continue
+        if in_section and '=' in stripped and not stripped.startswith('#'):
+            key = stripped.split('=', 1)[0].strip()
+            if key in remaining:
+                lines[i] = f'{key} = {remaining.pop(key)}'
+    if remaining:
+        raise ValueError(f'{", ".join(remaining)} not found in {section}')
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
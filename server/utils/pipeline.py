@@ -0,0 +1,395 @@
+"""
+추론 파이프라인 모듈
+
+단계(Stage)는 프레임 컨텍스트(dict)에서 읽을 입력 이름과 쓸 출력 이름을 선언하고,
+PipelineGraph는 입력/출력 관계로 실행 순서를 정합니다. 입력이 없는 단계(앞 단계가 결과를 내지 않음)와
+출력이 이미 있는 단계(예: 미리 계산한 사람 검출 결과)는 건너뜁니다.
+
+단계마다 실행기를 고를 수 있습니다.
+    inline: 파이프라인을 실행하는 쓰레드에서 바로 실행
+    thread: 단계 전용 쓰레드 풀에서 실행 (쓰레드에 안전하지 않은 단계는 쓰레드 1개만 허용)
+    process: 프로세스 풀에서 실행 (함수와 입력을 pickle할 수 있는 단계만, 예: 크롭)
+    async: 단계의 비동기 함수가 반환한 Future를 기다림 (예: OpenVINO 비동기 추론)
+
+Pipeline.run()은 프레임 하나를 모든 단계에 순서대로 통과시키고,
+Pipeline.start()/submit()은 단계마다 쓰레드와 크기가 제한된 큐를 두어 여러 프레임을 겹쳐서 실행합니다.
+단계마다 프레임 순서대로 결과를 내보내므로 상태를 바꾸는 단계도 프레임 순서대로 실행됩니다.
+"""
+import configparser
+import multiprocessing as mp
+import pickle
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from queue import Queue
+from typing import Callable
+
+from utils import metrics
+from utils.trace import tracer
+
+
+# 설정 가져오기
+__config = configparser.ConfigParser()
+__config.read('config.ini')
+
+PIPELINE_MODE = __config['pipeline']['mode']
+PIPELINE_QUEUE_SIZE = int(__config['pipeline']['queue_size'])
+PIPELINE_EXECUTORS = __config['pipeline']['executors']
+
+MODES = ('sync', 'pipelined')
+EXECUTORS = ('inline', 'thread', 'process', 'async')
+
+_STOP = object()    # 단계 쓰레드 종료 신호
+
+
+def parse_executors(text: str) -> dict[str, tuple[str, int]]:
+    """
+    단계별 실행기 설정 파싱 ('detect=async:2, crop=thread' -> {'detect': ('async', 2), 'crop': ('thread', 1)})
+    """
+    executors = {}
+    for part in text.split(','):
+        if not part.strip():
+            continue
+        name, value = part.split('=')
+        executor, _, workers = value.strip().partition(':')
+        if executor not in EXECUTORS:
+            raise ValueError(f'Unknown executor: {executor} (expected one of {EXECUTORS})')
+        executors[name.strip()] = (executor, int(workers) if workers else 1)
+    return executors
+
+
+class Stage:
+    """
+    파이프라인 단계
+
+    function은 inputs 순서대로 값을 받아 출력을 반환합니다.
+    출력이 하나면 값(None이면 출력 없음), 여러 개면 {출력 이름: 값} (없는 출력은 생략)을 반환합니다.
+
+    Args:
+        name (str): 단계 이름 (지표 레이블)
+        function (Callable): 단계 함수
+        inputs (tuple[str]): 입력 이름 ('?'로 끝나면 없어도 실행하고 None 전달)
+        outputs (tuple[str]): 출력 이름
+        async_function (Callable, optional): function과 같은 인자를 받아 결과의 Future를 반환하는 함수 (async 실행기)
+        thread_safe (bool): 여러 쓰레드에서 동시에 실행해도 되는지 여부 (모델을 사용하는 단계는 False)
+        executor (str): 실행기 (inline, thread, process, async)
+        workers (int): thread/process 실행기의 작업자 수, async 실행기의 동시 요청 수
+    """
+    def __init__(self, name: str, function: Callable, inputs: tuple, outputs: tuple = (),
+                 async_function: Callable = None, thread_safe: bool = True,
+                 executor: str = 'inline', workers: int = 1):
+        self.name = name
+        self.function = function
+        self.inputs = tuple(name.rstrip('?') for name in inputs)
+        self.required = tuple(name for name in inputs if not name.endswith('?'))
+        self.outputs = tuple(outputs)
+        self.async_function = async_function
+        self.thread_safe = thread_safe
+        self.executor = executor
+        self.workers = workers
+
+    def __repr__(self):
+        return f'Stage({self.name}: {", ".join(self.inputs)} -> {", ".join(self.outputs)}, {self.executor})'
+
+
+class PipelineGraph:
+    """
+    단계 목록과 외부에서 넣는 입력(sources)으로 실행 순서를 정하는 그래프
+
+    Args:
+        stages (list[Stage]): 단계 목록 (의존 관계가 없으면 이 순서를 유지)
+        sources (tuple[str]): 프레임을 넣을 때 컨텍스트에 채우는 입력 이름
+    """
+    def __init__(self, stages: list[Stage], sources: tuple = ()):
+        self.sources = tuple(sources)
+        self.stages = self._order(list(stages))
+
+    def add(self, stage: Stage, after: str = None):
+        """
+        단계 추가 후 실행 순서 다시 계산
+
+        Args:
+            stage (Stage): 추가할 단계
+            after (str, optional): 의존 관계가 없어도 이 단계 뒤에 실행
+        """
+        stages = list(self.stages)
+        if after is None:
+            stages.append(stage)
+        else:
+            stages.insert([existing.name for existing in stages].index(after) + 1, stage)
+        self.stages = self._order(stages)
+
+    def configure(self, executors: dict[str, tuple[str, int]]):
+        """
+        단계별 실행기 설정 (parse_executors 결과)
+        """
+        names = {stage.name for stage in self.stages}
+        unknown = set(executors) - names
+        if unknown:
+            raise ValueError(f'Unknown stages: {", ".join(sorted(unknown))} (stages: {", ".join(sorted(names))})')
+        for stage in self.stages:
+            if stage.name in executors:
+                stage.executor, stage.workers = executors[stage.name]
+
+    def stage(self, name: str) -> Stage:
+        for stage in self.stages:
+            if stage.name == name:
+                return stage
+        raise KeyError(name)
+
+    def _order(self, stages: list[Stage]) -> list[Stage]:
+        """
+        출력을 만드는 모든 단계 뒤에 그 출력을 읽는 단계가 오도록 정렬 (선언 순서 유지)
+        """
+        names = [stage.name for stage in stages]
+        if len(set(names)) < len(names):
+            raise ValueError(f'Duplicate stage names: {", ".join(names)}')
+        producers = {}
+        for stage in stages:
+            for output in stage.outputs:
+                producers.setdefault(output, []).append(stage.name)
+        for stage in stages:
+            for name in stage.required:
+                if name not in producers and name not in self.sources:
+                    raise ValueError(f'{stage.name}: no stage produces {name}')
+
+        depends = {stage.name: {producer for name in stage.inputs for producer in producers.get(name, ())
+                                if producer != stage.name} for stage in stages}
+        ordered, done = [], set()
+        while len(ordered) < len(stages):
+            ready = next((stage for stage in stages
+                          if stage.name not in done and depends[stage.name] <= done), None)
+            if ready is None:
+                cycle = [stage.name for stage in stages if stage.name not in done]
+                raise ValueError(f'Cycle between stages: {", ".join(cycle)}')
+            ordered.append(ready)
+            done.add(ready.name)
+        return ordered
+
+
+def _invoke(function: Callable, args: tuple, frame_id):
+    """
+    실행기 쓰레드에서 프레임 번호를 설정하고 단계 함수 실행
+    """
+    tracer.set_frame(frame_id)
+    return function(*args)
+
+
+class _InlineExecutor:
+    def submit(self, function: Callable, args: tuple, frame_id) -> Future:
+        future = Future()
+        try:
+            future.set_result(function(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self):
+        pass
+
+
+class _PoolExecutor:
+    def __init__(self, pool):
+        self._pool = pool
+
+    def submit(self, function: Callable, args: tuple, frame_id) -> Future:
+        return self._pool.submit(_invoke, function, args, frame_id)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+class _AsyncExecutor:
+    def submit(self, function: Callable, args: tuple, frame_id) -> Future:
+        return function(*args)
+
+    def shutdown(self):
+        pass
+
+
+def _create_executor(stage: Stage):
+    """
+    단계 설정에 맞는 실행기 생성 (단계가 지원하지 않는 실행기면 ValueError)
+    """
+    if stage.executor not in EXECUTORS:
+        raise ValueError(f'{stage.name}: unknown executor {stage.executor} (expected one of {EXECUTORS})')
+    if stage.workers < 1:
+        raise ValueError(f'{stage.name}: workers must be at least 1')
+    if stage.executor == 'inline':
+        return _InlineExecutor()
+    if stage.executor == 'thread':
+        if stage.workers > 1 and not stage.thread_safe:
+            raise ValueError(f'{stage.name} is not thread-safe; use thread:1 or async')
+        return _PoolExecutor(ThreadPoolExecutor(stage.workers, thread_name_prefix=f'Stage {stage.name}'))
+    if stage.executor == 'process':
+        try:
+            pickle.dumps(stage.function)
+        except Exception:
+            raise ValueError(f'{stage.name} cannot run in a process (its function cannot be pickled)')
+        return _PoolExecutor(ProcessPoolExecutor(stage.workers, mp_context=mp.get_context('spawn')))
+    if stage.async_function is None:
+        raise ValueError(f'{stage.name} has no asynchronous implementation')
+    return _AsyncExecutor()
+
+
+class _StageRunner:
+    """
+    단계 하나의 실행기와 지표
+    """
+    def __init__(self, stage: Stage, name: str):
+        self.stage = stage
+        self.executor = _create_executor(stage)
+        self.function = stage.async_function if stage.executor == 'async' else stage.function
+        self.latency = metrics.stage_latency.labels(name, stage.name)
+        self.skipped = metrics.pipeline_stage_skipped.labels(name, stage.name)
+        self.queue = None
+
+    def start(self, context: dict) -> Future | None:
+        """
+        단계 실행 시작 (건너뛰는 경우 None)
+        """
+        stage = self.stage
+        if 'error' in context or any(context.get(name) is None for name in stage.required) or \
+                (stage.outputs and all(context.get(name) is not None for name in stage.outputs)):
+            self.skipped.inc()
+            return None
+        args = tuple(context.get(name) for name in stage.inputs)
+        context['_start_ns'] = time.perf_counter_ns()
+        return self.executor.submit(self.function, args, context.get('frame_id'))
+
+    def finish(self, context: dict, future: Future | None):
+        """
+        단계 결과를 컨텍스트에 저장 (예외는 context['error']로 저장)
+        """
+        if future is None:
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            context['error'] = e
+            context['error_stage'] = self.stage.name
+            return
+        finally:
+            self.latency.observe((time.perf_counter_ns() - context.pop('_start_ns')) / 1e9)
+
+        outputs = self.stage.outputs
+        if result is None or not outputs:
+            return
+        if len(outputs) == 1:
+            context[outputs[0]] = result
+            return
+        for name, value in result.items():
+            if name not in outputs:
+                raise ValueError(f'{self.stage.name} returned an undeclared output: {name}')
+            if value is not None:
+                context[name] = value
+
+
+class Pipeline:
+    """
+    단계 그래프 실행기
+
+    Args:
+        graph (PipelineGraph): 단계 그래프
+        name (str): 지표에 사용할 클라이언트 이름
+        queue_size (int): pipelined 실행에서 단계 사이 큐 크기
+    """
+    def __init__(self, graph: PipelineGraph, name: str = 'client1', queue_size: int = PIPELINE_QUEUE_SIZE):
+        self.graph = graph
+        self.name = name
+        self.queue_size = queue_size
+        self.on_complete = None     # pipelined 실행에서 프레임 처리가 끝나면 컨텍스트로 호출
+        self._runners = None
+        self._threads = []
+
+    def _prepare(self):
+        if self._runners is None:
+            self._runners = [_StageRunner(stage, self.name) for stage in self.graph.stages]
+
+    def run(self, context: dict) -> dict:
+        """
+        프레임 하나를 모든 단계에 순서대로 통과시킴 (단계에서 발생한 예외는 그대로 전달)
+
+        Args:
+            context (dict): 입력(graph.sources)을 채운 프레임 컨텍스트
+
+        Returns:
+            dict: 모든 출력을 채운 컨텍스트
+        """
+        self._prepare()
+        for runner in self._runners:
+            runner.finish(context, runner.start(context))
+            if 'error' in context:
+                raise context['error']
+        return context
+
+    def start(self, on_complete: Callable[[dict], None] = None):
+        """
+        단계마다 쓰레드를 만들어 pipelined 실행 시작
+
+        Args:
+            on_complete (Callable[[dict], None], optional): 프레임 처리가 끝날 때마다 호출 (마지막 단계 쓰레드에서 호출)
+        """
+        self._prepare()
+        if on_complete is not None:
+            self.on_complete = on_complete
+        for runner in self._runners:
+            runner.queue = Queue(maxsize=self.queue_size)
+            metrics.pipeline_queue_depth.labels(self.name, runner.stage.name).set_function(runner.queue.qsize)
+        for i, runner in enumerate(self._runners):
+            output = self._runners[i + 1].queue if i + 1 < len(self._runners) else None
+            thread = threading.Thread(target=self._run_stage, args=(runner, output),
+                                      name=f'Pipeline {self.name} {runner.stage.name}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, context: dict):
+        """
+        pipelined 실행에 프레임 추가 (첫 단계의 큐가 가득 차면 기다림)
+        """
+        self._runners[0].queue.put(context)
+
+    def stop(self):
+        """
+        남은 프레임을 모두 처리한 뒤 단계 쓰레드와 실행기 종료
+        """
+        if self._threads:
+            self._runners[0].queue.put(_STOP)
+            for thread in self._threads:
+                thread.join()
+            self._threads = []
+        if self._runners is not None:
+            for runner in self._runners:
+                runner.executor.shutdown()
+
+    def _run_stage(self, runner: _StageRunner, output: Queue | None):
+        """
+        단계 쓰레드: 입력 큐에서 프레임을 꺼내 실행하고, 작업자 수만큼 동시에 실행하면서 들어온 순서대로 다음 큐로 전달
+        """
+        in_flight = deque()
+        while True:
+            context = runner.queue.get()
+            if context is _STOP:
+                while in_flight:
+                    self._forward(runner, output, *in_flight.popleft())
+                if output is not None:
+                    output.put(_STOP)
+                return
+            tracer.set_frame(context.get('frame_id'))
+            in_flight.append((context, runner.start(context)))
+            # 작업자가 모두 바쁘거나 기다리는 프레임이 없으면 가장 오래된 프레임부터 완료
+            while in_flight and (len(in_flight) >= runner.stage.workers or runner.queue.empty()
+                                 or in_flight[0][1] is None or in_flight[0][1].done()):
+                self._forward(runner, output, *in_flight.popleft())
+
+    def _forward(self, runner: _StageRunner, output: Queue | None, context: dict, future: Future | None):
+        runner.finish(context, future)
+        if output is not None:
+            output.put(context)
+        elif self.on_complete is not None:
+            try:
+                self.on_complete(context)
+            except Exception:
+                traceback.print_exc()
@@ -0,0 +1,107 @@
+"""
+자세 분류 결과 캐시 모듈
+
+바벨을 잠그고 있거나 세트 사이에 누워 있는 동안에는 연속된 프레임의 키 포인트가 거의 같으므로,
+skeleton 이미지에 그려지는 도형(키 포인트의 정수 픽셀 좌표와 ROI 크기)을 키로 자세 분류 결과를 보관하고
+같은 키가 나오면 분류 모델을 생략합니다. 키가 같으면 PoseEstimator.visualize가 그리는 이미지도 같으므로
+캐시된 점수는 분류 모델을 실행한 결과와 정확히 같습니다.
+"""
+import configparser
+from collections import OrderedDict
+
+import numpy as np
+
+from utils import metrics
+
+
+# 설정 가져오기
+__config = configparser.ConfigParser()
+__config.read('config.ini')
+
+POSE_CACHE_ENABLED = __config['pose_cache'].getboolean('enabled')
+POSE_CACHE_CAPACITY = int(__config['pose_cache']['capacity'])
+POSE_CACHE_MOTION_THRESHOLD = float(__config['pose_cache']['motion_threshold'])
+
+KEYPOINT_THRESHOLD = 0.3    # PoseEstimator.visualize가 그리는 키 포인트의 최소 신뢰도
+
+
+class PoseClassCache:
+    """
+    skeleton 이미지의 도형을 키로 자세 분류 점수를 보관하는 LRU 캐시
+
+    Args:
+        capacity (int): 보관할 최대 결과 수 (넘으면 가장 오래 사용하지 않은 결과부터 삭제)
+        name (str): 지표에 사용할 클라이언트 이름
+    """
+    def __init__(self, capacity: int = POSE_CACHE_CAPACITY, name: str = 'client1'):
+        self.capacity = capacity
+        self._entries = OrderedDict()
+
+        # 지표
+        self._hits = metrics.pose_cache_lookups.labels(name, 'hit')
+        self._misses = metrics.pose_cache_lookups.labels(name, 'miss')
+        metrics.pose_cache_size.labels(name).set_function(lambda: len(self._entries))
+        metrics.pose_cache_hit_ratio.labels(name).set_function(self.hit_ratio)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def hit_ratio(self) -> float:
+        """
+        지금까지의 캐시 적중률 (조회가 없으면 NaN)
+        """
+        lookups = self._hits.value + self._misses.value
+        return self._hits.value / lookups if lookups else float('nan')
+
+    def key(self, keypoints: np.ndarray, source_shape: tuple) -> bytes:
+        """
+        키 포인트의 캐시 키 (그려질 키 포인트의 픽셀 좌표 + 그려질 키 포인트 여부 + ROI 크기)
+        PoseEstimator.visualize와 같게 int(너비 * x), int(높이 * y)로 계산하므로
+        키가 같으면 skeleton 이미지가 픽셀 단위로 같습니다.
+
+        Args:
+            keypoints (np.ndarray): 키 포인트 (17, 3) - (y, x, score)
+            source_shape (tuple): 키 포인트를 추정한 ROI의 형태 (높이, 너비, ...)
+
+        Returns:
+            bytes: 캐시 키
+        """
+        height, width = source_shape[:2]
+        # astype은 int()와 같이 0 방향으로 버림
+        pixels = np.stack([keypoints[:, 1] * width, keypoints[:, 0] * height], axis=1).astype(np.int64)
+        visible = keypoints[:, 2] > KEYPOINT_THRESHOLD
+        # 그려지지 않는 키 포인트의 좌표는 결과에 영향이 없으므로 키에서 제외
+        pixels[~visible] = -1
+        return (pixels.tobytes() + np.packbits(visible).tobytes()
+                + np.array([height, width], dtype=np.int64).tobytes())
+
+    def get(self, key: bytes) -> np.ndarray:
+        """
+        캐시된 자세 분류 점수 조회
+
+        Args:
+            key (bytes): 캐시 키
+
+        Returns:
+            np.ndarray: 클래스별 점수, 없으면 None
+        """
+        class_scores = self._entries.get(key)
+        if class_scores is None:
+            self._misses.inc()
+            return None
+        self._entries.move_to_end(key)
+        self._hits.inc()
+        return class_scores
+
+    def put(self, key: bytes, class_scores: np.ndarray):
+        """
+        자세 분류 점수 저장
+
+        Args:
+            key (bytes): 캐시 키
+            class_scores (np.ndarray): 클래스별 점수
+        """
+        self._entries[key] = class_scores
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
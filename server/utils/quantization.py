@@ -0,0 +1,74 @@
+"""
+INT8 양자화 모듈
+
+기록된 사고 영상으로 만든 모델별 입력(utils.clips)을 보정(calibration) 입력으로 사용하여
+NNCF 학습 후 양자화(post-training quantization)로 INT8 IR을 원본 옆에 저장합니다.
+보정에 사용하지 않은 영상으로 원본과 INT8 모델의 지연 시간, 처리량, 출력 차이를 비교합니다.
+"""
+import nncf
+import numpy as np
+import openvino as ov
+
+from utils.autotune import measure_latency, measure_throughput
+from utils.backend import get_core
+from utils.clips import compare_outputs
+from utils.model import precision_model_path
+
+
+def quantize(model_path: str, inputs: list[np.ndarray], output_path: str,
+             preset: str = 'mixed', fast_bias_correction: bool = True) -> str:
+    """
+    NNCF 학습 후 양자화로 INT8 IR 저장
+
+    Args:
+        model_path (str): 원본 모델 경로
+        inputs (list[np.ndarray]): 보정 입력 텐서
+        output_path (str): 저장할 INT8 모델 경로 (.xml)
+        preset (str): 'performance' (대칭 양자화) 또는 'mixed' (활성값 비대칭 양자화)
+        fast_bias_correction (bool): 빠른 편향 보정 사용 여부 (False면 느리지만 더 정확한 보정)
+
+    Returns:
+        str: 저장한 모델 경로
+    """
+    model = get_core().read_model(model_path)
+    dataset = nncf.Dataset(inputs)
+    quantized = nncf.quantize(
+        model, dataset,
+        preset=nncf.QuantizationPreset.MIXED if preset == 'mixed' else nncf.QuantizationPreset.PERFORMANCE,
+        subset_size=len(inputs),
+        fast_bias_correction=fast_bias_correction)
+    ov.save_model(quantized, output_path, compress_to_fp16=False)
+    return output_path
+
+
+def infer_all(model_path: str, inputs: list[np.ndarray]) -> list[np.ndarray]:
+    """
+    모든 입력의 출력 (첫 번째 출력만)
+    """
+    compiled = get_core().compile_model(model_path, 'CPU')
+    request = compiled.create_infer_request()
+    return [request.infer({0: input_tensor})[compiled.output(0)].copy() for input_tensor in inputs]
+
+
+def benchmark(kind: str, model_path: str, inputs: list[np.ndarray], min_time: float = 2.0) -> dict:
+    """
+    원본 모델과 INT8 모델의 지연 시간, 처리량, 출력 차이 비교
+
+    Args:
+        kind (str): 모델 종류
+        model_path (str): 원본 모델 경로 (INT8 모델은 precision_model_path(model_path, 'int8'))
+        inputs (list[np.ndarray]): 평가 입력 텐서
+        min_time (float): 항목별 최소 측정 시간(초)
+
+    Returns:
+        dict: {'float': {...}, 'int8': {...}, 'accuracy': {...}}
+    """
+    int8_path = precision_model_path(model_path, 'int8')
+    report = {}
+    for precision, path in (('float', model_path), ('int8', int8_path)):
+        report[precision] = measure_latency(path, inputs, {'PERFORMANCE_HINT': 'LATENCY'}, min_time)
+        report[precision]['throughput_fps'] = measure_throughput(
+            path, inputs, {'PERFORMANCE_HINT': 'THROUGHPUT'}, min_time)
+    report['accuracy'] = compare_outputs(kind, infer_all(model_path, inputs), infer_all(int8_path, inputs))
+    report['inputs'] = len(inputs)
+    return report
@@ -0,0 +1,281 @@
+"""
+프레임별 추론 기록 모듈
+
+Inferencer가 계산한 결과(경계 상자, 키 포인트, 분류 점수, 선택된 자세, 경고 전환)를
+고정 크기 레코드로 바이너리 파일에 추가 기록하고, 오프라인 분석을 위해 메모리 맵으로 읽어옵니다.
+세그먼트 파일 전체 크기가 max_total_mb를 넘으면 가장 오래된 세그먼트부터 삭제합니다.
+"""
+import configparser
+import datetime
+import glob
+import os
+import struct
+import threading
+import traceback
+from queue import Queue, Empty
+
+import numpy as np
+
+
+# 설정 가져오기
+__config = configparser.ConfigParser()
+__config.read('config.ini')
+
+RECORD_LOG_ENABLED = __config['record_log'].getboolean('enabled')
+RECORD_LOG_OUTPUT_DIR = __config['record_log']['output_dir']
+RECORD_LOG_MAX_SEGMENT_BYTES = int(float(__config['record_log']['max_segment_mb']) * 1024 * 1024)
+RECORD_LOG_MAX_TOTAL_BYTES = int(float(__config['record_log']['max_total_mb']) * 1024 * 1024)
+
+NUM_KEYPOINTS = 17
+NUM_CLASSES = 2     # 분류 모델의 출력 클래스 수 (0: pull, 1: push)
+
+# 레코드 형식 (고정 크기)
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),                           # 추론 시간 (time.time())
+    ('frame_index', '<u8'),                         # 프레임 번호
+    ('person_detected', 'u1'),                      # 사람 감지 여부
+    ('num_boxes', '<u2'),                           # 감지된 사람 수
+    ('box', '<f4', (4,)),                           # 첫 번째 경계 상자 (x1, y1, x2, y2)
+    ('box_score', '<f4'),                           # 첫 번째 경계 상자 점수
+    ('pose_inferred', 'u1'),                        # 자세 추론 수행 여부
+    ('keypoints', '<f4', (NUM_KEYPOINTS, 3)),       # 키 포인트 (y, x, score)
+    ('class_scores', '<f4', (NUM_CLASSES,)),        # 분류 점수
+    ('predicted_index', 'i1'),                      # 분류 결과 (-1: 추론하지 않음)
+    ('confidence', '<f4'),                          # 분류 신뢰도
+    ('selected_index', 'i1'),                       # 필터링 후 선택된 자세
+    ('warning_active', 'u1'),                       # 경고 상태 여부
+    ('event', 'u1'),                                # 경고 전환 이벤트
+])
+
+# 세그먼트 파일 헤더: 매직 넘버(8) + 레코드 크기(4) + 예약(52)
+SEGMENT_MAGIC = b'BSPREC01'
+SEGMENT_HEADER_SIZE = 64
+SEGMENT_EXTENSION = '.rec'
+
+
+def _segment_header() -> bytes:
+    header = SEGMENT_MAGIC + struct.pack('<I', RECORD_DTYPE.itemsize)
+    return header.ljust(SEGMENT_HEADER_SIZE, b'\x00')
+
+
+class InferenceLogWriter(threading.Thread):
+    """
+    추론 기록을 백그라운드에서 세그먼트 파일로 저장하는 쓰레드
+    추론 경로에서는 값을 큐에 넣기만 하고, 레코드 변환과 파일 쓰기는 이 쓰레드에서 수행합니다.
+
+    Args:
+        output_dir (str): 저장 디렉토리
+        name (str): 세그먼트 파일 이름 접두사
+        max_segment_bytes (int): 세그먼트 파일 최대 크기 (초과 시 새 파일 생성)
+        max_total_bytes (int): 같은 이름의 세그먼트 파일 전체 최대 크기 (초과 시 오래된 파일 삭제, 0: 제한 없음)
+    """
+    def __init__(self, output_dir: str = RECORD_LOG_OUTPUT_DIR, name: str = 'client1',
+                 max_segment_bytes: int = RECORD_LOG_MAX_SEGMENT_BYTES,
+                 max_total_bytes: int = RECORD_LOG_MAX_TOTAL_BYTES):
+        super().__init__()
+        self._output_dir = output_dir
+        self._name = name
+        self._max_segment_bytes = max_segment_bytes
+        self._max_total_bytes = max_total_bytes
+        self._queue = Queue()
+        self._file = None               # 현재 세그먼트 파일
+        self._segment_bytes = 0         # 현재 세그먼트 크기
+        self._segment_count = 0         # 생성한 세그먼트 수
+        self._running = True
+
+    def write(self, state):
+        """
+        현재 프레임의 추론 결과 기록 요청
+
+        Args:
+            state (InferenceState): 추론 상태 객체
+        """
+        # 배열은 프레임마다 새로 생성되므로 참조만 전달
+        self._queue.put((
+            state.timestamp, state.frame_index, state.person_detected,
+            state.boxes, state.box_scores, state.keypoints, state.class_scores,
+            state.predicted_index, state.confidence, state.selected_index,
+            state.warning_active, state.event))
+
+    def _open_segment(self):
+        """
+        새 세그먼트 파일 생성
+        """
+        if self._file is not None:
+            self._file.close()
+
+        os.makedirs(self._output_dir, exist_ok=True)
+        stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+        path = os.path.join(self._output_dir,
+                            f'{self._name}-{stamp}-{self._segment_count:04d}{SEGMENT_EXTENSION}')
+        self._file = open(path, 'wb')
+        self._file.write(_segment_header())
+        self._segment_bytes = SEGMENT_HEADER_SIZE
+        self._segment_count += 1
+        self._remove_old_segments(path)
+
+    def _remove_old_segments(self, current: str):
+        """
+        현재 세그먼트를 제외한 같은 이름의 세그먼트 파일 크기와 현재 세그먼트 최대 크기의 합이
+        max_total_bytes를 넘지 않도록 가장 오래된 파일부터 삭제 (이전 실행에서 만든 파일 포함)
+        """
+        if self._max_total_bytes <= 0:
+            return
+        # 파일 이름에 생성 시간과 순번이 들어있으므로 이름 순서가 생성 순서
+        paths = sorted(path for path in glob.glob(os.path.join(self._output_dir, f'{self._name}-*{SEGMENT_EXTENSION}'))
+                       if path != current)
+        sizes = [os.path.getsize(path) for path in paths]
+        total = sum(sizes) + self._max_segment_bytes
+        for path, size in zip(paths, sizes):
+            if total <= self._max_total_bytes:
+                break
+            os.remove(path)
+            total -= size
+            print(f'Removed old inference record {path}')
+
+    def _to_records(self, items: list) -> np.ndarray:
+        """
+        큐에서 꺼낸 값들을 레코드 배열로 변환
+        """
+        records = np.zeros(len(items), dtype=RECORD_DTYPE)
+        records['predicted_index'] = -1
+        for record, (timestamp, frame_index, person_detected, boxes, box_scores,
+                     keypoints, class_scores, predicted_index, confidence,
+                     selected_index, warning_active, event) in zip(records, items):
+            record['timestamp'] = timestamp
+            record['frame_index'] = frame_index
+            record['person_detected'] = person_detected
+            record['selected_index'] = selected_index
+            record['warning_active'] = warning_active
+            record['event'] = event
+            if boxes is not None and len(boxes) > 0:
+                record['num_boxes'] = len(boxes)
+                record['box'] = boxes[0]
+                record['box_score'] = box_scores[0]
+            if predicted_index is not None:
+                record['pose_inferred'] = 1
+                record['keypoints'] = keypoints
+                record['class_scores'] = class_scores
+                record['predicted_index'] = predicted_index
+                record['confidence'] = confidence
+        return records
+
+    def _flush(self, items: list):
+        """
+        레코드를 파일에 기록 (크기 초과 시 세그먼트 교체)
+        """
+        data = self._to_records(items).tobytes()
+        if self._file is None or self._segment_bytes + len(data) > self._max_segment_bytes:
+            self._open_segment()
+        self._file.write(data)
+        self._file.flush()
+        self._segment_bytes += len(data)
+
+    def _drain(self) -> list:
+        """
+        큐에 쌓인 값을 한 번에 꺼냄
+        """
+        items = []
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except Empty:
+                return items
+
+    def run(self):
+        try:
+            while self._running:
+                try:
+                    items = [self._queue.get(timeout=0.5)]
+                except Empty:
+                    continue
+                self._flush(items + self._drain())
+
+            # 종료 전 남은 기록 저장
+            items = self._drain()
+            if items:
+                self._flush(items)
+        except Exception:
+            traceback.print_exc()
+            self._running = False
+        finally:
+            if self._file is not None:
+                self._file.close()
+
+    def stop(self):
+        self._running = False
+
+
+class InferenceLogReader:
+    """
+    추론 기록 세그먼트를 메모리 맵으로 읽는 클래스
+
+    Args:
+        path (str): 세그먼트 파일 또는 세그먼트가 저장된 디렉토리 경로
+    """
+    def __init__(self, path: str):
+        if os.path.isdir(path):
+            self.segments = sorted(glob.glob(os.path.join(path, '*' + SEGMENT_EXTENSION)))
+        else:
+            self.segments = [path]
+
+    @staticmethod
+    def read_segment(path: str) -> np.ndarray:
+        """
+        세그먼트 파일을 레코드 배열로 메모리 맵
+
+        Args:
+            path (str): 세그먼트 파일 경로
+
+        Returns:
+            np.ndarray: RECORD_DTYPE 레코드 배열 (읽기 전용 메모리 맵)
+        """
+        with open(path, 'rb') as f:
+            header = f.read(SEGMENT_HEADER_SIZE)
+        if header[:len(SEGMENT_MAGIC)] != SEGMENT_MAGIC:
+            raise ValueError(f'Invalid record segment: {path}')
+        record_size = struct.unpack('<I', header[len(SEGMENT_MAGIC):len(SEGMENT_MAGIC) + 4])[0]
+        if record_size != RECORD_DTYPE.itemsize:
+            raise ValueError(f'Record size mismatch: {record_size} != {RECORD_DTYPE.itemsize} ({path})')
+
+        # 기록 도중 종료되어 잘린 마지막 레코드는 무시
+        count = (os.path.getsize(path) - SEGMENT_HEADER_SIZE) // record_size
+        if count == 0:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        return np.memmap(path, dtype=RECORD_DTYPE, mode='r',
+                         offset=SEGMENT_HEADER_SIZE, shape=(count,))
+
+    def __iter__(self):
+        for path in self.segments:
+            yield self.read_segment(path)
+
+    def read(self, start: float = None, end: float = None) -> np.ndarray:
+        """
+        모든 세그먼트를 하나의 레코드 배열로 읽음
+
+        Args:
+            start (float, optional): 시작 시간 (timestamp)
+            end (float, optional): 종료 시간 (timestamp)
+
+        Returns:
+            np.ndarray: RECORD_DTYPE 레코드 배열
+        """
+        arrays = []
+        for records in self:
+            if len(records) == 0:
+                continue
+            # 시간 범위를 벗어나는 세그먼트는 건너뜀
+            if start is not None and records['timestamp'][-1] < start:
+                continue
+            if end is not None and records['timestamp'][0] > end:
+                continue
+            mask = np.ones(len(records), dtype=bool)
+            if start is not None:
+                mask &= records['timestamp'] >= start
+            if end is not None:
+                mask &= records['timestamp'] <= end
+            arrays.append(records[mask])
+
+        if not arrays:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        return np.concatenate(arrays)
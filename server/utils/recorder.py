@@ -0,0 +1,300 @@
+"""
+사고 영상 기록 모듈
+
+클라이언트로부터 수신한 JPEG 바이트를 그대로 링 버퍼에 보관하고,
+경고/긴급 상황이 발생하면 이벤트 전후 구간을 재인코딩 없이 MJPEG AVI 파일로 저장합니다.
+저장된 영상 전체 크기가 max_total_mb를 넘으면 가장 오래된 영상부터 삭제합니다.
+"""
+import configparser
+import datetime
+import glob
+import os
+import struct
+import threading
+import time
+import traceback
+from collections import deque
+from queue import Queue, Empty
+
+
+# 설정 가져오기
+__config = configparser.ConfigParser()
+__config.read('config.ini')
+
+RECORDER_ENABLED = __config['recorder'].getboolean('enabled')
+RECORDER_OUTPUT_DIR = __config['recorder']['output_dir']
+RECORDER_PRE_SECONDS = float(__config['recorder']['pre_seconds'])
+RECORDER_POST_SECONDS = float(__config['recorder']['post_seconds'])
+RECORDER_MAX_BUFFER_BYTES = int(float(__config['recorder']['max_buffer_mb']) * 1024 * 1024)
+RECORDER_MAX_TOTAL_BYTES = int(float(__config['recorder']['max_total_mb']) * 1024 * 1024)
+
+
+class FrameRingBuffer:
+    """
+    수신한 JPEG 바이트를 최근 N초 동안 보관하는 링 버퍼
+    메모리 사용량은 프레임 수가 아닌 바이트 수로 제한됩니다.
+
+    Args:
+        max_seconds (float): 보관할 최대 시간(초)
+        max_bytes (int): 보관할 최대 바이트 수
+    """
+    def __init__(self, max_seconds: float, max_bytes: int):
+        self._max_seconds = max_seconds
+        self._max_bytes = max_bytes
+        self._frames = deque()      # (수신 시간, JPEG 바이트)
+        self._total_bytes = 0       # 현재 보관 중인 바이트 수
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def append(self, timestamp: float, data: bytes):
+        """
+        프레임 추가 (디코딩하지 않은 JPEG 바이트를 그대로 보관)
+
+        Args:
+            timestamp (float): 프레임 수신 시간
+            data (bytes): JPEG 바이트
+        """
+        with self._lock:
+            self._frames.append((timestamp, data))
+            self._total_bytes += len(data)
+
+            # 시간 또는 바이트 제한을 넘는 오래된 프레임 제거
+            oldest = timestamp - self._max_seconds
+            while self._frames and (self._total_bytes > self._max_bytes
+                                    or self._frames[0][0] < oldest):
+                _, old_data = self._frames.popleft()
+                self._total_bytes -= len(old_data)
+
+    def snapshot(self, start: float, end: float) -> list[tuple[float, bytes]]:
+        """
+        지정한 시간 구간의 프레임 목록 반환
+
+        Args:
+            start (float): 시작 시간
+            end (float): 종료 시간
+
+        Returns:
+            list[tuple[float, bytes]]: (수신 시간, JPEG 바이트) 목록
+        """
+        with self._lock:
+            return [frame for frame in self._frames if start <= frame[0] <= end]
+
+
+def _jpeg_size(data: bytes) -> tuple[int, int]:
+    """
+    JPEG 헤더의 SOF 마커에서 이미지 크기를 읽는 함수
+
+    Args:
+        data (bytes): JPEG 바이트
+
+    Returns:
+        tuple[int, int]: (너비, 높이)
+    """
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xFF:
+            offset += 1
+            continue
+        marker = data[offset + 1]
+        # SOF0 ~ SOF15 (DHT, JPG, DAC 제외)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack('>HH', data[offset + 5:offset + 9])
+            return width, height
+        # 길이 정보가 없는 마커
+        if marker == 0xFF or marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            offset += 2 if marker != 0xFF else 1
+            continue
+        segment_length = struct.unpack('>H', data[offset + 2:offset + 4])[0]
+        offset += 2 + segment_length
+    raise ValueError('Invalid JPEG data: SOF marker not found')
+
+
+def _chunk(fourcc: bytes, payload: bytes) -> bytes:
+    """
+    RIFF 청크 생성 (홀수 길이는 1바이트 패딩)
+    """
+    padding = b'\x00' if len(payload) % 2 else b''
+    return fourcc + struct.pack('<I', len(payload)) + payload + padding
+
+
+def _list(list_type: bytes, payload: bytes) -> bytes:
+    """
+    RIFF LIST 청크 생성
+    """
+    return _chunk(b'LIST', list_type + payload)
+
+
+def write_mjpeg_avi(path: str, frames: list[tuple[float, bytes]]):
+    """
+    JPEG 프레임을 디코딩/재인코딩 없이 이어 붙여 MJPEG AVI 파일로 저장하는 함수
+
+    Args:
+        path (str): 저장할 파일 경로
+        frames (list[tuple[float, bytes]]): (수신 시간, JPEG 바이트) 목록
+    """
+    if not frames:
+        raise ValueError('No frames to write')
+
+    width, height = _jpeg_size(frames[0][1])
+
+    # 수신 시간으로부터 평균 FPS 계산
+    duration = frames[-1][0] - frames[0][0]
+    fps = (len(frames) - 1) / duration if len(frames) > 1 and duration > 0 else 30.0
+    max_frame_size = max(len(data) for _, data in frames)
+
+    # movi 리스트와 idx1 인덱스 생성
+    movi_chunks = []
+    index_entries = []
+    offset = 4      # 'movi' fourcc 다음부터의 오프셋
+    for _, data in frames:
+        chunk = _chunk(b'00dc', data)
+        movi_chunks.append(chunk)
+        # AVIIF_KEYFRAME(0x10)
+        index_entries.append(b'00dc' + struct.pack('<III', 0x10, offset, len(data)))
+        offset += len(chunk)
+
+    avih = struct.pack(
+        '<14I',
+        int(1_000_000 / fps),               # dwMicroSecPerFrame
+        int(max_frame_size * fps),          # dwMaxBytesPerSec
+        0,                                  # dwPaddingGranularity
+        0x10,                               # dwFlags (AVIF_HASINDEX)
+        len(frames),                        # dwTotalFrames
+        0,                                  # dwInitialFrames
+        1,                                  # dwStreams
+        max_frame_size,                     # dwSuggestedBufferSize
+        width, height,                      # dwWidth, dwHeight
+        0, 0, 0, 0)                         # dwReserved
+    strh = struct.pack(
+        '<4s4sIHHIIIIIIIIhhhh',
+        b'vids', b'MJPG',                   # fccType, fccHandler
+        0, 0, 0,                            # dwFlags, wPriority, wLanguage
+        0,                                  # dwInitialFrames
+        1000, int(fps * 1000),              # dwScale, dwRate
+        0, len(frames),                     # dwStart, dwLength
+        max_frame_size,                     # dwSuggestedBufferSize
+        0xFFFFFFFF,                         # dwQuality
+        0,                                  # dwSampleSize
+        0, 0, width, height)                # rcFrame
+    strf = struct.pack(
+        '<IiiHH4sIiiII',
+        40, width, height, 1, 24, b'MJPG',  # BITMAPINFOHEADER
+        width * height * 3, 0, 0, 0, 0)
+
+    header = _list(b'hdrl', _chunk(b'avih', avih)
+                   + _list(b'strl', _chunk(b'strh', strh) + _chunk(b'strf', strf)))
+    movi = _list(b'movi', b''.join(movi_chunks))
+    idx1 = _chunk(b'idx1', b''.join(index_entries))
+    body = b'AVI ' + header + movi + idx1
+
+    # 임시 파일에 쓴 후 이름 변경 (쓰는 도중의 파일이 남지 않도록)
+    temp_path = path + '.part'
+    with open(temp_path, 'wb') as f:
+        f.write(b'RIFF' + struct.pack('<I', len(body)))
+        f.write(body)
+    os.replace(temp_path, path)
+
+
+class IncidentRecorder(threading.Thread):
+    """
+    경고/긴급 상황 발생 시 전후 영상을 백그라운드에서 저장하는 쓰레드
+
+    Args:
+        frame_buffer (FrameRingBuffer): 프레임 링 버퍼
+        name (str): 클라이언트 이름 (파일명에 사용)
+        output_dir (str): 저장 디렉토리
+        pre_seconds (float): 이벤트 이전 저장 구간(초)
+        post_seconds (float): 이벤트 이후 저장 구간(초)
+        max_total_bytes (int): 같은 클라이언트의 영상 전체 최대 크기 (초과 시 오래된 영상 삭제, 0: 제한 없음)
+    """
+    def __init__(self, frame_buffer: FrameRingBuffer, name: str,
+                 output_dir: str = RECORDER_OUTPUT_DIR,
+                 pre_seconds: float = RECORDER_PRE_SECONDS,
+                 post_seconds: float = RECORDER_POST_SECONDS,
+                 max_total_bytes: int = RECORDER_MAX_TOTAL_BYTES):
+        super().__init__()
+        self._buffer = frame_buffer
+        self._name = name
+        self._output_dir = output_dir
+        self._pre_seconds = pre_seconds
+        self._post_seconds = post_seconds
+        self._max_total_bytes = max_total_bytes
+        self._jobs = Queue()            # (이벤트 시간, 사유)
+        self._pending_until = 0.0       # 저장 대기 중인 구간의 종료 시간
+        self._running = True
+
+    def trigger(self, reason: str):
+        """
+        이벤트 발생 알림 (추론 경로를 막지 않도록 큐에만 추가)
+
+        Args:
+            reason (str): 이벤트 사유 (예: 'warning', 'emergency')
+        """
+        event_time = time.time()
+        # 이미 저장 예정인 구간에 포함되는 이벤트는 무시
+        if event_time <= self._pending_until:
+            return
+        self._pending_until = event_time + self._post_seconds
+        self._jobs.put((event_time, reason))
+
+    def _save(self, event_time: float, reason: str):
+        """
+        이벤트 전후 구간을 파일로 저장
+        """
+        frames = self._buffer.snapshot(event_time - self._pre_seconds,
+                                       event_time + self._post_seconds)
+        if not frames:
+            print(f'No frames to save for the {reason} event. ({self._name})')
+            return
+
+        os.makedirs(self._output_dir, exist_ok=True)
+        stamp = datetime.datetime.fromtimestamp(event_time).strftime('%Y%m%d-%H%M%S')
+        path = os.path.join(self._output_dir, f'{self._name}_{reason}_{stamp}.avi')
+        write_mjpeg_avi(path, frames)
+        print(f'Saved an incident clip: {path} ({len(frames)} frames)')
+        self._remove_old_clips(path)
+
+    def _remove_old_clips(self, current: str):
+        """
+        같은 클라이언트의 영상 전체 크기가 max_total_bytes를 넘지 않도록 가장 오래된 영상부터 삭제
+        (방금 저장한 영상은 삭제하지 않음)
+        """
+        if self._max_total_bytes <= 0:
+            return
+        # 파일 이름이 사유로 시작하므로 수정 시간으로 정렬
+        paths = sorted(glob.glob(os.path.join(self._output_dir, f'{self._name}_*.avi')), key=os.path.getmtime)
+        sizes = [os.path.getsize(path) for path in paths]
+        total = sum(sizes)
+        for path, size in zip(paths, sizes):
+            if total <= self._max_total_bytes:
+                break
+            if path == current:
+                continue
+            os.remove(path)
+            total -= size
+            print(f'Removed old incident clip: {path}')
+
+    def run(self):
+        while self._running:
+            try:
+                event_time, reason = self._jobs.get(timeout=0.5)
+            except Empty:
+                continue
+
+            # 이벤트 이후 구간이 버퍼에 쌓일 때까지 대기
+            while self._running and time.time() < event_time + self._post_seconds:
+                time.sleep(0.1)
+
+            try:
+                self._save(event_time, reason)
+            except Exception:
+                traceback.print_exc()
+
+    def stop(self):
+        self._running = False
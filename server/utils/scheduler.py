@@ -0,0 +1,199 @@
+"""
+추론 스케줄링 모듈
+
+여러 카메라(벤치)가 하나의 Inferencer를 나눠 쓸 때 어떤 카메라의 프레임을 먼저 추론할지 정합니다.
+카메라별로 대기 중인 프레임을 따로 보관하고, 추론에 실제로 걸린 시간을 비용으로 하는
+결손 라운드 로빈(deficit round robin)으로 가중치에 비례하게 추론 시간을 나눕니다.
+
+- 가중치: 카메라별 기본 가중치, 'pull' 상태 진행 중이거나 경고 중이면 boost배
+- 최소 처리율: 프레임이 밀린 카메라가 1 / min_rate초 넘게 처리되지 않으면 차례와 상관없이 먼저 처리
+
+현재 서버(main.py)는 client1 프레임만 워커에 전달하므로, 자세 추론 카메라를 추가하여
+여러 카메라를 담당하는 워커가 생길 때 사용합니다.
+"""
+import configparser
+import time
+from collections import deque
+from typing import Callable
+
+from utils import metrics
+
+
+# 설정 가져오기
+__config = configparser.ConfigParser()
+__config.read('config.ini')
+
+SCHEDULER_ENABLED = __config['scheduler'].getboolean('enabled')
+SCHEDULER_QUANTUM = float(__config['scheduler']['quantum_ms']) / 1000
+SCHEDULER_BOOST = float(__config['scheduler']['boost'])
+SCHEDULER_MIN_RATE = float(__config['scheduler']['min_rate'])
+SCHEDULER_WEIGHTS = __config['scheduler']['weights']
+
+
+def parse_weights(text: str) -> dict[str, float]:
+    """
+    카메라별 가중치 설정 파싱 ('client1:2,client3:0.5' -> {'client1': 2.0, 'client3': 0.5})
+    """
+    weights = {}
+    for part in text.split(','):
+        if part.strip():
+            name, weight = part.split(':')
+            weights[name.strip()] = float(weight)
+    return weights
+
+
+class _Stream:
+    """
+    스케줄러에 등록된 카메라 하나의 상태
+    """
+    def __init__(self, name: str, weight: float, is_boosted: Callable[[], bool], min_rate: float):
+        self.name = name
+        self.weight = weight
+        self.is_boosted = is_boosted
+        self.min_interval = 1 / min_rate if min_rate > 0 else None
+        self.queue = deque()
+        self.deficit = 0.0              # 남은 추론 시간(초), 차례가 올 때마다 quantum * 가중치만큼 증가
+        self.last_served = 0.0          # 마지막으로 추론한 시간
+        self.waiting_since = 0.0        # 대기 프레임이 생긴 시간
+
+        # 지표
+        self.served = metrics.scheduler_served.labels(name)
+        self.service_time = metrics.scheduler_service_time.labels(name)
+        self.guaranteed = metrics.scheduler_guaranteed.labels(name)
+        self.weight_gauge = metrics.scheduler_weight.labels(name)
+        self.weight_gauge.set(weight)
+
+
+class FairScheduler:
+    """
+    카메라별 가중치에 비례하게 추론 시간을 나누는 스케줄러
+    같은 카메라의 프레임은 들어온 순서대로 꺼냅니다.
+
+    Args:
+        quantum (float): 가중치 1인 카메라가 차례마다 받는 추론 시간(초)
+        boost (float): 'pull' 상태 진행 중이거나 경고 중인 카메라의 가중치 배수
+        min_rate (float): 프레임이 밀린 카메라마다 보장할 최소 초당 처리 프레임 수 (0이면 보장하지 않음)
+        clock (Callable[[], float]): 현재 시간을 반환하는 함수
+    """
+    def __init__(self, quantum: float = SCHEDULER_QUANTUM, boost: float = SCHEDULER_BOOST,
+                 min_rate: float = SCHEDULER_MIN_RATE, clock: Callable[[], float] = time.monotonic):
+        self.quantum = quantum
+        self.boost = boost
+        self.min_rate = min_rate
+        self.clock = clock
+        self._streams = {}
+        self._order = []                # 라운드 로빈 순서
+        self._position = 0              # 현재 차례인 카메라
+        self._pending = 0
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def add_stream(self, name: str, weight: float = 1.0, is_boosted: Callable[[], bool] = lambda: False,
+                   min_rate: float = None):
+        """
+        카메라 추가
+
+        Args:
+            name (str): 카메라 이름
+            weight (float): 기본 가중치
+            is_boosted (Callable[[], bool]): 가중치를 높여야 하는 상태인지 반환하는 함수
+            min_rate (float, optional): 최소 초당 처리 프레임 수 (기본값: 스케줄러 설정)
+        """
+        stream = _Stream(name, weight, is_boosted, self.min_rate if min_rate is None else min_rate)
+        self._streams[name] = stream
+        self._order.append(stream)
+
+    def push(self, name: str, item):
+        """
+        대기 프레임 추가
+
+        Args:
+            name (str): 카메라 이름
+            item: 추론할 작업
+        """
+        stream = self._streams[name]
+        if not stream.queue:
+            stream.waiting_since = self.clock()
+        stream.queue.append(item)
+        self._pending += 1
+
+    def pop(self) -> tuple:
+        """
+        다음에 추론할 작업 꺼내기 (추론 후 complete()로 걸린 시간을 알려야 함)
+
+        Returns:
+            tuple: (카메라 이름, 작업), 대기 중인 작업이 없으면 None
+        """
+        if not self._pending:
+            return None
+        now = self.clock()
+
+        # 최소 처리율 보장: 가장 오래 밀린 카메라를 먼저 처리
+        overdue = None
+        for stream in self._order:
+            if stream.queue and stream.min_interval is not None:
+                late = now - max(stream.last_served, stream.waiting_since) - stream.min_interval
+                if late > 0 and (overdue is None or late > overdue[0]):
+                    overdue = (late, stream)
+        if overdue is not None:
+            overdue[1].guaranteed.inc()
+            return self._serve(overdue[1], now)
+
+        # 결손 라운드 로빈: 남은 추론 시간이 있는 동안 같은 카메라를 처리하고, 다 쓰면 다음 카메라로
+        while True:
+            stream = self._order[self._position]
+            if stream.queue and stream.deficit > 0:
+                return self._serve(stream, now)
+            self._position = (self._position + 1) % len(self._order)
+            stream = self._order[self._position]
+            if stream.queue:
+                weight = stream.weight * (self.boost if stream.is_boosted() else 1)
+                stream.weight_gauge.set(weight)
+                stream.deficit += self.quantum * weight
+            else:
+                stream.deficit = 0.0
+
+    def _serve(self, stream: _Stream, now: float) -> tuple:
+        stream.last_served = now
+        self._pending -= 1
+        return stream.name, stream.queue.popleft()
+
+    def complete(self, name: str, service_time: float):
+        """
+        작업 하나의 추론이 끝났을 때 걸린 시간만큼 해당 카메라의 남은 추론 시간 차감
+
+        Args:
+            name (str): 카메라 이름
+            service_time (float): 추론 시간(초)
+        """
+        stream = self._streams[name]
+        stream.deficit -= service_time
+        if not stream.queue:
+            stream.deficit = min(stream.deficit, 0.0)
+        stream.served.inc()
+        stream.service_time.inc(service_time)
+
+
+class FifoScheduler:
+    """
+    들어온 순서대로 꺼내는 스케줄러 (FairScheduler와 같은 인터페이스, 스케줄링을 사용하지 않을 때)
+    """
+    def __init__(self):
+        self._queue = deque()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def add_stream(self, name: str, weight: float = 1.0, is_boosted: Callable[[], bool] = lambda: False,
+                   min_rate: float = None):
+        pass
+
+    def push(self, name: str, item):
+        self._queue.append((name, item))
+
+    def pop(self) -> tuple:
+        return self._queue.popleft() if self._queue else None
+
+    def complete(self, name: str, service_time: float):
+        pass
@@ -0,0 +1,304 @@
+"""
+다중 스트림 상태 저장 모듈
+
+스트림(카메라)마다 InferenceState 객체를 두는 대신 모든 스트림의 상태를 열 단위 배열로 보관하고,
+한 번에 들어온 여러 스트림의 결과를 NumPy 연산 한 번으로 갱신합니다.
+결과 히스토리는 2차원 링 버퍼와 결과별 개수로 관리하여 중간값을 정렬 없이 갱신합니다.
+판단 결과는 스트림마다 DecisionEngine을 사용한 것과 정확히 같습니다.
+여러 카메라를 담당하는 추론 워커(utils.worker)는 Inferencer의 decide 단계 대신 decide 함수로 묶음 단위 갱신을 하고,
+StreamState 어댑터로 InferenceState를 읽는 코드(추론 기록, 스케줄러, CaptureRateController)에 스트림 상태를 전달합니다.
+"""
+from typing import Callable
+
+import numpy as np
+
+from utils.decision import (DecisionEngine, EVENT_NONE, EVENT_RESET_WARNING,
+                            EVENT_SET_WARNING)
+
+
+NUM_LABELS = 3  # 선택 가능한 자세 수 (0: pull, 1: push, 2: unknown)
+
+
+class StateStore:
+    """
+    여러 스트림의 경고 판단 상태를 배열로 관리하는 클래스
+    한 번의 update_detection/update_pose 호출에서 같은 스트림은 한 번만 포함되어야 합니다.
+
+    Args:
+        engine (DecisionEngine, optional): 판단 설정 (기본값: config.ini 설정, 시계는 사용하지 않음)
+        capacity (int): 처음 할당할 스트림 수 (부족하면 두 배씩 늘림)
+    """
+    def __init__(self, engine: DecisionEngine = None, capacity: int = 64):
+        engine = engine if engine is not None else DecisionEngine()
+        self.pose_threshold = engine.pose_threshold
+        self.history_length = engine.history_length
+        self.detection_frame_threshold = engine.detection_frame_threshold
+        self.pull_state_duration = engine.pull_state_duration
+        self.low_confidence_limit = engine.low_confidence_limit
+
+        # 중간값 위치 (median_index와 같게 짝수 길이는 가운데 두 값의 평균을 버림)
+        self._upper_middle = self.history_length // 2
+        self._lower_middle = self._upper_middle if self.history_length % 2 else self._upper_middle - 1
+
+        self.size = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        """
+        열 배열 할당 (기존 스트림 상태는 복사)
+        """
+        old = self.__dict__.copy() if self.size else None
+        self.capacity = capacity
+        self.history = np.zeros((capacity, self.history_length), dtype=np.int8)  # 결과 히스토리 링 버퍼
+        self.history_position = np.zeros(capacity, dtype=np.int64)  # 다음에 쓸 위치
+        self.history_size = np.zeros(capacity, dtype=np.int64)  # 히스토리에 들어있는 결과 수
+        self.label_counts = np.zeros((capacity, NUM_LABELS), dtype=np.int64)  # 히스토리의 결과별 개수
+        self.selected_index = np.full(capacity, 2, dtype=np.int8)
+        self.pull_start_time = np.full(capacity, np.nan)
+        self.warning_active = np.zeros(capacity, dtype=bool)
+        self.person_detected_frame_count = np.zeros(capacity, dtype=np.int64)
+        self.low_confidence_count = np.zeros(capacity, dtype=np.int64)
+        self.person_detected = np.zeros(capacity, dtype=bool)
+        self.timestamp = np.full(capacity, np.nan)
+        self.event = np.zeros(capacity, dtype=np.uint8)
+
+        if old is not None:
+            for name in ('history', 'history_position', 'history_size', 'label_counts',
+                         'selected_index', 'pull_start_time', 'warning_active',
+                         'person_detected_frame_count', 'low_confidence_count',
+                         'person_detected', 'timestamp', 'event'):
+                getattr(self, name)[:self.size] = old[name][:self.size]
+
+    def add_stream(self) -> int:
+        """
+        스트림 추가
+
+        Returns:
+            int: 스트림 번호
+        """
+        if self.size == self.capacity:
+            self._allocate(self.capacity * 2)
+        self.size += 1
+        return self.size - 1
+
+    def _reset(self, streams: np.ndarray):
+        """
+        InferenceState.reset_state와 같은 초기화 (low_confidence_count는 유지)
+        """
+        self.warning_active[streams] = False
+        self.person_detected_frame_count[streams] = 0
+        self.pull_start_time[streams] = np.nan
+        self.history_size[streams] = 0
+        self.label_counts[streams] = 0
+        self.selected_index[streams] = 2
+
+    def update_detection(self, streams: np.ndarray, timestamps: np.ndarray,
+                         person_detected: np.ndarray) -> np.ndarray:
+        """
+        새 프레임 시작 및 사람 감지 결과로 상태 갱신 (DecisionEngine.begin_frame + update_detection)
+
+        Args:
+            streams (np.ndarray): 스트림 번호 배열
+            timestamps (np.ndarray): 스트림별 프레임 시간
+            person_detected (np.ndarray): 스트림별 사람 감지 여부
+
+        Returns:
+            np.ndarray: 스트림별 자세 추론 필요 여부
+        """
+        streams = np.asarray(streams, dtype=np.int64)
+        person_detected = np.asarray(person_detected, dtype=bool)
+        self.timestamp[streams] = timestamps
+        self.event[streams] = EVENT_NONE
+        self.person_detected[streams] = person_detected
+
+        detected = streams[person_detected]
+        self.person_detected_frame_count[detected] += 1
+
+        # 사람이 감지되지 않으면 초기화 (경고 중이었으면 해제 이벤트)
+        lost = streams[~person_detected]
+        self.event[lost[self.warning_active[lost]]] = EVENT_RESET_WARNING
+        self._reset(lost)
+
+        return person_detected & (self.person_detected_frame_count[streams] > self.detection_frame_threshold)
+
+    def update_pose(self, streams: np.ndarray, predicted_index: np.ndarray,
+                    confidence: np.ndarray) -> np.ndarray:
+        """
+        자세 분류 결과로 상태 갱신 (DecisionEngine.update_pose)
+
+        Args:
+            streams (np.ndarray): 스트림 번호 배열 (update_detection에서 자세 추론이 필요했던 스트림)
+            predicted_index (np.ndarray): 스트림별 자세 분류 결과
+            confidence (np.ndarray): 스트림별 자세 분류 신뢰도
+
+        Returns:
+            np.ndarray: 스트림별 경고 전환 이벤트
+        """
+        streams = np.asarray(streams, dtype=np.int64)
+        predicted_index = np.asarray(predicted_index, dtype=np.int64)
+        confidence = np.asarray(confidence)
+        high_mask = confidence > self.pose_threshold
+
+        # 신뢰도가 pose_threshold를 넘은 스트림: 히스토리에 결과 추가
+        high = streams[high_mask]
+        if len(high):
+            label = predicted_index[high_mask]
+            position = self.history_position[high] % self.history_length
+            full = self.history_size[high] == self.history_length
+            # 가득 찬 히스토리는 덮어쓸 가장 오래된 결과의 개수를 뺌
+            np.subtract.at(self.label_counts, (high[full], self.history[high[full], position[full]]), 1)
+            self.history[high, position] = label
+            self.history_position[high] += 1
+            np.add.at(self.label_counts, (high, label), 1)
+            self.history_size[high] = np.minimum(self.history_size[high] + 1, self.history_length)
+
+            # 히스토리가 가득 찬 스트림은 결과별 누적 개수로 중간값 선택
+            filled = high[self.history_size[high] == self.history_length]
+            if len(filled):
+                cumulative = self.label_counts[filled].cumsum(axis=1)
+                lower = (cumulative <= self._lower_middle).sum(axis=1)
+                upper = (cumulative <= self._upper_middle).sum(axis=1)
+                self.selected_index[filled] = (lower + upper) // 2
+
+            # pull 상태 유지 시간 확인
+            pull_mask = self.selected_index[high] == 0
+            pull = high[pull_mask]
+            self.pull_start_time[high[~pull_mask]] = np.nan
+            start = pull[np.isnan(self.pull_start_time[pull])]
+            self.pull_start_time[start] = self.timestamp[start]
+            expired = pull[self.timestamp[pull] - self.pull_start_time[pull] > self.pull_state_duration]
+            self.event[expired[~self.warning_active[expired]]] = EVENT_SET_WARNING
+            self.warning_active[expired] = True
+            self.pull_start_time[expired] = np.nan
+
+            self.low_confidence_count[high] = 0
+
+        # 신뢰도가 낮은 스트림: 연속 횟수가 넘으면 unknown 상태
+        low = streams[~high_mask]
+        if len(low):
+            self.low_confidence_count[low] += 1
+            unknown = low[self.low_confidence_count[low] >= self.low_confidence_limit]
+            self.selected_index[unknown] = 2
+            self.low_confidence_count[unknown] = 0
+
+        return self.event[streams]
+
+
+class StreamState:
+    """
+    StateStore의 스트림 하나를 InferenceState처럼 읽는 어댑터
+    InferenceLogWriter.write, CaptureRateController.update, 스케줄러 우선순위 함수처럼
+    InferenceState의 속성을 읽는 코드에 그대로 전달할 수 있습니다.
+    경고 판단 상태는 StateStore의 배열에서 읽고, 마지막 프레임의 추론 결과는 set_frame으로 기록합니다.
+
+    Args:
+        store (StateStore): 상태 저장소
+        index (int, optional): 스트림 번호 (None이면 새 스트림 추가)
+    """
+    def __init__(self, store: StateStore, index: int = None):
+        self.store = store
+        self.index = store.add_stream() if index is None else index
+
+        # 마지막 프레임의 추론 결과 (기록용)
+        self.frame_index = -1
+        self.boxes = None
+        self.box_scores = None
+        self.keypoints = None
+        self.class_scores = None
+        self.predicted_index = None
+        self.confidence = None
+
+    def set_frame(self, detections: tuple, keypoints: np.ndarray = None, class_scores: np.ndarray = None,
+                  predicted_index: int = None, confidence: float = None):
+        """
+        StateStore 갱신 후 프레임 결과 기록 (InferenceState.begin_frame 이후 decide 단계가 채우는 값과 같음)
+        """
+        self.frame_index += 1
+        self.boxes, self.box_scores, _ = detections
+        self.keypoints = keypoints
+        self.class_scores = class_scores
+        self.predicted_index = predicted_index
+        self.confidence = confidence
+
+    @property
+    def timestamp(self) -> float | None:
+        value = self.store.timestamp[self.index]
+        return None if np.isnan(value) else float(value)
+
+    @property
+    def pull_start_time(self) -> float | None:
+        value = self.store.pull_start_time[self.index]
+        return None if np.isnan(value) else float(value)
+
+    @property
+    def selected_index(self) -> int:
+        return int(self.store.selected_index[self.index])
+
+    @property
+    def warning_active(self) -> bool:
+        return bool(self.store.warning_active[self.index])
+
+    @property
+    def person_detected(self) -> bool:
+        return bool(self.store.person_detected[self.index])
+
+    @property
+    def person_detected_frame_count(self) -> int:
+        return int(self.store.person_detected_frame_count[self.index])
+
+    @property
+    def low_confidence_count(self) -> int:
+        return int(self.store.low_confidence_count[self.index])
+
+    @property
+    def event(self) -> int:
+        return int(self.store.event[self.index])
+
+
+def decide(store: StateStore, results: list[tuple], on_frame: Callable[[int, StreamState], None] = None):
+    """
+    여러 스트림의 프레임 결과로 StateStore를 한 번에 갱신 (Inferencer의 decide 단계와 같은 판단)
+    같은 스트림의 프레임이 여러 개면 한 번의 갱신에 한 프레임씩 들어온 순서대로 나눠서 갱신합니다.
+
+    Args:
+        store (StateStore): 상태 저장소
+        results (list[tuple]): (StreamState, 프레임 컨텍스트) 목록
+            (컨텍스트는 decide 단계를 뺀 Inferencer가 채운 timestamp, detections, keypoints, class_scores)
+        on_frame (Callable[[int, StreamState], None], optional): 프레임마다 상태 갱신 직후 (results의 번호, 상태)로 호출
+            (같은 스트림의 다음 프레임을 갱신하기 전이므로 이 프레임의 결과와 이벤트를 읽을 수 있음)
+    """
+    pending = list(range(len(results)))
+    while pending:
+        selected, deferred, seen = [], [], set()
+        for i in pending:
+            index = results[i][0].index
+            (deferred if index in seen else selected).append(i)
+            seen.add(index)
+        pending = deferred
+
+        states = [results[i][0] for i in selected]
+        contexts = [results[i][1] for i in selected]
+        streams = np.array([state.index for state in states], dtype=np.int64)
+        timestamps = np.array([context['timestamp'] for context in contexts], dtype=float)
+        person_detected = np.array([len(context['detections'][0]) > 0 for context in contexts], dtype=bool)
+        pose_required = store.update_detection(streams, timestamps, person_detected)
+
+        # 자세 추론이 필요하고 분류 결과가 있는 스트림만 자세 갱신
+        predictions = [None] * len(selected)
+        for j, context in enumerate(contexts):
+            class_scores = context.get('class_scores')
+            if pose_required[j] and class_scores is not None:
+                predictions[j] = (int(np.argmax(class_scores)), float(np.max(class_scores)))
+        pose = np.array([prediction is not None for prediction in predictions], dtype=bool)
+        if pose.any():
+            store.update_pose(streams[pose],
+                              [prediction[0] for prediction in predictions if prediction is not None],
+                              [prediction[1] for prediction in predictions if prediction is not None])
+
+        for i, state, context, prediction in zip(selected, states, contexts, predictions):
+            if prediction is None:
+                state.set_frame(context['detections'])
+            else:
+                state.set_frame(context['detections'], context.get('keypoints'), context['class_scores'], *prediction)
+            if on_frame is not None:
+                on_frame(i, state)
@@ -0,0 +1,306 @@
+"""
+임계값 탐색 모듈
+
+기록된 프레임별 분류 결과(추론 기록)로 여러 판단 설정 조합을 한 번에 재현하고,
+라벨링된 사고 구간과 비교하여 오경보율과 경보까지 걸린 시간을 계산합니다.
+모든 조합의 상태를 배열로 두고 NumPy 연산으로 함께 갱신하며, 조합이 많으면 프로세스 풀로 나눠 실행합니다.
+"""
+import csv
+import datetime
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils.decision import LOW_CONFIDENCE_LIMIT
+
+
+NUM_LABELS = 3  # 선택 가능한 자세 수 (0: pull, 1: push, 2: unknown)
+PARAMETER_NAMES = ('pose_threshold', 'history_length',
+                   'detection_frame_threshold', 'pull_state_duration')
+
+
+def make_grid(**values) -> dict[str, np.ndarray]:
+    """
+    파라미터 값 목록의 모든 조합 생성
+
+    Args:
+        **values: 파라미터 이름별 값 목록 (PARAMETER_NAMES)
+
+    Returns:
+        dict[str, np.ndarray]: 파라미터 이름별 조합 배열 (길이 P)
+    """
+    combinations = list(itertools.product(*(values[name] for name in PARAMETER_NAMES)))
+    columns = list(zip(*combinations))
+    return {
+        'pose_threshold': np.array(columns[0], dtype=np.float64),
+        'history_length': np.array(columns[1], dtype=np.int64),
+        'detection_frame_threshold': np.array(columns[2], dtype=np.int64),
+        'pull_state_duration': np.array(columns[3], dtype=np.float64),
+    }
+
+
+def _run_lengths(person_detected: np.ndarray) -> np.ndarray:
+    """
+    프레임별 연속으로 사람이 감지된 프레임 수 (person_detected_frame_count)
+    설정과 무관하므로 모든 조합이 공유합니다.
+    """
+    count = np.arange(1, len(person_detected) + 1)
+    # 마지막으로 사람이 감지되지 않은 프레임 위치
+    last_reset = np.where(person_detected, 0, count)
+    last_reset = np.maximum.accumulate(last_reset)
+    return np.where(person_detected, count - last_reset, 0)
+
+
+def simulate(records: np.ndarray, grid: dict[str, np.ndarray],
+             low_confidence_limit: int = LOW_CONFIDENCE_LIMIT) -> list[np.ndarray]:
+    """
+    모든 설정 조합에 대해 경고 판단 상태 머신을 재현 (DecisionEngine과 같은 결과)
+
+    기록된 자세 추론 결과만 사용하므로, 기록할 때의 detection_frame_threshold보다
+    작은 값은 기록에 없는 프레임의 분류 결과를 볼 수 없습니다.
+
+    Args:
+        records (np.ndarray): 추론 기록 레코드 배열 (RECORD_DTYPE)
+        grid (dict[str, np.ndarray]): 파라미터 조합 (make_grid)
+        low_confidence_limit (int): unknown 상태로 바꾸는 연속 저신뢰도 프레임 수
+
+    Returns:
+        list[np.ndarray]: 조합별 경고 발생 시간 배열
+    """
+    pose_threshold = grid['pose_threshold']
+    history_length = grid['history_length']
+    detection_frame_threshold = grid['detection_frame_threshold']
+    pull_state_duration = grid['pull_state_duration']
+    num_combinations = len(pose_threshold)
+    combination_index = np.arange(num_combinations)
+    max_length = int(history_length.max())
+
+    timestamps = records['timestamp'].tolist()
+    predicted_indexes = records['predicted_index'].tolist()
+    confidences = records['confidence'].tolist()
+    person_detected = records['person_detected'].astype(bool)
+    pose_inferred = records['pose_inferred'].astype(bool)
+    run_lengths = _run_lengths(person_detected)
+
+    # 조합별 상태 (InferenceState의 열 단위 표현)
+    history = np.zeros((num_combinations, max_length), dtype=np.int64)  # 결과 히스토리 링 버퍼
+    history_position = np.zeros(num_combinations, dtype=np.int64)  # 다음에 쓸 위치
+    history_size = np.zeros(num_combinations, dtype=np.int64)  # 히스토리에 들어있는 결과 수
+    label_counts = np.zeros((num_combinations, NUM_LABELS), dtype=np.int64)  # 히스토리의 결과별 개수
+    selected_index = np.full(num_combinations, 2, dtype=np.int64)
+    pull_start_time = np.full(num_combinations, np.nan)
+    warning_active = np.zeros(num_combinations, dtype=bool)
+    low_confidence_count = np.zeros(num_combinations, dtype=np.int64)
+
+    # 중간값 계산에 쓰는 가운데 위치 (np.median과 같게 짝수 길이는 두 값의 평균을 버림)
+    upper_middle = history_length // 2
+    lower_middle = np.where(history_length % 2 == 1, upper_middle, upper_middle - 1)
+
+    events = [[] for _ in range(num_combinations)]
+
+    # 상태가 바뀌는 프레임만 처리: 자세 추론 프레임과 사람이 사라진 첫 프레임
+    was_detected = np.concatenate(([False], person_detected[:-1]))
+    reset_frames = ~person_detected & was_detected
+    for frame in np.flatnonzero(pose_inferred | reset_frames).tolist():
+        if not person_detected[frame]:
+            # 사람이 감지되지 않으면 모든 조합의 상태 초기화
+            warning_active[:] = False
+            pull_start_time[:] = np.nan
+            history_size[:] = 0
+            label_counts[:] = 0
+            selected_index[:] = 2
+            continue
+
+        active = run_lengths[frame] > detection_frame_threshold
+        if not active.any():
+            continue
+
+        now = timestamps[frame]
+        predicted_index = predicted_indexes[frame]
+        confidence = confidences[frame]
+
+        # 신뢰도가 pose_threshold를 넘은 조합: 히스토리에 결과 추가
+        high = active & (confidence > pose_threshold)
+        if high.any():
+            full = high & (history_size == history_length)
+            oldest = history[combination_index, (history_position - history_length) % max_length]
+            np.subtract.at(label_counts, (combination_index[full], oldest[full]), 1)
+            history[combination_index[high], history_position[high] % max_length] = predicted_index
+            history_position[high] += 1
+            label_counts[high, predicted_index] += 1
+            history_size[high] = np.minimum(history_size[high] + 1, history_length[high])
+
+            # 히스토리가 가득 찬 조합은 중간값으로 자세 선택
+            filled = high & (history_size == history_length)
+            if filled.any():
+                cumulative = label_counts.cumsum(axis=1)
+                lower = (cumulative <= lower_middle[:, None]).sum(axis=1)
+                upper = (cumulative <= upper_middle[:, None]).sum(axis=1)
+                selected_index[filled] = ((lower + upper) // 2)[filled]
+
+            # pull 상태 유지 시간 확인
+            pull = high & (selected_index == 0)
+            pull_start_time[high & ~pull] = np.nan
+            pull_start_time[pull & np.isnan(pull_start_time)] = now
+            expired = pull & (now - pull_start_time > pull_state_duration)
+            for combination in np.flatnonzero(expired & ~warning_active):
+                events[combination].append(now)
+            warning_active[expired] = True
+            pull_start_time[expired] = np.nan
+
+            low_confidence_count[high] = 0
+
+        # 신뢰도가 낮은 조합: 연속 횟수가 넘으면 unknown 상태
+        low = active & ~high
+        if low.any():
+            low_confidence_count[low] += 1
+            unknown = low & (low_confidence_count >= low_confidence_limit)
+            selected_index[unknown] = 2
+            low_confidence_count[unknown] = 0
+
+    return [np.array(times) for times in events]
+
+
+def _simulate_chunk(args):
+    records, grid, low_confidence_limit = args
+    return simulate(records, grid, low_confidence_limit)
+
+
+def simulate_parallel(records: np.ndarray, grid: dict[str, np.ndarray],
+                      workers: int = 1, chunk_size: int = 512,
+                      low_confidence_limit: int = LOW_CONFIDENCE_LIMIT) -> list[np.ndarray]:
+    """
+    조합을 여러 묶음으로 나눠 프로세스 풀에서 simulate 실행
+
+    Args:
+        records (np.ndarray): 추론 기록 레코드 배열
+        grid (dict[str, np.ndarray]): 파라미터 조합
+        workers (int): 프로세스 수 (1이면 현재 프로세스에서 실행)
+        chunk_size (int): 한 번에 처리할 조합 수
+        low_confidence_limit (int): unknown 상태로 바꾸는 연속 저신뢰도 프레임 수
+
+    Returns:
+        list[np.ndarray]: 조합별 경고 발생 시간 배열
+    """
+    # 필요한 열만 복사해 프로세스 간 전달량을 줄임
+    records = np.array(records[['timestamp', 'person_detected', 'pose_inferred',
+                                'predicted_index', 'confidence']])
+    num_combinations = len(grid['pose_threshold'])
+    chunks = [{name: values[start:start + chunk_size] for name, values in grid.items()}
+              for start in range(0, num_combinations, chunk_size)]
+
+    if workers <= 1:
+        results = [simulate(records, chunk, low_confidence_limit) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_simulate_chunk,
+                                        [(records, chunk, low_confidence_limit) for chunk in chunks]))
+    return [events for result in results for events in result]
+
+
+def load_incidents(path: str) -> np.ndarray:
+    """
+    라벨링된 사고 구간 파일 읽기
+    CSV 파일의 각 행은 'start,end' 형식이며, 시간은 timestamp 또는 'YYYY-MM-DD HH:MM:SS' 형식입니다.
+
+    Args:
+        path (str): 사고 구간 CSV 파일 경로
+
+    Returns:
+        np.ndarray: (N, 2) 사고 구간 배열 (timestamp)
+    """
+    def parse_time(value: str) -> float:
+        value = value.strip()
+        try:
+            return float(value)
+        except ValueError:
+            return datetime.datetime.fromisoformat(value).timestamp()
+
+    intervals = []
+    with open(path, newline='') as f:
+        for row in csv.reader(f):
+            if not row or row[0].strip().startswith('#') or row[0].strip() == 'start':
+                continue
+            intervals.append((parse_time(row[0]), parse_time(row[1])))
+    return np.array(intervals, dtype=np.float64).reshape(-1, 2)
+
+
+def evaluate(alarms: list[np.ndarray], incidents: np.ndarray, duration: float,
+             tolerance: float = 0.0) -> dict[str, np.ndarray]:
+    """
+    조합별 경고 발생 시간을 사고 구간과 비교하여 지표 계산
+
+    Args:
+        alarms (list[np.ndarray]): 조합별 경고 발생 시간 배열
+        incidents (np.ndarray): (N, 2) 사고 구간 배열
+        duration (float): 기록 전체 시간(초)
+        tolerance (float): 사고 구간 종료 후에도 정상 경보로 인정하는 시간(초)
+
+    Returns:
+        dict[str, np.ndarray]: 지표 이름별 조합 배열
+            false_alarms: 사고 구간 밖의 경고 수
+            false_alarm_rate: 시간당 오경보 수
+            detected: 경고가 발생한 사고 수
+            miss_rate: 경고가 발생하지 않은 사고 비율
+            mean_time_to_alarm, max_time_to_alarm: 사고 시작부터 첫 경고까지 걸린 시간(초)
+    """
+    num_combinations = len(alarms)
+    num_incidents = len(incidents)
+    starts = incidents[:, 0]
+    ends = incidents[:, 1] + tolerance
+
+    false_alarms = np.zeros(num_combinations, dtype=np.int64)
+    detected = np.zeros(num_combinations, dtype=np.int64)
+    mean_time = np.full(num_combinations, np.nan)
+    max_time = np.full(num_combinations, np.nan)
+
+    for combination, times in enumerate(alarms):
+        if len(times) == 0:
+            continue
+        # (경고 수, 사고 수) 포함 여부
+        inside = (times[:, None] >= starts[None, :]) & (times[:, None] <= ends[None, :])
+        false_alarms[combination] = np.count_nonzero(~inside.any(axis=1))
+        if num_incidents == 0:
+            continue
+        first_alarm = np.where(inside, times[:, None], np.inf).min(axis=0)
+        hit = np.isfinite(first_alarm)
+        detected[combination] = np.count_nonzero(hit)
+        if hit.any():
+            delays = first_alarm[hit] - starts[hit]
+            mean_time[combination] = delays.mean()
+            max_time[combination] = delays.max()
+
+    hours = max(duration, 1e-9) / 3600
+    return {
+        'false_alarms': false_alarms,
+        'false_alarm_rate': false_alarms / hours,
+        'detected': detected,
+        'miss_rate': 1 - detected / num_incidents if num_incidents else np.zeros(num_combinations),
+        'mean_time_to_alarm': mean_time,
+        'max_time_to_alarm': max_time,
+    }
+
+
+def pareto_front(*objectives: np.ndarray) -> np.ndarray:
+    """
+    모든 목표를 최소화하는 기준의 파레토 최적 조합 위치
+    (NaN은 가장 나쁜 값으로 취급)
+
+    Args:
+        *objectives (np.ndarray): 목표별 조합 배열
+
+    Returns:
+        np.ndarray: 파레토 최적 조합 인덱스
+    """
+    values = np.stack([np.nan_to_num(objective, nan=np.inf) for objective in objectives], axis=1)
+    # 같은 값의 조합은 하나만 비교
+    unique_values, inverse = np.unique(values, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    efficient = np.ones(len(unique_values), dtype=bool)
+    for i, value in enumerate(unique_values):
+        if not efficient[i]:
+            continue
+        dominated = np.all(unique_values >= value, axis=1) & np.any(unique_values > value, axis=1)
+        efficient[dominated] = False
+    return np.flatnonzero(efficient[inverse])
@@ -1,15 +1,34 @@
 """
 쓰레드 모듈
 """
+import itertools
 import socket
 import struct
+import time
 import traceback
 import threading
 from queue import Queue
+from typing import NamedTuple
 
 import cv2
 import numpy as np
 
+from utils import metrics
+from utils.ov_config import pin_current_thread
+from utils.trace import tracer
+
+
+MESSAGE_DELIMITER = b'\n'  # 메시지 구분자 (메시지마다 끝에 붙여서 전송)
+
+
+class ReceivedFrame(NamedTuple):
+    """
+    수신 쓰레드가 큐에 넣는 프레임
+    """
+    frame_id: int           # 수신 순서 번호
+    enqueue_ns: int         # 큐에 넣은 시간 (time.perf_counter_ns)
+    image: np.ndarray       # 디코딩한 이미지 (None: 클라이언트의 엣지 필터가 보낸 사람 없음 알림)
+
 
 class ImageReceiveThread(threading.Thread):
     """
@@ -17,19 +36,35 @@ class ImageReceiveThread(threading.Thread):
 
     Args:
         client_socket (socket.socket): 클라이언트 소켓
-        image_queue (Queue): 수신한 이미지를 저장할 큐
+        image_queue (Queue): 수신한 이미지(ReceivedFrame)를 저장할 큐
+        client (str, optional): 지표에 사용할 클라이언트 이름
     """
-    def __init__(self, client_socket: socket.socket, image_queue: Queue):
+    def __init__(self, client_socket: socket.socket, image_queue: Queue, client: str = 'client1'):
         super().__init__()
         self._socket = client_socket
         self._queue = image_queue
         self._running = True
+        self.frame_buffer = None    # 수신한 JPEG 바이트를 보관할 링 버퍼 (FrameRingBuffer)
+        self._frame_ids = itertools.count()  # 프레임 번호 (사람 없음 알림도 같은 순서로 번호를 받음)
+        self.cpus = None            # 수신/디코딩을 실행할 CPU 번호 (추론 쓰레드와 분리)
+
+        # 지표
+        self._frames_received = metrics.frames_received.labels(client)
+        self._frames_decoded = metrics.frames_decoded.labels(client)
+        self._frames_dropped = metrics.frames_dropped.labels(client)
+        self._decode_latency = metrics.stage_latency.labels(client, 'decode')
+        metrics.queue_depth.labels(client).set_function(image_queue.qsize)
     
     def __del__(self):
         self._socket.close()
-        cv2.destroyAllWindows()
+        try:
+            cv2.destroyAllWindows()
+        except cv2.error:
+            pass    # 화면이 없는 환경 (예: 성능 측정)
     
     def run(self):
+        pin_current_thread(self.cpus)
+
         # 이미지 수신
         try:
             while self._running:
@@ -38,23 +73,46 @@ class ImageReceiveThread(threading.Thread):
                 if not img_size_data or int.from_bytes(img_size_data, 'big') == 0:
                     break
                 img_size = struct.unpack(">L", img_size_data)[0]
+                frame_id = next(self._frame_ids)
 
                 # 이미지 데이터 수신
-                img_data = b""
-                while len(img_data) < img_size:
-                    data = self._socket.recv(img_size - len(img_data))
-                    if not data:
-                        break
-                    img_data += data
+                with tracer.span('recv', frame_id):
+                    img_data = b""
+                    while len(img_data) < img_size:
+                        data = self._socket.recv(img_size - len(img_data))
+                        if not data:
+                            break
+                        img_data += data
+                self._frames_received.inc()
+                # 연결이 끊겨 이미지를 끝까지 받지 못한 경우
+                if len(img_data) < img_size:
+                    self._frames_dropped.inc()
+                    break
+
+                # 디코딩 전 JPEG 바이트를 그대로 링 버퍼에 보관
+                if self.frame_buffer is not None:
+                    self.frame_buffer.append(time.time(), img_data)
                 
                 # 수신한 데이터를 이미지로 변환하여 큐에 추가
-                img_array = np.frombuffer(img_data, dtype=np.uint8)
-                img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
-                self._queue.put(img)
+                with tracer.span('decode', frame_id), self._decode_latency.time():
+                    img_array = np.frombuffer(img_data, dtype=np.uint8)
+                    img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+                if img is None:
+                    self._frames_dropped.inc()
+                    continue
+                self._frames_decoded.inc()
+                self._queue.put(ReceivedFrame(frame_id, time.perf_counter_ns(), img))
         except Exception as e:
             traceback.print_exc()
             self._running = False
 
+    def put_vacant(self):
+        """
+        클라이언트가 사람이 없다고 알린 경우 이미지 없는 항목을 큐에 추가 (엣지 모드의 'occupancy 0')
+        추론 쓰레드는 이 항목을 사람이 감지되지 않은 프레임으로 처리합니다.
+        """
+        self._queue.put(ReceivedFrame(next(self._frame_ids), time.perf_counter_ns(), None))
+
     def stop(self):
         self._running = False
 
@@ -101,6 +159,7 @@ class MessageReceiveThread(threading.Thread):
         self._socket = client_socket
         self._running = True
         self._callbacks = {}
+        self._buffer = b''  # 구분자를 아직 받지 못한 메시지 조각
     
     def __del__(self):
         self._socket.close()
@@ -124,18 +183,32 @@ class MessageReceiveThread(threading.Thread):
         """
         self._callbacks[message] = callback
     
+    def _dispatch(self, message: str):
+        """
+        수신한 메시지를 콜백 함수에 전달
+
+        Args:
+            message (str): 수신한 메시지 (구분자 제외)
+        """
+        callback = self._callbacks.get(message)
+        if callback is None:
+            self._default_callback(message)
+        else:
+            callback()
+
     def run(self):
         try:
             while self._running:
-                message = self._socket.recv(1024).decode('utf-8')
-                if not message:
+                data = self._socket.recv(1024)
+                if not data:
                     break
-                
-                # 수신한 메시지를 콜백 함수에 전달
-                if message in self._callbacks:
-                    self._callbacks[message]()
-                else:
-                    self._default_callback(message)  
+
+                # 구분자로 메시지를 나누고, 마지막 조각은 다음 수신 데이터와 합침
+                # (메시지 여러 개가 한 번에 오거나 메시지 하나가 나눠서 올 수 있음)
+                *messages, self._buffer = (self._buffer + data).split(MESSAGE_DELIMITER)
+                for message in messages:
+                    # 수신한 메시지를 콜백 함수에 전달
+                    self._dispatch(message.decode('utf-8'))
         except Exception as e:
             traceback.print_exc()
             self._running = False
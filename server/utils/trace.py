@@ -0,0 +1,164 @@
+"""
+구간 추적 모듈
+
+프레임 하나가 수신, 디코딩, 큐 대기, 모델별 전처리/추론/후처리, 판단, 알림 전송에서
+각각 얼마나 시간을 쓰는지 쓰레드별 링 버퍼에 나노초 단위로 기록하고,
+Chrome trace_event JSON 형식(chrome://tracing, Perfetto)으로 내보냅니다.
+비활성화 상태에서는 span()이 아무 일도 하지 않는 객체를 반환하므로 비용이 거의 없습니다.
+"""
+import configparser
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+# 설정 가져오기
+__config = configparser.ConfigParser()
+__config.read('config.ini')
+
+TRACE_ENABLED = __config['trace'].getboolean('enabled')
+TRACE_BUFFER_SIZE = int(__config['trace']['buffer_size'])
+TRACE_OUTPUT_PATH = __config['trace']['output']
+
+
+class _NullSpan:
+    """
+    비활성화 상태에서 사용하는 빈 구간
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """
+    with 문으로 시작/종료 시간을 기록하는 구간
+    """
+    __slots__ = ('_buffer', '_name', '_frame_id', '_start')
+
+    def __init__(self, buffer: deque, name: str, frame_id):
+        self._buffer = buffer
+        self._name = name
+        self._frame_id = frame_id
+        self._start = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = time.perf_counter_ns()
+        self._buffer.append((self._name, self._start, end - self._start, self._frame_id))
+        return False
+
+
+class Tracer:
+    """
+    쓰레드별 링 버퍼에 구간을 기록하는 클래스
+
+    Args:
+        enabled (bool): 기록 여부
+        buffer_size (int): 쓰레드별로 보관할 최대 구간 수 (오래된 구간부터 삭제)
+    """
+    def __init__(self, enabled: bool = False, buffer_size: int = 100000):
+        self.enabled = enabled
+        self._buffer_size = buffer_size
+        self._local = threading.local()
+        self._buffers = []          # (쓰레드 id, 쓰레드 이름, 링 버퍼)
+        self._lock = threading.Lock()
+
+    def _buffer(self) -> deque:
+        """
+        현재 쓰레드의 링 버퍼 (처음 호출 시 생성)
+        """
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = deque(maxlen=self._buffer_size)
+            self._local.buffer = buffer
+            thread = threading.current_thread()
+            with self._lock:
+                self._buffers.append((thread.ident, thread.name, buffer))
+        return buffer
+
+    def set_frame(self, frame_id: int):
+        """
+        현재 쓰레드에서 처리 중인 프레임 번호 설정 (이후 구간에 자동으로 붙음)
+
+        Args:
+            frame_id (int): 프레임 번호
+        """
+        if self.enabled:
+            self._local.frame_id = frame_id
+
+    def span(self, name: str, frame_id: int = None):
+        """
+        구간 기록 (with 문에서 사용)
+
+        Args:
+            name (str): 구간 이름
+            frame_id (int, optional): 프레임 번호 (None이면 set_frame으로 설정한 값)
+
+        Returns:
+            context manager
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        if frame_id is None:
+            frame_id = getattr(self._local, 'frame_id', None)
+        return _Span(self._buffer(), name, frame_id)
+
+    def record(self, name: str, start_ns: int, end_ns: int, frame_id: int = None):
+        """
+        이미 측정한 구간 기록 (예: 다른 쓰레드에서 시작한 큐 대기 시간)
+
+        Args:
+            name (str): 구간 이름
+            start_ns (int): 시작 시간 (time.perf_counter_ns)
+            end_ns (int): 종료 시간 (time.perf_counter_ns)
+            frame_id (int, optional): 프레임 번호
+        """
+        if not self.enabled:
+            return
+        if frame_id is None:
+            frame_id = getattr(self._local, 'frame_id', None)
+        self._buffer().append((name, start_ns, end_ns - start_ns, frame_id))
+
+    def export_chrome(self, path: str = TRACE_OUTPUT_PATH) -> int:
+        """
+        기록한 구간을 Chrome trace_event JSON 파일로 저장
+
+        Args:
+            path (str): 저장 경로
+
+        Returns:
+            int: 저장한 구간 수
+        """
+        pid = os.getpid()
+        events = []
+        with self._lock:
+            buffers = list(self._buffers)
+
+        for tid, thread_name, buffer in buffers:
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                           'args': {'name': thread_name}})
+            for name, start_ns, duration_ns, frame_id in list(buffer):
+                event = {'name': name, 'ph': 'X', 'pid': pid, 'tid': tid,
+                         'ts': start_ns / 1000, 'dur': duration_ns / 1000}
+                if frame_id is not None:
+                    event['args'] = {'frame': frame_id}
+                events.append(event)
+
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return sum(1 for event in events if event['ph'] == 'X')
+
+
+# 서버 전체에서 사용하는 추적 객체
+tracer = Tracer(TRACE_ENABLED, TRACE_BUFFER_SIZE)
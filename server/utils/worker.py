@@ -0,0 +1,430 @@
+"""
+추론 워커 프로세스 모듈
+
+카메라(또는 카메라 묶음)마다 별도의 프로세스에서 Inferencer를 실행하여
+GIL에 묶이지 않고 서버의 모든 코어를 사용합니다.
+
+- 프레임: 공유 메모리의 고정 크기 슬롯에 복사하고, 큐로는 슬롯 번호만 전달
+- 경고 전환 이벤트: 워커별 파이프로 감독 프로세스에 전달
+- 여러 카메라를 담당하는 워커는 스케줄러(utils.scheduler)로 카메라별 추론 순서를 정하고,
+  카메라별 경고 판단 상태는 StateStore(utils.state_store)에 모아 묶음 단위로 한 번에 갱신
+- 워커가 비정상 종료되면 감독 쓰레드가 해당 워커만 다시 시작
+
+현재 서버(main.py)는 client1 프레임만 전달하므로 여러 카메라를 담당하는 워커의 기능
+(사람 검출 배치, 스케줄러, StateStore)은 자세 추론 카메라를 추가할 때 사용합니다.
+"""
+import configparser
+import multiprocessing as mp
+import os
+import threading
+import time
+import traceback
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+from queue import Empty
+
+import numpy as np
+
+from utils import metrics
+from utils.decision import EVENT_NONE
+from utils.scheduler import FairScheduler, FifoScheduler, SCHEDULER_ENABLED, SCHEDULER_WEIGHTS, parse_weights
+
+
+# 설정 가져오기
+__config = configparser.ConfigParser()
+__config.read('config.ini')
+
+WORKERS_ENABLED = __config['workers'].getboolean('enabled')
+WORKER_GROUPS = __config['workers']['groups']
+WORKER_AFFINITY = __config['workers']['affinity']
+WORKER_SLOTS = int(__config['workers']['slots'])
+WORKER_MAX_FRAME_BYTES = int(__config['workers']['max_frame_width']) * int(__config['workers']['max_frame_height']) * 3
+WORKER_RESTART_DELAY = float(__config['workers']['restart_delay'])
+
+BATCHING_ENABLED = __config['batching'].getboolean('enabled')
+BATCH_MAX_SIZE = int(__config['batching']['max_batch_size'])
+BATCH_MAX_WAIT = float(__config['batching']['max_wait_ms']) / 1000
+
+
+def parse_groups(text: str) -> list[list[str]]:
+    """
+    워커 묶음 설정 파싱 ('client1,client2;client3' -> [['client1', 'client2'], ['client3']])
+    """
+    return [[name.strip() for name in group.split(',') if name.strip()]
+            for group in text.split(';') if group.strip()]
+
+
+def parse_affinity(text: str) -> list[list[int] | None]:
+    """
+    워커별 CPU 설정 파싱 ('0-1;2,3;' -> [[0, 1], [2, 3], None])
+    """
+    result = []
+    for group in text.split(';'):
+        cpus = []
+        for part in group.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            if '-' in part:
+                start, end = part.split('-')
+                cpus.extend(range(int(start), int(end) + 1))
+            else:
+                cpus.append(int(part))
+        result.append(cpus or None)
+    return result
+
+
+def _collect_batch(tasks: mp.Queue, first: tuple, cameras: list[str],
+                   max_batch_size: int, max_wait: float) -> tuple[list[tuple], bool]:
+    """
+    첫 번째 작업 이후 최대 max_wait초 동안 들어온 작업을 최대 max_batch_size개까지 묶음
+    담당 카메라의 프레임이 모두 모이면 더 기다리지 않고 이미 큐에 있는 작업만 가져옵니다.
+
+    Returns:
+        list[tuple]: 작업 목록
+        bool: 종료 요청(None)을 받았는지 여부
+    """
+    batch = [first]
+    waiting = set(cameras) - {first[0]}
+    deadline = time.perf_counter() + max_wait
+    while len(batch) < max_batch_size:
+        remaining = deadline - time.perf_counter()
+        try:
+            task = tasks.get(timeout=remaining) if waiting and remaining > 0 else tasks.get_nowait()
+        except Empty:
+            break
+        if task is None:
+            return batch, True
+        batch.append(task)
+        waiting.discard(task[0])
+    return batch, False
+
+
+def _drain(tasks: mp.Queue) -> tuple[list[tuple], bool]:
+    """
+    큐에 이미 들어온 작업을 기다리지 않고 모두 가져옴
+
+    Returns:
+        list[tuple]: 작업 목록
+        bool: 종료 요청(None)을 받았는지 여부
+    """
+    drained = []
+    while True:
+        try:
+            task = tasks.get_nowait()
+        except Empty:
+            return drained, False
+        if task is None:
+            return drained, True
+        drained.append(task)
+
+
+def _worker_main(cameras: list[str], shm_names: dict[str, str], slot_bytes: int,
+                 tasks: mp.Queue, free_slots: dict, events, cpus: list[int] | None,
+                 metrics_port: int | None):
+    """
+    워커 프로세스 본체
+
+    Args:
+        cameras (list[str]): 담당 카메라 이름
+        shm_names (dict[str, str]): 카메라별 공유 메모리 이름
+        slot_bytes (int): 슬롯 하나의 크기
+        tasks (mp.Queue): (카메라, 슬롯 번호, 프레임 번호, 형태) 작업 큐 (None이면 종료)
+        free_slots (dict[str, Semaphore]): 카메라별 빈 슬롯 수 (처리를 마친 슬롯을 반환)
+        events (Connection): 경고 전환 이벤트를 보낼 파이프
+        cpus (list[int] | None): 사용할 CPU 번호
+        metrics_port (int | None): 워커 지표를 제공할 포트 번호
+    """
+    # 모델을 불러오기 전에 CPU를 지정해야 OpenVINO 쓰레드도 같은 CPU를 사용
+    if cpus and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cpus)
+
+    from utils.inference import Inferencer
+    from utils.record_log import InferenceLogWriter, RECORD_LOG_ENABLED
+    from utils.state_store import StateStore, StreamState, decide
+
+    # 워커 프로세스의 지표는 워커마다 별도의 포트로 제공
+    if metrics_port is not None:
+        metrics.MetricsServer(metrics.registry, port=metrics_port).start()
+
+    # 여러 카메라를 담당하는 워커는 카메라들의 프레임을 묶어서 사람 검출
+    max_batch_size = BATCH_MAX_SIZE if BATCHING_ENABLED and len(cameras) > 1 else 1
+    # 여러 카메라를 담당하는 워커는 decide 단계 대신 StateStore로 묶음의 상태를 한 번에 갱신
+    # (StreamState는 InferenceState처럼 읽을 수 있으므로 추론 기록과 스케줄러에 그대로 전달)
+    inferencer = Inferencer(name=','.join(cameras), max_batch_size=max_batch_size, decide=len(cameras) == 1)
+    batch_size = metrics.detector_batch_size.labels(','.join(cameras))
+    store = StateStore(inferencer.engine) if len(cameras) > 1 else None
+    if store is not None:
+        states = {camera: StreamState(store) for camera in cameras}
+    else:
+        states = {camera: inferencer.engine.create_state() for camera in cameras}
+    buffers = {camera: shared_memory.SharedMemory(name=name) for camera, name in shm_names.items()}
+    record_logs = {}
+    if RECORD_LOG_ENABLED:
+        for camera in cameras:
+            record_logs[camera] = InferenceLogWriter(name=camera)
+            record_logs[camera].daemon = True
+            record_logs[camera].start()
+
+    # 대기 중인 작업은 카메라별로 보관하고 스케줄러가 정한 순서대로 추론
+    # (여러 카메라를 담당하면 가중치에 비례하게 추론 시간을 나눔, 'pull' 상태나 경고 중인 카메라는 가중치 증가)
+    scheduler = FairScheduler() if SCHEDULER_ENABLED and len(cameras) > 1 else FifoScheduler()
+    weights = parse_weights(SCHEDULER_WEIGHTS)
+    for camera in cameras:
+        scheduler.add_stream(camera, weights.get(camera, 1.0),
+                             lambda state=states[camera]: state.warning_active or state.pull_start_time is not None)
+
+    try:
+        stopping = False
+        while not stopping:
+            received = []
+            if not scheduler:
+                task = tasks.get()
+                if task is None:
+                    break
+                received = [task]
+                if max_batch_size > 1:
+                    received, stopping = _collect_batch(tasks, task, cameras, max_batch_size, BATCH_MAX_WAIT)
+            if not stopping:
+                drained, stopping = _drain(tasks)
+                received.extend(drained)
+            for task in received:
+                scheduler.push(task[0], task)
+
+            batch = []
+            while scheduler and len(batch) < max_batch_size:
+                batch.append(scheduler.pop()[1])
+
+            # 슬롯이 없는 작업은 사람 없음 알림 (submit_vacant)
+            frames = [None if slot is None else
+                      np.ndarray(shape, dtype=np.uint8, buffer=buffers[camera].buf, offset=slot * slot_bytes)
+                      for camera, slot, _, shape in batch]
+            try:
+                detection_time = 0.0
+                images = [frame for frame in frames if frame is not None]
+                if max_batch_size > 1 and images:
+                    batch_size.observe(len(images))
+                    start = time.perf_counter()
+                    image_detections = iter(inferencer.detect_batch(images))
+                    detection_time = (time.perf_counter() - start) / len(images)
+                    detections = [None if frame is None else next(image_detections) for frame in frames]
+                else:
+                    detections = [None] * len(frames)
+                # 검출 결과를 각 카메라의 상태에 나눠서 이후 단계 처리 (같은 카메라는 들어온 순서대로)
+                results = []
+                for (camera, _, frame_id, _), frame, detection in zip(batch, frames, detections):
+                    state = states[camera]
+                    inferencer.record_log = record_logs.get(camera)
+                    start = time.perf_counter()
+                    if frame is None:
+                        context = inferencer.inference_vacant(state)
+                    else:
+                        context = inferencer.inference(frame, state, detection)
+                    scheduler.complete(camera, detection_time + time.perf_counter() - start)
+                    if store is not None:
+                        results.append((state, context))
+                    elif state.event != EVENT_NONE:
+                        events.send((camera, frame_id, state.event))
+
+                # 묶음의 모든 카메라 상태를 한 번에 갱신하면서 프레임마다 기록 및 이벤트 전달
+                if results:
+                    def on_frame(i: int, state: StreamState):
+                        camera, _, frame_id, _ = batch[i]
+                        if camera in record_logs:
+                            record_logs[camera].write(state)
+                        if state.event != EVENT_NONE:
+                            events.send((camera, frame_id, state.event))
+
+                    decide(store, results, on_frame)
+            finally:
+                frames = frame = images = None
+                for camera, slot, _, _ in batch:
+                    if slot is not None:
+                        free_slots[camera].release()
+    finally:
+        inferencer.close()
+        for record_log in record_logs.values():
+            record_log.stop()
+            record_log.join()
+        for buffer in buffers.values():
+            buffer.close()
+
+
+class _Worker:
+    """
+    워커 프로세스 하나의 실행 정보
+    """
+    def __init__(self, index: int, cameras: list[str], cpus: list[int] | None):
+        self.index = index
+        self.cameras = cameras
+        self.cpus = cpus
+        self.process = None
+        self.tasks = None
+        self.free_slots = {}            # 카메라별 빈 슬롯 수 (Semaphore)
+        self.next_slots = {}            # 카메라별 다음에 쓸 슬롯 번호
+        self.events = None
+        self.restarts = 0
+
+
+class InferenceSupervisor:
+    """
+    카메라별 추론 워커 프로세스를 관리하는 클래스
+
+    Args:
+        groups (list[list[str]]): 워커별 담당 카메라 이름
+        affinity (list[list[int] | None], optional): 워커별 CPU 번호
+        slots (int): 카메라별 공유 메모리 슬롯 수 (워커가 처리하지 못한 프레임이 쌓일 수 있는 최대 수)
+        slot_bytes (int): 슬롯 하나의 크기 (처리할 수 있는 최대 프레임 크기)
+        restart_delay (float): 비정상 종료된 워커를 다시 시작하기 전 대기 시간(초)
+        metrics_port (int, optional): 첫 번째 워커의 지표 포트 번호 (워커마다 1씩 증가, None이면 제공하지 않음)
+    """
+    def __init__(self, groups: list[list[str]], affinity: list[list[int] | None] = None,
+                 slots: int = WORKER_SLOTS, slot_bytes: int = WORKER_MAX_FRAME_BYTES,
+                 restart_delay: float = WORKER_RESTART_DELAY, metrics_port: int = None):
+        self._context = mp.get_context('spawn')
+        self._metrics_port = metrics_port
+        self._slots = slots
+        self._slot_bytes = slot_bytes
+        self._restart_delay = restart_delay
+        self._running = False
+
+        affinity = affinity or []
+        self._workers = [_Worker(i, cameras, affinity[i] if i < len(affinity) else None)
+                         for i, cameras in enumerate(groups)]
+        self._camera_worker = {camera: worker for worker in self._workers for camera in worker.cameras}
+        self._buffers = {camera: shared_memory.SharedMemory(create=True, size=slots * slot_bytes)
+                         for camera in self._camera_worker}
+        self._dropped = {camera: metrics.frames_dropped.labels(camera) for camera in self._camera_worker}
+
+        self.on_event = self._default_callback  # (카메라, 프레임 번호, 이벤트)를 받는 콜백 함수
+        self._monitor_thread = threading.Thread(target=self._monitor, daemon=True)
+        self._lock = threading.Lock()
+
+    def _default_callback(self, camera: str, frame_id: int, event: int):
+        pass
+
+    def _spawn(self, worker: _Worker):
+        """
+        워커 프로세스 시작 (재시작 시 큐와 슬롯을 새로 만들어 이전 프로세스가 쥐고 있던 슬롯을 회수)
+        워커는 카메라별 작업을 들어온 순서대로 처리하므로 슬롯은 링 버퍼처럼 순서대로 사용하고 반환됩니다.
+        """
+        worker.tasks = self._context.Queue()
+        worker.free_slots = {camera: self._context.Semaphore(self._slots) for camera in worker.cameras}
+        worker.next_slots = {camera: 0 for camera in worker.cameras}
+        receiver, sender = self._context.Pipe(duplex=False)
+        worker.events = receiver
+
+        shm_names = {camera: self._buffers[camera].name for camera in worker.cameras}
+        metrics_port = None if self._metrics_port is None else self._metrics_port + worker.index
+        worker.process = self._context.Process(
+            target=_worker_main,
+            args=(worker.cameras, shm_names, self._slot_bytes, worker.tasks,
+                  worker.free_slots, sender, worker.cpus, metrics_port),
+            name=f'inference-{"-".join(worker.cameras)}',
+            daemon=True)
+        worker.process.start()
+        sender.close()
+        print(f'Started inference worker {worker.process.name} (pid {worker.process.pid}, cpus {worker.cpus}).')
+
+    def start(self):
+        """
+        모든 워커와 감독 쓰레드 시작
+        """
+        self._running = True
+        for worker in self._workers:
+            self._spawn(worker)
+        self._monitor_thread.start()
+
+    def submit(self, camera: str, frame_id: int, frame: np.ndarray) -> bool:
+        """
+        프레임을 공유 메모리에 복사하여 워커에 전달
+
+        Args:
+            camera (str): 카메라 이름
+            frame_id (int): 프레임 번호
+            frame (np.ndarray): 프레임 (uint8)
+
+        Returns:
+            bool: 전달 여부 (워커가 밀려 빈 슬롯이 없거나 프레임이 너무 크면 버림)
+        """
+        worker = self._camera_worker[camera]
+        if frame.nbytes > self._slot_bytes:
+            self._dropped[camera].inc()
+            return False
+        with self._lock:
+            if not worker.free_slots[camera].acquire(block=False):
+                self._dropped[camera].inc()
+                return False
+            tasks = worker.tasks
+            slot = worker.next_slots[camera]
+            worker.next_slots[camera] = (slot + 1) % self._slots
+
+        offset = slot * self._slot_bytes
+        view = np.ndarray(frame.shape, dtype=np.uint8, buffer=self._buffers[camera].buf, offset=offset)
+        view[...] = frame
+        del view
+        # 빈 슬롯 수만큼만 작업이 쌓이므로 작업 큐는 따로 크기를 제한하지 않음
+        tasks.put((camera, slot, frame_id, frame.shape))
+        return True
+
+    def submit_vacant(self, camera: str, frame_id: int):
+        """
+        클라이언트가 사람이 없다고 알린 경우 공유 메모리 슬롯 없이 워커에 전달 (사람이 감지되지 않은 프레임으로 처리)
+
+        Args:
+            camera (str): 카메라 이름
+            frame_id (int): 프레임 번호
+        """
+        worker = self._camera_worker[camera]
+        with self._lock:
+            tasks = worker.tasks
+        tasks.put((camera, None, frame_id, None))
+
+    def _monitor(self):
+        """
+        이벤트 전달 및 비정상 종료된 워커 재시작
+        """
+        while self._running:
+            with self._lock:
+                connections = {worker.events: worker for worker in self._workers}
+            for connection in wait(list(connections), timeout=0.5):
+                try:
+                    camera, frame_id, event = connection.recv()
+                except (EOFError, OSError):
+                    continue
+                try:
+                    self.on_event(camera, frame_id, event)
+                except Exception:
+                    traceback.print_exc()
+
+            for worker in self._workers:
+                if self._running and not worker.process.is_alive():
+                    print(f'Inference worker {worker.process.name} exited with code '
+                          f'{worker.process.exitcode}. Restarting...')
+                    worker.events.close()
+                    time.sleep(self._restart_delay)
+                    worker.restarts += 1
+                    with self._lock:
+                        self._spawn(worker)
+
+    def stop(self, timeout: float = 5.0):
+        """
+        모든 워커 종료 및 공유 메모리 해제
+        """
+        self._running = False
+        if self._monitor_thread.is_alive():
+            self._monitor_thread.join()
+        for worker in self._workers:
+            if worker.process is not None and worker.process.is_alive():
+                worker.tasks.put(None)
+        for worker in self._workers:
+            if worker.process is None:
+                continue
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+            worker.events.close()
+        for buffer in self._buffers.values():
+            buffer.close()
+            buffer.unlink()